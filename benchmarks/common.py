@@ -0,0 +1,95 @@
+"""
+===============================================================================
+ Project:      Python Graph Plotter
+ File:         common.py
+ Author:       Matteo Franchini
+ Created:      17/10/2026
+ License:      MIT License (c) 2025 Matteo Franchini
+ Repository:   https://github.com/MatteoFranchini01/python_graph_plotter
+===============================================================================
+ MIT License
+
+ Copyright (c) 2025 Matteo Franchini
+
+ Permission is hereby granted, free of charge, to any person obtaining a copy
+ of this software and associated documentation files (the "Software"), to deal
+ in the Software without restriction, including without limitation the rights
+ to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+ copies of the Software, and to permit persons to whom the Software is
+ furnished to do so, subject to the following conditions:
+
+ The above copyright notice and this permission notice shall be included in
+ all copies or substantial portions of the Software.
+
+ THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+ IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+ FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+ AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+ LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING
+ FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS
+ IN THE SOFTWARE.
+===============================================================================
+"""
+
+import os
+import time
+
+import numpy as np
+
+
+def qt_application():
+    """
+    Crea (o riusa) la QApplication sulla piattaforma offscreen, così i
+    benchmark girano anche su una macchina senza display
+    """
+    os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+    from PySide6.QtWidgets import QApplication
+
+    return QApplication.instance() or QApplication([])
+
+
+def plot_view(width=1200, height=600):
+    """
+    Crea una QGraphicsView visibile (offscreen) di dimensioni fisse con un LivePlotWidget
+    """
+    from PySide6.QtWidgets import QGraphicsView
+    from src.graph.plotWidget import LivePlotWidget
+
+    view = QGraphicsView()
+    view.resize(width, height)
+    view.show()
+
+    plot = LivePlotWidget(view)
+
+    # I frame pianificati altererebbero le misure: i benchmark chiamano update_plot a mano
+    plot.scheduler.stop()
+
+    return view, plot
+
+
+def timed(function, repeat):
+    """
+    Esegue function repeat volte e restituisce la durata di ogni chiamata in secondi
+    """
+    durations = np.empty(repeat)
+
+    for i in range(repeat):
+        start = time.perf_counter()
+        function()
+        durations[i] = time.perf_counter() - start
+
+    return durations
+
+
+def summary(prefix, seconds):
+    """
+    Mediana e percentili di una serie di durate, in millisecondi
+    """
+    milliseconds = np.asarray(seconds) * 1e3
+
+    return {
+        f"{prefix}.p50_ms": float(np.percentile(milliseconds, 50)),
+        f"{prefix}.p95_ms": float(np.percentile(milliseconds, 95)),
+        f"{prefix}.max_ms": float(milliseconds.max()),
+    }
@@ -0,0 +1,201 @@
+"""
+===============================================================================
+ Project:      Python Graph Plotter
+ File:         latency.py
+ Author:       Matteo Franchini
+ Created:      17/10/2026
+ License:      MIT License (c) 2025 Matteo Franchini
+ Repository:   https://github.com/MatteoFranchini01/python_graph_plotter
+===============================================================================
+ MIT License
+
+ Copyright (c) 2025 Matteo Franchini
+
+ Permission is hereby granted, free of charge, to any person obtaining a copy
+ of this software and associated documentation files (the "Software"), to deal
+ in the Software without restriction, including without limitation the rights
+ to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+ copies of the Software, and to permit persons to whom the Software is
+ furnished to do so, subject to the following conditions:
+
+ The above copyright notice and this permission notice shall be included in
+ all copies or substantial portions of the Software.
+
+ THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+ IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+ FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+ AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+ LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING
+ FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS
+ IN THE SOFTWARE.
+===============================================================================
+"""
+
+import time
+
+import numpy as np
+from PySide6.QtCore import QObject, QTimer, Signal
+
+from benchmarks.common import plot_view, qt_application
+from server.serverUdp import UDPServer
+from src.model.ModelData import ModelData
+from src.network.controlClient import ControlClient
+from src.network.protocol import FORMAT_BINARY, TRANSPORT_SHM, TRANSPORT_UDP
+from src.network.sharedRing import SharedRing
+from src.network.udpReceiver import UdpReceiver
+
+
+class LatencyProbe(QObject):
+    """
+    Riproduce il percorso di MainController: ricezione su thread, segnale
+    verso il thread principale, add_block e update_plot. Dopo ogni frame
+    misura il ritardo dei campioni comparsi nei dati dello scatter.
+    """
+
+    blocks_received = Signal(object)
+
+    def __init__(self, plot, model):
+        super().__init__()
+
+        self.plot = plot
+        self.model = model
+        self.series = plot.add_series("bench", model)
+
+        # Istante di invio (timestamp del frame) di ogni indice ricevuto
+        self.sent_times = {}
+        self.latest_rendered = -1
+        self.latencies = []
+
+        self.blocks_received.connect(self.on_blocks)
+
+    def on_udp_blocks(self, blocks):
+        self.blocks_received.emit(blocks)
+
+    def poll_ring(self, ring):
+        """
+        Percorso del trasporto in memoria condivisa: il timer del thread principale svuota il ring
+        """
+        blocks = ring.read()
+
+        if blocks:
+            self.on_blocks(blocks)
+
+        ring.release()
+
+    def on_blocks(self, blocks):
+        for x_data, y_data, timestamps in blocks.values():
+            self.model.add_block(x_data, y_data)
+            self.sent_times.update(zip(x_data.astype(np.int64).tolist(), timestamps.tolist()))
+
+        self.plot.update_plot()
+
+        now = time.time()
+        rendered = self.rendered_index()
+
+        for index in range(self.latest_rendered + 1, rendered + 1):
+            sent = self.sent_times.pop(index, None)
+
+            if sent is not None:
+                self.latencies.append(now - sent)
+
+        self.latest_rendered = max(self.latest_rendered, rendered)
+
+    def rendered_index(self):
+        """
+        Indice più alto presente nei dati dello scatter dell'ultimo chunk
+        """
+        if not self.series.chunks:
+            return -1
+
+        chunk = self.series.chunks[max(self.series.chunks)]
+        latest = -1
+
+        for item in chunk.scatter.items:
+            x_data = item.getData()[0]
+
+            if len(x_data):
+                latest = max(latest, int(x_data.max()))
+
+        return latest
+
+
+def run(rate=200.0, duration=3.0, tcp_port=6123, transports=(TRANSPORT_UDP, TRANSPORT_SHM)):
+    """
+    Latenza per ognuno dei trasporti; le metriche del trasporto UDP mantengono i nomi originali
+    """
+    metrics = {}
+
+    for offset, transport in enumerate(transports):
+        prefix = "latency" if transport == TRANSPORT_UDP else f"latency.{transport}"
+
+        for key, value in measure(rate, duration, tcp_port + offset, transport).items():
+            metrics[f"{prefix}.{key}"] = value
+
+    return metrics
+
+
+def measure(rate, duration, tcp_port, transport):
+    """
+    Latenza dall'invio di un campione da UDPServer alla sua comparsa nei dati
+    dello scatter, con un frame per blocco ricevuto. Con il trasporto shm i
+    blocchi vengono letti dal ring ogni 5 ms, come fa MainController
+    """
+    app = qt_application()
+
+    server = UDPServer(tcp_port=tcp_port, sample_rate=rate, batch_size=1)
+    server.start()
+
+    view, plot = plot_view()
+    probe = LatencyProbe(plot, ModelData())
+
+    receiver = UdpReceiver("127.0.0.1", 0, probe.on_udp_blocks, variables=server.variables)
+    receiver.start()
+
+    control = ControlClient("127.0.0.1", tcp_port)
+    control.connect()
+    control.request_format(FORMAT_BINARY)
+    control.set_udp_port(receiver.port)
+
+    ring = None
+
+    if transport == TRANSPORT_SHM:
+        ring = SharedRing(capacity=1 << 16)
+
+        if not control.request_transport(TRANSPORT_SHM, ring.name):
+            raise RuntimeError("Trasporto in memoria condivisa rifiutato dal server")
+
+        timer = QTimer()
+        timer.setInterval(5)
+        timer.timeout.connect(lambda: probe.poll_ring(ring))
+        timer.start()
+
+    control.subscribe(server.variables[:1])
+
+    QTimer.singleShot(int(duration * 1000), app.quit)
+    app.exec()
+
+    control.close()
+    receiver.stop()
+    server.stop()
+
+    if ring is not None:
+        timer.stop()
+
+        # Il server chiude la sua mappatura alla disconnessione del client, nel proprio loop
+        time.sleep(0.1)
+        ring.close()
+
+    view.close()
+
+    latencies = np.array(probe.latencies) * 1e3
+
+    if len(latencies) == 0:
+        raise RuntimeError("Nessun campione ricevuto dal server")
+
+    return {
+        "samples": len(latencies),
+        "p50_ms": float(np.percentile(latencies, 50)),
+        "p95_ms": float(np.percentile(latencies, 95)),
+        "p99_ms": float(np.percentile(latencies, 99)),
+        "max_ms": float(latencies.max()),
+    }
@@ -0,0 +1,75 @@
+"""
+===============================================================================
+ Project:      Python Graph Plotter
+ File:         model.py
+ Author:       Matteo Franchini
+ Created:      17/10/2026
+ License:      MIT License (c) 2025 Matteo Franchini
+ Repository:   https://github.com/MatteoFranchini01/python_graph_plotter
+===============================================================================
+ MIT License
+
+ Copyright (c) 2025 Matteo Franchini
+
+ Permission is hereby granted, free of charge, to any person obtaining a copy
+ of this software and associated documentation files (the "Software"), to deal
+ in the Software without restriction, including without limitation the rights
+ to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+ copies of the Software, and to permit persons to whom the Software is
+ furnished to do so, subject to the following conditions:
+
+ The above copyright notice and this permission notice shall be included in
+ all copies or substantial portions of the Software.
+
+ THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+ IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+ FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+ AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+ LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING
+ FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS
+ IN THE SOFTWARE.
+===============================================================================
+"""
+
+import time
+
+import numpy as np
+
+from benchmarks.common import summary, timed
+from src.model.ModelData import ModelData
+
+
+def run(samples=200_000, block_size=1000, repeat=200):
+    """
+    Throughput di ModelData: add_data campione per campione, add_block a
+    blocchi e costo di get_data, che restituisce viste senza copia
+    """
+    rng = np.random.default_rng(0)
+    values = rng.standard_normal(samples)
+    indices = np.arange(samples, dtype=np.float64)
+
+    metrics = {}
+
+    model = ModelData()
+    x_list = indices.tolist()
+    y_list = values.tolist()
+
+    start = time.perf_counter()
+
+    for x, y in zip(x_list, y_list):
+        model.add_data(x, y)
+
+    metrics["model.add_data.samples_per_second"] = samples / (time.perf_counter() - start)
+
+    model = ModelData()
+
+    start = time.perf_counter()
+
+    for begin in range(0, samples, block_size):
+        model.add_block(indices[begin:begin + block_size], values[begin:begin + block_size])
+
+    metrics["model.add_block.samples_per_second"] = samples / (time.perf_counter() - start)
+
+    metrics.update(summary("model.get_data", timed(model.get_data, repeat)))
+
+    return metrics
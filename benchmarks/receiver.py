@@ -0,0 +1,225 @@
+"""
+===============================================================================
+ Project:      Python Graph Plotter
+ File:         receiver.py
+ Author:       Matteo Franchini
+ Created:      17/10/2026
+ License:      MIT License (c) 2025 Matteo Franchini
+ Repository:   https://github.com/MatteoFranchini01/python_graph_plotter
+===============================================================================
+ MIT License
+
+ Copyright (c) 2025 Matteo Franchini
+
+ Permission is hereby granted, free of charge, to any person obtaining a copy
+ of this software and associated documentation files (the "Software"), to deal
+ in the Software without restriction, including without limitation the rights
+ to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+ copies of the Software, and to permit persons to whom the Software is
+ furnished to do so, subject to the following conditions:
+
+ The above copyright notice and this permission notice shall be included in
+ all copies or substantial portions of the Software.
+
+ THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+ IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+ FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+ AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+ LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING
+ FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS
+ IN THE SOFTWARE.
+===============================================================================
+"""
+
+import socket
+import threading
+import time
+
+import numpy as np
+
+from src.network.ingestProcess import IngestProcess
+from src.network.protocol import encode_frame, encode_text
+from src.network.udpReceiver import UdpReceiver
+
+
+class SampleCounter:
+    """
+    Callback on_blocks che conta i campioni consegnati dal ricevitore
+    """
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.samples = 0
+
+    def __call__(self, blocks):
+        with self.lock:
+            self.samples += sum(len(y_data) for _, y_data, _ in blocks.values())
+
+
+def parse(datagrams, batch_size):
+    """
+    Datagrammi al secondo decodificati da UdpReceiver.dispatch, senza socket
+    """
+    receiver = UdpReceiver("127.0.0.1", 0, SampleCounter(), variables=["bench"])
+
+    try:
+        start = time.perf_counter()
+
+        for begin in range(0, len(datagrams), batch_size):
+            receiver.dispatch(datagrams[begin:begin + batch_size])
+
+        return len(datagrams) / (time.perf_counter() - start)
+
+    finally:
+        receiver.sock.close()
+
+
+def send(port, rate, duration, samples_per_frame):
+    """
+    Invia frame binari a rate datagrammi al secondo per duration secondi, a
+    raffiche di un millisecondo con scadenze assolute. Restituisce i
+    datagrammi inviati e il tempo impiegato
+    """
+    sender = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+    address = ("127.0.0.1", port)
+    values = np.zeros(samples_per_frame)
+
+    burst = max(1, int(rate / 1000))
+    sent = 0
+
+    start = time.perf_counter()
+    deadline = start
+
+    while time.perf_counter() - start < duration:
+        for _ in range(burst):
+            frame = encode_frame(0, sent, sent * samples_per_frame, time.time(), 1e-3, values)
+
+            try:
+                sender.sendto(frame, address)
+                sent += 1
+
+            except BlockingIOError:
+                pass
+
+        deadline += burst / rate
+        delay = deadline - time.perf_counter()
+
+        if delay > 0:
+            time.sleep(delay)
+
+    elapsed = time.perf_counter() - start
+
+    sender.close()
+
+    return sent, elapsed
+
+
+def drain(rate, duration, samples_per_frame):
+    """
+    Invia frame binari a rate datagrammi al secondo per duration secondi e
+    conta quanti campioni il ricevitore consegna
+    """
+    counter = SampleCounter()
+    receiver = UdpReceiver("127.0.0.1", 0, counter, variables=["bench"])
+    receiver.start()
+
+    sent, elapsed = send(receiver.port, rate, duration, samples_per_frame)
+
+    # Tempo per svuotare la coda del socket
+    time.sleep(0.3)
+
+    receiver.stop()
+
+    received = counter.samples // samples_per_frame
+
+    return {
+        "offered_rate": sent / elapsed,     # Datagrammi al secondo che il mittente è riuscito a inviare
+        "received_per_second": received / elapsed,
+        "drops": sent - received,
+    }
+
+
+def drain_contended(process, rate, duration, samples_per_frame):
+    """
+    Come drain, ma con un thread che tiene occupato il GIL come farebbe il
+    thread della UI durante il disegno. Con process il ricevitore è un
+    IngestProcess e un thread legge il ring condiviso ogni 5 ms
+    """
+    counter = SampleCounter()
+    running = True
+
+    def load():
+        while running:
+            sum(range(10_000))
+
+    if process:
+        receiver = IngestProcess("127.0.0.1", 0, variables=["bench"])
+        receiver.start()
+
+        def consume():
+            while running:
+                counter(receiver.ring.read())
+                receiver.ring.release()
+                time.sleep(0.005)
+
+    else:
+        receiver = UdpReceiver("127.0.0.1", 0, counter, variables=["bench"])
+        receiver.start()
+
+        consume = None
+
+    threads = [threading.Thread(target=target, daemon=True) for target in (load, consume) if target is not None]
+
+    for thread in threads:
+        thread.start()
+
+    sent, elapsed = send(receiver.port, rate, duration, samples_per_frame)
+
+    time.sleep(0.3)
+
+    running = False
+
+    for thread in threads:
+        thread.join()
+
+    if process:
+        counter(receiver.ring.read())
+
+    receiver.stop()
+
+    received = counter.samples // samples_per_frame
+
+    return {
+        "received_per_second": received / elapsed,
+        "drops": sent - received,
+    }
+
+
+def run(rates=(10_000, 50_000, 100_000, 200_000), duration=2.0, samples_per_frame=1, parse_count=100_000):
+    """
+    Throughput di decodifica di UdpReceiver e capacità di svuotare il socket
+    a frequenze di pacchetti crescenti, con il numero di datagrammi persi
+    """
+    metrics = {}
+
+    values = np.random.default_rng(0).standard_normal(64)
+
+    datagrams = {
+        "binary1": [encode_frame(0, i, i, 0.0, 1e-3, values[:1]) for i in range(parse_count)],
+        "binary64": [encode_frame(0, i, 64 * i, 0.0, 1e-3, values) for i in range(parse_count // 10)],
+        "text": [encode_text("bench", value) for value in np.resize(values, parse_count)],
+    }
+
+    for name, frames in datagrams.items():
+        metrics[f"receiver.parse.{name}.datagrams_per_second"] = parse(frames, 4096)
+
+    for rate in rates:
+        for key, value in drain(rate, duration, samples_per_frame).items():
+            metrics[f"receiver.drain.{rate}.{key}"] = value
+
+    # Ricezione con il GIL conteso: thread nello stesso processo contro processo separato
+    for name, process in (("thread", False), ("process", True)):
+        for key, value in drain_contended(process, rates[-1], duration, samples_per_frame).items():
+            metrics[f"receiver.contended.{name}.{key}"] = value
+
+    return metrics
@@ -0,0 +1,100 @@
+"""
+===============================================================================
+ Project:      Python Graph Plotter
+ File:         render.py
+ Author:       Matteo Franchini
+ Created:      17/10/2026
+ License:      MIT License (c) 2025 Matteo Franchini
+ Repository:   https://github.com/MatteoFranchini01/python_graph_plotter
+===============================================================================
+ MIT License
+
+ Copyright (c) 2025 Matteo Franchini
+
+ Permission is hereby granted, free of charge, to any person obtaining a copy
+ of this software and associated documentation files (the "Software"), to deal
+ in the Software without restriction, including without limitation the rights
+ to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+ copies of the Software, and to permit persons to whom the Software is
+ furnished to do so, subject to the following conditions:
+
+ The above copyright notice and this permission notice shall be included in
+ all copies or substantial portions of the Software.
+
+ THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+ IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+ FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+ AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+ LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING
+ FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS
+ IN THE SOFTWARE.
+===============================================================================
+"""
+
+import time
+
+import numpy as np
+
+from benchmarks.common import plot_view, qt_application, summary
+from src.model.ModelData import ModelData
+
+
+def frame(app, view, plot):
+    """
+    Un frame completo: update_plot più il disegno della scena, separati
+    """
+    start = time.perf_counter()
+    plot.update_plot()
+    updated = time.perf_counter()
+
+    view.viewport().repaint()
+    app.processEvents()
+
+    return updated - start, time.perf_counter() - updated
+
+
+def run(sizes=(1_000, 100_000, 10_000_000), frames=30, new_samples=100):
+    """
+    Tempo di frame di LivePlotWidget.update_plot con storie di sizes campioni,
+    sia seguendo gli ultimi campioni sia con l'intera storia inquadrata.
+    A ogni frame arrivano new_samples campioni nuovi, come durante l'acquisizione.
+    """
+    app = qt_application()
+    rng = np.random.default_rng(0)
+
+    metrics = {}
+
+    for size in sizes:
+        for mode in ("follow", "full"):
+            view, plot = plot_view()
+            model = ModelData()
+
+            model.add_block(np.arange(size, dtype=np.float64), rng.standard_normal(size))
+            plot.add_series("bench", model)
+
+            if mode == "full":
+                plot.follow = False
+
+            # Primo frame (creazione degli elementi grafici) escluso dalle misure
+            frame(app, view, plot)
+
+            update_times = []
+            paint_times = []
+
+            for _ in range(frames):
+                total = model.total_count
+                model.add_block(np.arange(total, total + new_samples, dtype=np.float64), rng.standard_normal(new_samples))
+
+                if mode == "full":
+                    plot.plot_widget.setXRange(0, model.total_count, padding=0)
+
+                update, paint = frame(app, view, plot)
+                update_times.append(update)
+                paint_times.append(paint)
+
+            metrics.update(summary(f"render.{mode}.{size}.update_plot", update_times))
+            metrics.update(summary(f"render.{mode}.{size}.paint", paint_times))
+
+            view.close()
+
+    return metrics
@@ -0,0 +1,193 @@
+"""
+===============================================================================
+ Project:      Python Graph Plotter
+ File:         run.py
+ Author:       Matteo Franchini
+ Created:      17/10/2026
+ License:      MIT License (c) 2025 Matteo Franchini
+ Repository:   https://github.com/MatteoFranchini01/python_graph_plotter
+===============================================================================
+ MIT License
+
+ Copyright (c) 2025 Matteo Franchini
+
+ Permission is hereby granted, free of charge, to any person obtaining a copy
+ of this software and associated documentation files (the "Software"), to deal
+ in the Software without restriction, including without limitation the rights
+ to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+ copies of the Software, and to permit persons to whom the Software is
+ furnished to do so, subject to the following conditions:
+
+ The above copyright notice and this permission notice shall be included in
+ all copies or substantial portions of the Software.
+
+ THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+ IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+ FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+ AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+ LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING
+ FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS
+ IN THE SOFTWARE.
+===============================================================================
+"""
+
+import argparse
+import datetime
+import json
+import os
+import platform
+import sys
+
+import numpy as np
+
+# Riferimento misurato sulla macchina di sviluppo: va rigenerato con --update-baseline
+# quando si cambia macchina, altrimenti le differenze misurano l'hardware
+BASELINE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "baseline.json")
+
+SUITES = ("model", "render", "receiver", "latency", "startup")
+
+
+def direction(metric):
+    """
+    +1 se un valore più alto è migliore, -1 se è peggiore, 0 per le metriche solo informative
+    """
+    if metric.endswith("_per_second"):
+        return 1
+
+    # Il massimo dipende da un singolo campione, troppo rumoroso per un confronto
+    if metric.endswith(".max_ms"):
+        return 0
+
+    if metric.endswith("_ms") or metric.endswith(".drops"):
+        return -1
+
+    return 0
+
+
+def compare(metrics, baseline, tolerance, min_delta_ms=0.05):
+    """
+    Confronta le metriche con quelle di riferimento. Una metrica peggiorata
+    oltre tolerance (frazione relativa) è una regressione; per i tempi serve
+    anche un peggioramento assoluto di almeno min_delta_ms.
+    """
+    rows = []
+
+    for metric, value in sorted(metrics.items()):
+        sign = direction(metric)
+        reference = baseline.get(metric)
+
+        if sign == 0 or reference is None:
+            continue
+
+        change = (value - reference) / reference if reference else (0.0 if value == reference else float("inf"))
+
+        # I contatori di datagrammi persi partono da zero: conta la differenza assoluta
+        if metric.endswith(".drops"):
+            regression = value > reference and value - reference > tolerance * max(reference, 100)
+
+        elif metric.endswith("_ms"):
+            regression = change > tolerance and value - reference > min_delta_ms
+
+        else:
+            regression = sign * change < -tolerance
+
+        rows.append({"metric": metric, "baseline": reference, "value": value, "change": change, "regression": regression})
+
+    return rows
+
+
+def run_suites(names, quick):
+    metrics = {}
+
+    if "model" in names:
+        from benchmarks import model
+
+        metrics.update(model.run())
+
+    if "render" in names:
+        from benchmarks import render
+
+        metrics.update(render.run(sizes=(1_000, 100_000) if quick else (1_000, 100_000, 10_000_000)))
+
+    if "receiver" in names:
+        from benchmarks import receiver
+
+        metrics.update(receiver.run(duration=0.5 if quick else 2.0))
+
+    if "latency" in names:
+        from benchmarks import latency
+
+        metrics.update(latency.run(duration=1.0 if quick else 3.0))
+
+    if "startup" in names:
+        from benchmarks import startup
+
+        metrics.update(startup.run(repeat=2 if quick else 5))
+
+    return metrics
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark senza display di ingestione, rendering, ricezione, latenza e avvio")
+    parser.add_argument("suites", nargs="*", help=f"suite da eseguire tra {', '.join(SUITES)} (default: tutte)")
+    parser.add_argument("--output", default=None, help="file JSON dei risultati (default: stdout)")
+    parser.add_argument("--baseline", default=BASELINE, help="file JSON di riferimento")
+    parser.add_argument("--update-baseline", action="store_true", help="salva i risultati come nuovo riferimento")
+    parser.add_argument("--tolerance", type=float, default=0.25, help="peggioramento relativo tollerato")
+    parser.add_argument("--quick", action="store_true", help="dimensioni e durate ridotte")
+    args = parser.parse_args()
+
+    for name in args.suites:
+        if name not in SUITES:
+            parser.error(f"suite sconosciuta: {name}")
+
+    metrics = run_suites(args.suites or SUITES, args.quick)
+
+    result = {
+        "metadata": {
+            "date": datetime.datetime.now().isoformat(timespec="seconds"),
+            "python": platform.python_version(),
+            "numpy": np.__version__,
+            "platform": platform.platform(),
+            "quick": args.quick,
+        },
+        "metrics": metrics,
+    }
+
+    regressions = []
+
+    if os.path.exists(args.baseline) and not args.update_baseline:
+        with open(args.baseline) as file:
+            baseline = json.load(file)["metrics"]
+
+        rows = compare(metrics, baseline, args.tolerance)
+        regressions = [row for row in rows if row["regression"]]
+
+        result["comparison"] = rows
+
+        for row in rows:
+            flag = "REGRESSIONE" if row["regression"] else ""
+            print(f"{row['metric']:<55} {row['baseline']:>14.3f} {row['value']:>14.3f} {row['change']:>+8.1%} {flag}",
+                  file=sys.stderr)
+
+    text = json.dumps(result, indent=2)
+
+    if args.output:
+        with open(args.output, "w") as file:
+            file.write(text + "\n")
+
+    else:
+        print(text)
+
+    if args.update_baseline:
+        with open(args.baseline, "w") as file:
+            file.write(text + "\n")
+
+    # Il processo termina subito: la distruzione degli oggetti Qt all'uscita non è affidabile
+    sys.stdout.flush()
+    sys.stderr.flush()
+    os._exit(1 if regressions else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,77 @@
+"""
+===============================================================================
+ Project:      Python Graph Plotter
+ File:         startup.py
+ Author:       Matteo Franchini
+ Created:      17/10/2026
+ License:      MIT License (c) 2025 Matteo Franchini
+ Repository:   https://github.com/MatteoFranchini01/python_graph_plotter
+===============================================================================
+ MIT License
+
+ Copyright (c) 2025 Matteo Franchini
+
+ Permission is hereby granted, free of charge, to any person obtaining a copy
+ of this software and associated documentation files (the "Software"), to deal
+ in the Software without restriction, including without limitation the rights
+ to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+ copies of the Software, and to permit persons to whom the Software is
+ furnished to do so, subject to the following conditions:
+
+ The above copyright notice and this permission notice shall be included in
+ all copies or substantial portions of the Software.
+
+ THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+ IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+ FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+ AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+ LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING
+ FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS
+ IN THE SOFTWARE.
+===============================================================================
+"""
+
+import json
+import os
+import subprocess
+import sys
+
+import numpy as np
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def launch(fast, tcp_port, timeout=60):
+    """
+    Avvia main.py offscreen fino al primo frame con dati e restituisce i tempi di avvio (ms)
+    """
+    command = [sys.executable, "main.py", "--tcp-port", str(tcp_port), "--subscribe", "Temperatura",
+               "--exit-after-first-frame"]
+
+    if not fast:
+        command.append("--slow-start")
+
+    env = dict(os.environ, QT_QPA_PLATFORM="offscreen")
+    output = subprocess.run(command, cwd=ROOT, env=env, capture_output=True, text=True, timeout=timeout).stdout
+
+    for line in output.splitlines():
+        if line.startswith("{") and "startup_ms" in line:
+            return json.loads(line)["startup_ms"]
+
+    raise RuntimeError(f"main.py non ha riportato i tempi di avvio:\n{output}")
+
+
+def run(repeat=5, tcp_port=6124):
+    """
+    Tempi di avvio di main.py (mediana su repeat processi nuovi), con e senza
+    avvio rapido: primo paint della finestra e primo frame con dati
+    """
+    metrics = {}
+
+    for mode, fast in (("fast", True), ("slow", False)):
+        reports = [launch(fast, tcp_port + i) for i in range(repeat)]
+
+        for phase in ("first_paint", "ready", "first_frame"):
+            metrics[f"startup.{mode}.{phase}_ms"] = float(np.median([report[phase] for report in reports]))
+
+    return metrics
@@ -1,19 +1,82 @@
 # This Python file uses the following encoding: utf-8
+# Importato per primo, prima di Qt e NumPy: fissa l'istante di origine dei tempi di avvio
+import src.metrics.startup  # noqa: F401
+
+import argparse
+import json
 import sys
 
 from PySide6.QtWidgets import QApplication
 
 from src.controllers.mainWindowController import MainController
-from server.serverUdp import UDPServer
+from src.model.retention import RetentionPolicy
+
+
+demo_server = None
+
+
+def start_server(controller, tcp_port):
+    """
+    Avvia il server di esempio a finestra già pronta (usa NumPy, che così non ritarda il primo paint)
+    e chiede al controller di connettersi subito, senza aspettare il prossimo tentativo
+    """
+    global demo_server
+
+    from server.serverUdp import UDPServer
+
+    demo_server = UDPServer(tcp_port=tcp_port)
+    demo_server.start()
+
+    controller.connect_to_server()
+
+
+def on_first_frame(report, exit_after):
+    print(json.dumps({"startup_ms": report}), flush=True)
+
+    if exit_after:
+        QApplication.quit()
 
 
 if __name__ == "__main__":
-    app = QApplication(sys.argv)
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--tcp-port", type=int, default=6000)
+    parser.add_argument("--no-server", action="store_true", help="non avvia il server di esempio")
+    parser.add_argument("--slow-start", action="store_true", help="legge ui/mainwindow.ui e crea tutto prima di mostrare la finestra")
+    parser.add_argument("--subscribe", default="", help="variabili da sottoscrivere alla connessione, separate da virgola")
+    parser.add_argument("--exit-after-first-frame", action="store_true", help="termina dopo il primo frame con dati (misura dell'avvio)")
+    parser.add_argument("--ingest-process", action="store_true", help="riceve i dati UDP in un processo separato")
+    parser.add_argument("--transport", choices=("auto", "udp"), default="auto",
+                        help="auto usa la memoria condivisa con un server locale e ripiega su UDP")
+    parser.add_argument("--retention", action="append", default=[], metavar="[VARIABILE:]SPEC",
+                        help="limiti di memoria, es. max_samples=1e6,max_age=3600,max_bytes=256M,archive=0; "
+                             "senza variabile valgono per tutte (ripetibile)")
+    parser.add_argument("--metrics-port", type=int, default=None, help="espone le metriche in JSON su http://127.0.0.1:PORT/metrics")
+    args, qt_args = parser.parse_known_args()
+
+    app = QApplication(sys.argv[:1] + qt_args)
+
+    # Registro completo del viewer: ricevitore, parsing, controller e rendering (STATS espone solo il server)
+    if args.metrics_port is not None:
+        from src.metrics.httpEndpoint import MetricsHttpServer
+        from src.metrics.registry import REGISTRY
+        MetricsHttpServer(REGISTRY, "127.0.0.1", args.metrics_port).start()
+
+    retention = {}
+
+    for option in args.retention:
+        variable, separator, spec = option.rpartition(":")
+        retention[variable if separator else None] = RetentionPolicy.parse(spec)
+
+    mainController = MainController(fast_start=not args.slow_start, tcp_port=args.tcp_port,
+                                    subscribe=[name for name in args.subscribe.split(",") if name],
+                                    ingest_process=args.ingest_process, transport=args.transport,
+                                    retention=retention)
+    mainController.first_frame_rendered.connect(lambda report: on_first_frame(report, args.exit_after_first_frame))
 
-    server = UDPServer()
-    server.start()
+    # Il controller ritenta la connessione finché il server non è in ascolto
+    if not args.no_server:
+        mainController.startup_finished.connect(lambda: start_server(mainController, args.tcp_port))
 
-    mainController = MainController()
     mainController.show()
 
     sys.exit(app.exec())
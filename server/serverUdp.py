@@ -31,79 +31,541 @@
 ===============================================================================
 """
 
+import argparse
+import asyncio
+import json
 import socket
-import time
-import random
 import threading
+import time
+
+import numpy as np
+
+from server.signalSource import WAVEFORMS, SignalSource
+from src.metrics.httpEndpoint import MetricsHttpServer
+from src.metrics.registry import REGISTRY
+from src.recording.replay import ReplaySource
+from src.network.protocol import (FORMAT_TEXT, FORMAT_BINARY, HEADER, MAX_DATAGRAM, TRANSPORT_UDP, TRANSPORT_SHM, encode_frame,
+                                  encode_text, is_local_host, renumber_frame)
+from src.network.sharedRing import RECORD_SIZE, SharedRing
+
+class UdpSink:
+    """
+    Trasporto UDP: il blocco, codificato nel formato del client, parte come uno o più datagrammi
+    """
+
+    transport = TRANSPORT_UDP
+
+    def __init__(self, server):
+        self.server = server
+
+    def send(self, session, channel, sequence, variable, block, first_index, timestamp, period, encoded):
+        """
+        Invia il blocco a session; encoded conserva le codifiche già calcolate per gli altri client.
+        Il frame binario porta il numero di sequenza di session: per gli altri client
+        viene solo rinumerato. Restituisce datagrammi e byte inviati
+        """
+        if session.data_format not in encoded:
+            if session.data_format == FORMAT_BINARY:
+                encoded[FORMAT_BINARY] = [encode_frame(channel, sequence, first_index, timestamp, period,
+                                                       block, self.server.sample_dtype)]
+
+            else:
+                encoded[FORMAT_TEXT] = [encode_text(variable, value) for value in block]
+
+        frames = encoded[session.data_format]
+
+        if session.data_format == FORMAT_BINARY:
+            frames = [renumber_frame(frames[0], sequence)]
+
+        for frame in frames:
+            self.server.udp_transport.sendto(frame, session.udp_address)
+
+        return len(frames), sum(len(frame) for frame in frames)
+
+    def close(self):
+        pass
+
+class RingSink:
+    """
+    Trasporto in memoria condivisa per i client sullo stesso host: il blocco
+    viene copiato nel SharedRing del client, senza chiamate di sistema né
+    buffer del kernel. Con il ring pieno il blocco viene scartato e contato
+    nell'overflow del ring, che il client legge.
+    """
+
+    transport = TRANSPORT_SHM
+
+    def __init__(self, ring):
+        self.ring = ring
+
+    def send(self, session, channel, sequence, variable, block, first_index, timestamp, period, encoded):
+        if TRANSPORT_SHM not in encoded:
+            offsets = np.arange(len(block), dtype=np.float64)
+
+            encoded[TRANSPORT_SHM] = (offsets + first_index, np.asarray(block, dtype=np.float64),
+                                      offsets * period + timestamp)
+
+        self.ring.write(channel, *encoded[TRANSPORT_SHM])
+
+        return 1, len(block) * RECORD_SIZE
+
+    def close(self):
+        self.ring.close()
+
+class ClientSession:
+    """
+    Stato di un client di controllo: sottoscrizioni, formato, trasporto e destinazione UDP
+    """
+
+    def __init__(self, writer, udp_address, sink):
+        self.writer = writer
+        self.peer_host = udp_address[0]     # Indirizzo del client TCP
+        self.udp_address = udp_address
+        self.sink = sink
+
+        self.subscriptions = set()
+        self.data_format = FORMAT_TEXT
+
+        # Numero di sequenza del prossimo frame per canale. È del client e non del canale:
+        # i frame inviati mentre il client non era sottoscritto non risultano persi
+        self.sequences = {}
+
+        # Contatori per misurare il costo di ogni client
+        self.datagrams_sent = 0
+        self.bytes_sent = 0
 
 class UDPServer:
-    def __init__(self, host="127.0.0.1", tcp_port=6000, udp_port=5005):
+    """
+    Server di controllo TCP e di streaming UDP basato su asyncio.
+
+    Accetta più client TCP contemporaneamente; ognuno ha le proprie
+    sottoscrizioni, il proprio formato e il proprio trasporto: destinazione
+    UDP oppure, sullo stesso host, un ring in memoria condivisa. Ogni
+    blocco generato viene codificato una sola volta per formato e inviato a
+    tutti i client sottoscritti al canale.
+    """
+
+    def __init__(self, host="127.0.0.1", tcp_port=6000, udp_port=5005, sample_rate=10.0, batch_size=1, sample_dtype=np.float64,
+                 channels=None, waveform="noise", max_lag=1.0, replay=None, registry=REGISTRY):
         self.host = host
         self.tcp_port = tcp_port
-        self.udp_port = udp_port
+        self.udp_port = udp_port            # Porta UDP di default dei client che non ne indicano una
+
+        self.sample_rate = sample_rate      # Campioni al secondo per variabile
+        self.batch_size = batch_size        # Campioni per frame binario
+        self.sample_dtype = sample_dtype    # float32 o float64 nel payload binario
+        self.max_lag = max_lag              # Secondi di ritardo oltre i quali lo scheduler si riallinea
+
+        if batch_size > (MAX_DATAGRAM - HEADER.size) // np.dtype(sample_dtype).itemsize:
+            raise ValueError(f"batch_size troppo grande per un datagramma: {batch_size}")
 
         self.variables = ["Temperatura", "Pressione", "Umidità", "Velocità", "Altitudine"]
 
-        self.selected_variable = None
+        # Con più canali di quelli predefiniti si aggiungono variabili numerate
+        if channels is not None:
+            self.variables = self.variables[:channels] + [f"Canale {i}" for i in range(len(self.variables), channels)]
+
+        # Con una sessione registrata da riprodurre le variabili sono quelle registrate
+        self.replay = replay
+
+        if replay is not None:
+            self.variables = list(replay.variables)
+
+        self.source = SignalSource(len(self.variables), sample_rate, batch_size, waveform)
+
+        # Client di controllo connessi
+        self.clients = set()
+
+        # Indice del prossimo campione per canale, condiviso da tutti i client così gli
+        # indici coincidono tra un viewer e l'altro (le sequenze sono per client, in ClientSession)
+        self.sample_indices = {}
 
-    def handle_client(self, conn):
+        # Metriche del server: durata del fan-out, datagrammi e byte inviati, comandi ricevuti
+        self.registry = registry
+        self.send_time = registry.histogram("server.send")
+        self.datagrams_sent = registry.counter("server.datagrams")
+        self.bytes_sent = registry.counter("server.bytes")
+        self.commands = registry.counter("server.commands")
+
+        self.loop = None
+        self.main_task = None
+        self.udp_transport = None
+        self.tcp_server = None
+        self.ready = threading.Event()
+
+    async def handle_client(self, reader, writer):
         """
-        Invia la lista delle variabili al client via TCP
+        Invia la lista delle variabili al client via TCP e ne gestisce i comandi
         """
-        variables_str = ",".join(self.variables)
-        conn.sendall(variables_str.encode())
+        peer_host = writer.get_extra_info("peername")[0]
+        session = ClientSession(writer, (peer_host, self.udp_port), UdpSink(self))
 
-        while True:
-            try:
-                data = conn.recv(1024)
+        self.clients.add(session)
+
+        print(f"Client connesso: {peer_host} ({len(self.clients)} totali)")
 
-                if not data:
+        try:
+            variables_str = ",".join(self.variables)
+            writer.write(f"{variables_str}\n".encode())
+            await writer.drain()
+
+            while True:
+                # Un comando per riga: una riga può arrivare spezzata su più letture TCP
+                try:
+                    line = await reader.readline()
+
+                except ValueError:
+                    writer.write(b"ERR comando troppo lungo\n")
+                    continue
+
+                if not line:
                     break
 
-                command = data.decode().strip()
+                try:
+                    command = line.decode()
 
-                if command in self.variables:
-                    self.selected_variable = command
+                except UnicodeDecodeError:
+                    writer.write(b"ERR comando non UTF-8\n")
+                    continue
 
-                    print(f"Variabile selezionata: {self.selected_variable}")
+                self.handle_command(session, command.strip())
 
-                elif command == "STOP_UDP":
-                    print("Flusso UDP fermato dal client")
-                    self.selected_variable = None
+        except ConnectionError as e:
+            print(f"Errore TCP: {e}")
 
-            except Exception as e:
-                print(f"Errore TCP: {e}")
-                break
+        finally:
+            self.clients.discard(session)
+            session.sink.close()
+            writer.close()
+
+            print(f"Client disconnesso: {peer_host} ({len(self.clients)} totali)")
 
-    def start_tcp_server(self):
+    def handle_command(self, session, command):
         """
-        Avvia il server TCP per comunicare con il client
+        Esegue un comando di controllo per il client session
         """
-        tcp_sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
-        tcp_sock.bind((self.host, self.tcp_port))
-        tcp_sock.listen(1)
+        self.commands.add()
 
-        print(f"Server TCP in ascolto su {self.host}:{self.tcp_port}")
+        if command in self.variables:
+            # Comando dei client a variabile singola: sostituisce la selezione
+            session.subscriptions = {command}
+
+            print(f"Variabile selezionata: {command}")
+
+        elif command.startswith("SUBSCRIBE "):
+            session.subscriptions = session.subscriptions | self.parse_variables(command)
+
+            print(f"Variabili sottoscritte: {', '.join(sorted(session.subscriptions))}")
+
+        elif command.startswith("UNSUBSCRIBE "):
+            names = self.parse_variables(command)
+            session.subscriptions = session.subscriptions - names
+
+            print(f"Variabili rimosse: {', '.join(sorted(names))}")
+
+        elif command in ("STOP_UDP", "STOP"):
+            print("Flusso UDP fermato dal client")
+            session.subscriptions = set()
+
+        elif command.startswith("FORMAT "):
+            data_format = command.split(" ", 1)[1].strip()
+
+            if data_format in (FORMAT_TEXT, FORMAT_BINARY):
+                session.data_format = data_format
 
-        conn, _ = tcp_sock.accept()
+                print(f"Formato dati: {session.data_format}")
 
-        print("Client connesso")
+        elif command == "STATS":
+            # Risposta su una riga: metriche del server e contatori di ogni client
+            stats = self.registry.snapshot("server.")
+            stats["clients"] = [{
+                "udp_address": f"{client.udp_address[0]}:{client.udp_address[1]}",
+                "subscriptions": sorted(client.subscriptions),
+                "format": client.data_format,
+                "transport": client.sink.transport,
+                "datagrams_sent": client.datagrams_sent,
+                "bytes_sent": client.bytes_sent,
+            } for client in self.clients]
 
-        self.handle_client(conn)
+            session.writer.write(f"{json.dumps(stats)}\n".encode())
+
+        elif command.startswith("UDP "):
+            port = command.split(" ", 1)[1].strip()
+
+            if port.isdigit():
+                session.udp_address = (session.udp_address[0], int(port))
+
+                print(f"Destinazione UDP: {session.udp_address[0]}:{port}")
+
+        elif command.startswith("TRANSPORT "):
+            self.set_transport(session, command.split()[1:])
+
+    def set_transport(self, session, arguments):
+        """
+        Cambia il trasporto del client e risponde "OK <trasporto>" o "ERR <motivo>".
+        Con shm il server si collega al SharedRing indicato dal client, che ne è il
+        proprietario: se il segmento non esiste (client su un altro host) il client resta su UDP.
+        La memoria condivisa è accettata solo da client in loopback e solo su un segmento
+        che SharedRing riconosce come ring valido
+        """
+        transport = arguments[0] if arguments else ""
+
+        if transport == TRANSPORT_UDP:
+            sink = UdpSink(self)
+
+        elif transport == TRANSPORT_SHM and len(arguments) == 2:
+            if not is_local_host(session.peer_host):
+                session.writer.write(b"ERR memoria condivisa solo per client locali\n")
+                return
+
+            try:
+                sink = RingSink(SharedRing(arguments[1]))
+
+            except (OSError, ValueError) as e:
+                session.writer.write(f"ERR {e}\n".encode())
+                return
+
+        else:
+            session.writer.write(f"ERR trasporto non valido: {' '.join(arguments)}\n".encode())
+            return
+
+        # Il fan-out gira nello stesso loop asyncio: nessun blocco può trovare il ring già chiuso
+        session.sink.close()
+        session.sink = sink
+
+        session.writer.write(f"OK {transport}\n".encode())
+
+        print(f"Trasporto: {transport}")
+
+    def parse_variables(self, command):
+        """
+        Estrae l'insieme di variabili note da un comando "<COMANDO> a,b,c"
+        """
+        names = command.split(" ", 1)[1].split(",")
 
-    def start_udp_server(self):
-        udp_sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+        return {name.strip() for name in names if name.strip() in self.variables}
+
+    async def stream_samples(self):
+        """
+        Genera un blocco per ogni canale sottoscritto da almeno un client e lo distribuisce.
+
+        Le scadenze sono calcolate in modo assoluto (deadline += intervallo), quindi
+        l'errore di risveglio di asyncio.sleep non si accumula: se un blocco parte
+        in ritardo i successivi partono prima fino a recuperare. Oltre max_lag
+        secondi di ritardo lo scheduler si riallinea invece di inseguire.
+        """
+        period = 1.0 / self.sample_rate
+        interval = self.batch_size * period
+
+        deadline = self.loop.time()
 
         while True:
-            if self.selected_variable:
-                value = random.uniform(-10, 10)
+            deadline += interval
+            delay = deadline - self.loop.time()
+
+            if delay < -self.max_lag:
+                deadline = self.loop.time()
+                delay = 0
+
+            # Anche in ritardo si cede il controllo al loop per servire i client TCP
+            await asyncio.sleep(max(delay, 0))
+
+            subscribed = set().union(*(client.subscriptions for client in self.clients))
+
+            if not subscribed:
+                continue
+
+            variables = sorted(subscribed, key=self.variables.index)
+
+            # Un'unica generazione vettoriale per tutti i canali sottoscritti
+            values = self.source.generate([self.variables.index(variable) for variable in variables])
+
+            # Istante del primo campione del blocco
+            timestamp = time.time() - (self.batch_size - 1) * period
+
+            self.fan_out(variables, values, timestamp, period)
+
+    async def stream_replay(self):
+        """
+        Riproduce la sessione registrata: a ogni intervallo invia i campioni del
+        tratto successivo con i loro indici e istanti originali. Le scadenze
+        seguono lo stesso schema di stream_samples; con velocità None i blocchi
+        vengono inviati uno dopo l'altro cedendo solo il controllo al loop.
+        """
+        replay = self.replay
+        deadline = self.loop.time()
+
+        while True:
+            if replay.apply_seek():
+                deadline = self.loop.time()
+
+            if replay.finished:
+                await asyncio.sleep(replay.interval)
+                continue
 
-                message = f"{self.selected_variable}:{value}"
+            blocks = replay.next_blocks()
+            subscribed = set().union(*(client.subscriptions for client in self.clients))
 
-                udp_sock.sendto(message.encode(), (self.host, self.udp_port))
+            start = time.perf_counter()
+            clients = list(self.clients)
 
-            time.sleep(0.1)
+            for variable, (x_data, y_data, timestamps) in blocks.items():
+                if variable not in subscribed:
+                    continue
+
+                # Un frame porta indici consecutivi: si spezza il blocco nei buchi della registrazione
+                breaks = np.flatnonzero(np.diff(x_data) != 1) + 1
+
+                for begin, stop in zip(np.r_[0, breaks], np.r_[breaks, len(y_data)]):
+                    period = (timestamps[stop - 1] - timestamps[begin]) / (stop - begin - 1) if stop - begin > 1 else 0.0
+
+                    for first in range(begin, stop, self.batch_size):
+                        last = min(first + self.batch_size, stop)
+
+                        self.send_block(clients, variable, y_data[first:last], int(x_data[first]),
+                                        float(timestamps[first]), period)
+
+            if blocks:
+                self.send_time.record(time.perf_counter() - start)
+
+            if replay.speed is None:
+                await asyncio.sleep(0)
+                continue
+
+            deadline += replay.interval
+            delay = deadline - self.loop.time()
+
+            if delay < -self.max_lag:
+                deadline = self.loop.time()
+                delay = 0
+
+            await asyncio.sleep(max(delay, 0))
+
+    def fan_out(self, variables, values, timestamp, period):
+        """
+        Invia i blocchi generati a tutti i client sottoscritti, numerandone i campioni
+        """
+        start = time.perf_counter()
+
+        clients = list(self.clients)
+
+        for variable, block in zip(variables, values):
+            channel = self.variables.index(variable)
+
+            first_index = self.sample_indices.get(channel, 0)
+            self.sample_indices[channel] = first_index + len(block)
+
+            self.send_block(clients, variable, block, first_index, timestamp, period)
+
+        self.send_time.record(time.perf_counter() - start)
+
+    def send_block(self, clients, variable, block, first_index, timestamp, period):
+        """
+        Invia un blocco ai client sottoscritti alla variabile con il trasporto di
+        ognuno. Il blocco viene codificato al più una volta per formato (o per il
+        ring condiviso), indipendentemente dal numero di client.
+        """
+        channel = self.variables.index(variable)
+
+        encoded = {}
+
+        for client in clients:
+            if variable not in client.subscriptions:
+                continue
+
+            sequence = client.sequences.get(channel, 0)
+            client.sequences[channel] = sequence + 1
+
+            try:
+                datagrams, size = client.sink.send(client, channel, sequence, variable, block, first_index, timestamp,
+                                                   period, encoded)
+
+            except Exception as e:
+                # Un trasporto guasto (es. ring danneggiato dal client) non deve fermare il flusso
+                # degli altri client: questo client torna su UDP, che il suo ricevitore ascolta sempre
+                print(f"Errore del trasporto {client.sink.transport}, ripiego su UDP: {e!r}")
+
+                client.sink.close()
+                client.sink = UdpSink(self)
+                continue
+
+            client.datagrams_sent += datagrams
+            client.bytes_sent += size
+
+            self.datagrams_sent.add(datagrams)
+            self.bytes_sent.add(size)
+
+    async def serve(self):
+        """
+        Avvia il server TCP e il flusso UDP e resta in esecuzione
+        """
+        self.loop = asyncio.get_running_loop()
+        self.main_task = asyncio.current_task()
+
+        self.udp_transport, _ = await self.loop.create_datagram_endpoint(asyncio.DatagramProtocol, family=socket.AF_INET)
+
+        self.tcp_server = await asyncio.start_server(self.handle_client, self.host, self.tcp_port, reuse_address=True)
+
+        print(f"Server TCP in ascolto su {self.host}:{self.tcp_port}")
+
+        self.ready.set()
+
+        async with self.tcp_server:
+            stream = self.stream_samples() if self.replay is None else self.stream_replay()
+
+            await asyncio.gather(self.tcp_server.serve_forever(), stream)
+
+    def run(self):
+        try:
+            asyncio.run(self.serve())
+
+        except asyncio.CancelledError:
+            pass
 
     def start(self):
-        threading.Thread(target=self.start_tcp_server, daemon=True).start()
-        threading.Thread(target=self.start_udp_server, daemon=True).start()
+        """
+        Avvia il server in un thread dedicato con il proprio event loop
+        e attende che il socket TCP sia in ascolto
+        """
+        threading.Thread(target=self.run, daemon=True).start()
+
+        self.ready.wait(timeout=5)
+
+    def stop(self):
+        """
+        Ferma il server avviato con start()
+        """
+        if self.main_task is not None:
+            self.loop.call_soon_threadsafe(self.main_task.cancel)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Server di controllo TCP e streaming UDP di campioni sintetici")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--tcp-port", type=int, default=6000)
+    parser.add_argument("--udp-port", type=int, default=5005)
+    parser.add_argument("--rate", type=float, default=10.0, help="campioni al secondo per canale")
+    parser.add_argument("--batch", type=int, default=1, help="campioni per frame")
+    parser.add_argument("--channels", type=int, default=None, help="numero di canali")
+    parser.add_argument("--waveform", choices=WAVEFORMS, default="noise")
+    parser.add_argument("--dtype", choices=("float32", "float64"), default="float64")
+    parser.add_argument("--replay", metavar="DIR", default=None, help="riproduce una sessione registrata invece di generare campioni")
+    parser.add_argument("--speed", default="1", help="velocità di riproduzione (es. 1, 4, 0.5) oppure max")
+    parser.add_argument("--metrics-port", type=int, default=None, help="espone le metriche in JSON su http://127.0.0.1:PORT/metrics")
+    args = parser.parse_args()
+
+    if args.metrics_port is not None:
+        MetricsHttpServer(REGISTRY, "127.0.0.1", args.metrics_port).start()
+
+    replay = None
+
+    if args.replay is not None:
+        replay = ReplaySource(args.replay, speed=None if args.speed == "max" else float(args.speed))
+
+    server = UDPServer(args.host, args.tcp_port, args.udp_port, args.rate, args.batch, np.dtype(args.dtype),
+                       args.channels, args.waveform, replay=replay)
+    server.run()
+
+
+if __name__ == "__main__":
+    main()
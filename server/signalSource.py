@@ -0,0 +1,111 @@
+"""
+===============================================================================
+ Project:      Python Graph Plotter
+ File:         signalSource.py
+ Author:       Matteo Franchini
+ Created:      17/10/2026
+ License:      MIT License (c) 2025 Matteo Franchini
+ Repository:   https://github.com/MatteoFranchini01/python_graph_plotter
+===============================================================================
+ MIT License
+
+ Copyright (c) 2025 Matteo Franchini
+
+ Permission is hereby granted, free of charge, to any person obtaining a copy
+ of this software and associated documentation files (the "Software"), to deal
+ in the Software without restriction, including without limitation the rights
+ to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+ copies of the Software, and to permit persons to whom the Software is
+ furnished to do so, subject to the following conditions:
+
+ The above copyright notice and this permission notice shall be included in
+ all copies or substantial portions of the Software.
+
+ THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+ IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+ FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+ AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+ LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING
+ FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS
+ IN THE SOFTWARE.
+===============================================================================
+"""
+
+import numpy as np
+
+WAVEFORMS = ("noise", "sine", "steps", "spikes")
+
+
+class SignalSource:
+    """
+    Generatore vettoriale di segnali sintetici per più canali.
+
+    Ogni chiamata a generate() produce un blocco (canali, batch_size) con una
+    manciata di operazioni NumPy, senza cicli Python per campione. Ogni
+    canale ricorda la propria posizione, così le forme d'onda restano
+    continue tra un blocco e l'altro.
+
+    Forme d'onda disponibili:
+        noise   rumore uniforme in [-amplitude, amplitude]
+        sine    sinusoide con frequenza e fase diverse per canale, più un po' di rumore
+        steps   livelli costanti che cambiano ogni step_length campioni
+        spikes  rumore ridotto con picchi rari che superano le soglie
+    """
+
+    def __init__(self, channels, sample_rate=10.0, batch_size=1, waveform="noise", amplitude=10.0,
+                 frequency=1.0, step_length=None, spike_probability=0.001, spike_amplitude=None, seed=None):
+        if waveform not in WAVEFORMS:
+            raise ValueError(f"Forma d'onda non supportata: {waveform}")
+
+        self.channels = channels
+        self.sample_rate = sample_rate
+        self.batch_size = batch_size
+        self.waveform = waveform
+        self.amplitude = amplitude
+        self.frequency = frequency                                  # Hz della sinusoide del canale 0
+        self.step_length = step_length or max(1, int(sample_rate))  # Campioni per gradino
+        self.spike_probability = spike_probability
+        self.spike_amplitude = spike_amplitude if spike_amplitude is not None else 5 * amplitude
+
+        self.rng = np.random.default_rng(seed)
+
+        # Prossimo campione da generare per ogni canale
+        self.positions = np.zeros(channels, dtype=np.int64)
+
+        # Parametri fissi per canale
+        self.frequencies = self.frequency * (1 + 0.25 * np.arange(channels))
+        self.phases = self.rng.uniform(0, 2 * np.pi, channels)
+        self.levels = self.rng.uniform(-amplitude, amplitude, (channels, 16))
+
+    def generate(self, channel_ids):
+        """
+        Restituisce un blocco (len(channel_ids), batch_size) di campioni float64
+        """
+        channel_ids = np.asarray(channel_ids, dtype=np.int64)
+        shape = (len(channel_ids), self.batch_size)
+
+        # Indice assoluto di ogni campione del blocco
+        index = self.positions[channel_ids, None] + np.arange(self.batch_size)
+        self.positions[channel_ids] += self.batch_size
+
+        if self.waveform == "noise":
+            return self.rng.uniform(-self.amplitude, self.amplitude, shape)
+
+        if self.waveform == "sine":
+            t = index / self.sample_rate
+            values = self.amplitude * np.sin(2 * np.pi * self.frequencies[channel_ids, None] * t + self.phases[channel_ids, None])
+
+            return values + self.rng.normal(0, 0.05 * self.amplitude, shape)
+
+        if self.waveform == "steps":
+            step = (index // self.step_length) % self.levels.shape[1]
+
+            return self.levels[channel_ids[:, None], step]
+
+        # spikes
+        values = self.rng.normal(0, 0.1 * self.amplitude, shape)
+
+        mask = self.rng.random(shape) < self.spike_probability
+        values[mask] += self.rng.choice((-1.0, 1.0), mask.sum()) * self.spike_amplitude
+
+        return values
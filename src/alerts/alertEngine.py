@@ -0,0 +1,283 @@
+"""
+===============================================================================
+ Project:      Python Graph Plotter
+ File:         alertEngine.py
+ Author:       Matteo Franchini
+ Created:      17/10/2026
+ License:      MIT License (c) 2025 Matteo Franchini
+ Repository:   https://github.com/MatteoFranchini01/python_graph_plotter
+===============================================================================
+ MIT License
+
+ Copyright (c) 2025 Matteo Franchini
+
+ Permission is hereby granted, free of charge, to any person obtaining a copy
+ of this software and associated documentation files (the "Software"), to deal
+ in the Software without restriction, including without limitation the rights
+ to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+ copies of the Software, and to permit persons to whom the Software is
+ furnished to do so, subject to the following conditions:
+
+ The above copyright notice and this permission notice shall be included in
+ all copies or substantial portions of the Software.
+
+ THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+ IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+ FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+ AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+ LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING
+ FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS
+ IN THE SOFTWARE.
+===============================================================================
+"""
+
+import queue
+import threading
+import time
+from typing import NamedTuple
+
+import numpy as np
+
+from src.metrics.registry import REGISTRY
+
+ABOVE = "above"
+BELOW = "below"
+
+
+class AlertRule(NamedTuple):
+    kind: str                   # ABOVE o BELOW
+    threshold: float
+    hysteresis: float = 0.0     # La violazione termina solo rientrando di hysteresis oltre la soglia
+    min_duration: float = 0.0   # Secondi minimi di violazione perché venga contata
+    debounce: float = 0.5       # Una violazione che riparte entro debounce secondi dalla precedente non è nuova
+
+
+class AlertEvent(NamedTuple):
+    variable: str
+    rule: AlertRule
+    violations: int             # Violazioni contate nella finestra
+    peak: float                 # Valore più lontano dalla soglia
+    window: float               # Secondi coperti dall'evento
+
+    def message(self):
+        direction = "sopra" if self.rule.kind == ABOVE else "sotto"
+
+        return (f"{self.variable}: {self.violations} violazioni {direction} la soglia {self.rule.threshold:.2f}, "
+                f"picco {self.peak:.2f} negli ultimi {self.window:.1f} s")
+
+
+class RuleState:
+    """
+    Stato di una regola su una variabile, mantenuto tra un blocco e l'altro
+    """
+
+    def __init__(self, rule):
+        self.rule = rule
+
+        self.active = False         # Violazione in corso (con isteresi)
+        self.episode_start = 0.0    # Istante di inizio della violazione in corso
+        self.episode_counted = False
+        self.episode_valid = True   # False se la violazione in corso è ripartita entro il debounce
+        self.last_end = None        # Istante di fine dell'ultima violazione
+
+        # Aggregato da inviare alla UI
+        self.violations = 0
+        self.peak = None
+        self.window_start = time.monotonic()
+        self.last_event = None
+
+    def evaluate(self, timestamps, values):
+        """
+        Valuta un blocco e aggiorna l'aggregato; restituisce le violazioni nuove.
+
+        Per ABOVE la violazione inizia con un valore sopra la soglia e termina
+        con uno non oltre threshold - hysteresis; in mezzo (e sui NaN) lo stato
+        non cambia. Lo stato di ogni campione è quello dell'ultimo evento di
+        ingresso o uscita che lo precede, calcolato con un accumulate. Le
+        regole BELOW vengono valutate sui valori cambiati di segno.
+        """
+        rule = self.rule
+        sign = 1.0 if rule.kind == ABOVE else -1.0
+
+        y = sign * values
+        threshold = sign * rule.threshold
+
+        enter = y > threshold
+        leave = y <= threshold - rule.hysteresis
+
+        positions = np.arange(len(y))
+        last_event = np.maximum.accumulate(np.where(enter | leave, positions, -1))
+
+        state = np.where(last_event >= 0, enter[np.maximum(last_event, 0)], self.active)
+
+        if not state.any() and not self.active:
+            return 0
+
+        previous = np.concatenate(([self.active], state[:-1]))
+
+        start_times = timestamps[np.flatnonzero(state & ~previous)]
+        end_times = timestamps[np.flatnonzero(~state & previous)]
+
+        counted = np.zeros(len(start_times) + self.active, dtype=bool)
+
+        if self.active:
+            start_times = np.concatenate(([self.episode_start], start_times))
+            counted[0] = self.episode_counted
+
+        ongoing = bool(state[-1])
+
+        # Fine di ogni violazione; quella ancora in corso dura fino all'ultimo campione
+        episode_ends = np.concatenate((end_times, timestamps[-1:])) if ongoing else end_times
+
+        previous_ends = np.concatenate(([self.last_end if self.last_end is not None else -np.inf], end_times))[:len(start_times)]
+
+        valid = start_times - previous_ends >= rule.debounce
+
+        if self.active:
+            valid[0] = self.episode_valid
+
+        new = valid & ~counted & (episode_ends - start_times >= rule.min_duration)
+        violations = int(new.sum())
+
+        if ongoing:
+            self.episode_start = start_times[-1]
+            self.episode_counted = bool(counted[-1] or new[-1])
+            self.episode_valid = bool(valid[-1])
+
+        if len(end_times):
+            self.last_end = end_times[-1]
+
+        self.active = ongoing
+
+        if violations:
+            peak = sign * np.nanmax(y[state]) if state.any() else rule.threshold
+
+            self.violations += violations
+            self.peak = peak if self.peak is None else (max(self.peak, peak) if sign > 0 else min(self.peak, peak))
+
+        return violations
+
+    def take_event(self, variable, now, rate_limit):
+        """
+        Restituisce l'evento aggregato se ci sono violazioni e il rate limit lo consente
+        """
+        if self.violations == 0 or (self.last_event is not None and now - self.last_event < rate_limit):
+            return None
+
+        event = AlertEvent(variable, self.rule, self.violations, self.peak, now - self.window_start)
+
+        self.violations = 0
+        self.peak = None
+        self.window_start = now
+        self.last_event = now
+
+        return event
+
+
+class AlertEngine:
+    """
+    Valutazione delle soglie in un thread dedicato.
+
+    I blocchi vengono accodati con submit() dal thread che li riceve e
+    valutati interi con NumPy, quindi il costo per blocco non dipende dalla
+    frequenza di campionamento. Verso la UI passano solo eventi aggregati,
+    al più uno ogni rate_limit secondi per variabile e regola. Se la coda è
+    piena i blocchi vengono scartati e contati, così il ricevitore non si
+    blocca mai.
+    """
+
+    def __init__(self, on_event, rate_limit=2.0, max_queue=1024, tick=0.25, registry=REGISTRY):
+        self.on_event = on_event
+        self.rate_limit = rate_limit
+        self.tick = tick                # Secondi massimi tra due controlli degli aggregati
+
+        self.rules = ()
+        self.states = {}                # (variabile, regola) -> RuleState
+        self.queue = queue.Queue(max_queue)
+
+        self.evaluate_time = registry.histogram("alerts.evaluate")
+        self.violations = registry.counter("alerts.violations")
+        self.events = registry.counter("alerts.events")
+        self.dropped = registry.counter("alerts.dropped_blocks")
+
+        self.running = False
+        self.thread = None
+
+    def set_rules(self, rules):
+        """
+        Sostituisce le regole attive; lo stato delle regole cambiate riparte da zero
+        """
+        self.rules = tuple(rules)
+
+    def submit(self, blocks):
+        """
+        Accoda {variabile: (X, valori, istanti)}; chiamabile da qualunque thread
+        """
+        if not self.rules:
+            return
+
+        try:
+            self.queue.put_nowait(blocks)
+
+        except queue.Full:
+            self.dropped.add()
+
+    def start(self):
+        self.running = True
+
+        self.thread = threading.Thread(target=self.run, daemon=True)
+        self.thread.start()
+
+    def stop(self):
+        self.running = False
+
+        if self.thread is not None:
+            self.thread.join()
+            self.thread = None
+
+    def run(self):
+        while self.running:
+            try:
+                blocks = self.queue.get(timeout=self.tick)
+
+            except queue.Empty:
+                blocks = None
+
+            if blocks is not None:
+                self.evaluate(blocks)
+
+            self.emit_events()
+
+    def evaluate(self, blocks):
+        start = time.perf_counter()
+        rules = self.rules
+
+        for variable, (_, y_data, timestamps) in blocks.items():
+            if len(y_data) == 0:
+                continue
+
+            for rule in rules:
+                state = self.states.get((variable, rule))
+
+                if state is None:
+                    state = self.states[(variable, rule)] = RuleState(rule)
+
+                self.violations.add(state.evaluate(timestamps, y_data))
+
+        self.evaluate_time.record(time.perf_counter() - start)
+
+    def emit_events(self):
+        now = time.monotonic()
+        rules = self.rules
+
+        for (variable, rule), state in list(self.states.items()):
+            # Stato di regole non più attive
+            if rule not in rules:
+                del self.states[(variable, rule)]
+                continue
+
+            event = state.take_event(variable, now, self.rate_limit)
+
+            if event is not None:
+                self.events.add()
+                self.on_event(event)
@@ -0,0 +1,251 @@
+"""
+===============================================================================
+ Project:      Python Graph Plotter
+ File:         headlessController.py
+ Author:       Matteo Franchini
+ Created:      17/10/2026
+ License:      MIT License (c) 2025 Matteo Franchini
+ Repository:   https://github.com/MatteoFranchini01/python_graph_plotter
+===============================================================================
+ MIT License
+
+ Copyright (c) 2025 Matteo Franchini
+
+ Permission is hereby granted, free of charge, to any person obtaining a copy
+ of this software and associated documentation files (the "Software"), to deal
+ in the Software without restriction, including without limitation the rights
+ to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+ copies of the Software, and to permit persons to whom the Software is
+ furnished to do so, subject to the following conditions:
+
+ The above copyright notice and this permission notice shall be included in
+ all copies or substantial portions of the Software.
+
+ THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+ IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+ FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+ AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+ LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING
+ FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS
+ IN THE SOFTWARE.
+===============================================================================
+"""
+
+import argparse
+import json
+import signal
+import sys
+import threading
+import time
+
+from src.alerts.alertEngine import ABOVE, BELOW, AlertEngine, AlertRule
+from src.metrics.registry import REGISTRY
+from src.model.statistics import RollingStatistics
+from src.network.controlClient import ControlClient
+from src.network.protocol import FORMAT_BINARY
+from src.network.udpReceiver import UdpReceiver
+
+
+class HeadlessController:
+    """
+    Ricezione senza interfaccia grafica: stesso protocollo di controllo TCP,
+    stesso UdpReceiver e stessi strati di registrazione, statistiche e alert
+    di MainController, senza importare PySide6 né pyqtgraph.
+
+    Non tiene in memoria la storia dei campioni: per ogni canale restano
+    solo le statistiche incrementali (O(finestra)), quindi un processo
+    occupa pochi MB e se ne possono avviare molti sulla stessa macchina.
+    I blocchi vengono elaborati direttamente sul thread di ricezione.
+    """
+
+    def __init__(self, host="127.0.0.1", tcp_port=6000, udp_port=0, channels=None, record=None,
+                 stats_window=1000, rules=(), on_alert=None, recv_buffer_size=4 * 1024 * 1024):
+        self.host = host
+        self.tcp_port = tcp_port
+        self.udp_port = udp_port
+        self.channels = channels
+        self.stats_window = stats_window
+        self.recv_buffer_size = recv_buffer_size
+
+        self.stats = {}
+        self.stats_lock = threading.Lock()
+
+        self.recorder = None
+
+        if record is not None:
+            # Importato solo se serve, per non allungare l'avvio
+            from src.recording.recorder import SessionRecorder
+            self.recorder = SessionRecorder(record)
+
+        self.alert_engine = AlertEngine(on_alert or self.print_alert)
+        self.alert_engine.set_rules(list(rules))
+
+        self.control = None
+        self.udp_receiver = None
+        self.variables = []
+
+    def start(self):
+        """
+        Si connette al server, apre il ricevitore UDP e si iscrive ai canali.
+        Restituisce i canali effettivamente sottoscritti.
+        """
+        self.control = ControlClient(self.host, self.tcp_port)
+        variables = self.variables = self.control.connect(timeout=5.0)
+
+        self.control.request_format(FORMAT_BINARY)
+
+        self.udp_receiver = UdpReceiver(self.host, self.udp_port, self.on_udp_blocks, variables=variables,
+                                        recv_buffer_size=self.recv_buffer_size)
+        self.udp_receiver.start()
+        self.alert_engine.start()
+
+        self.control.set_udp_port(self.udp_receiver.port)
+
+        channels = variables if self.channels is None else [name for name in self.channels if name in variables]
+
+        with self.stats_lock:
+            for name in channels:
+                self.stats[name] = RollingStatistics(self.stats_window)
+
+        if channels:
+            self.control.subscribe(channels)
+
+        return channels
+
+    def on_udp_blocks(self, blocks):
+        """
+        Chiamato dal thread di ricezione: registra, aggiorna le statistiche e passa i blocchi agli alert
+        """
+        variables = self.variables
+
+        with self.stats_lock:
+            blocks = {variables[channel]: block for channel, block in blocks.items()
+                      if channel < len(variables) and variables[channel] in self.stats}
+
+            for name, (x_data, y_data, timestamps) in blocks.items():
+                self.stats[name].extend(y_data)
+
+        if not blocks:
+            return
+
+        if self.recorder is not None:
+            for name, (x_data, y_data, timestamps) in blocks.items():
+                self.recorder.append(name, x_data, y_data, timestamps)
+
+        self.alert_engine.submit(blocks)
+
+    def summary(self, scope="window"):
+        """
+        Riepilogo delle statistiche di ogni canale: ultimi campioni ("window") o intera sessione
+        """
+        with self.stats_lock:
+            return {name: stats.window_summary() if scope == "window" else stats.session_summary()
+                    for name, stats in self.stats.items()}
+
+    def print_alert(self, event):
+        print(json.dumps({"time": time.time(), "alert": event.message()}), flush=True)
+
+    def stop(self):
+        if self.control is not None:
+            try:
+                self.control.stop_stream()
+
+            except OSError:
+                pass
+
+            self.control.close()
+
+        if self.udp_receiver is not None:
+            self.udp_receiver.stop()
+
+        self.alert_engine.stop()
+
+        if self.recorder is not None:
+            self.recorder.close()
+
+
+def parse_rule(text, hysteresis, min_duration, debounce):
+    """
+    Regola di alert nel formato ">VALORE" (sopra) o "<VALORE" (sotto)
+    """
+    kinds = {">": ABOVE, "<": BELOW}
+
+    if not text or text[0] not in kinds:
+        raise argparse.ArgumentTypeError(f"regola non valida: {text} (usare >VALORE o <VALORE)")
+
+    return AlertRule(kinds[text[0]], float(text[1:]), hysteresis, min_duration, debounce)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Ricezione, registrazione, statistiche e alert senza interfaccia grafica")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--tcp-port", type=int, default=6000)
+    parser.add_argument("--udp-port", type=int, default=0, help="porta UDP locale (0 = libera)")
+    parser.add_argument("--channels", default=None, help="variabili separate da virgola (predefinito: tutte)")
+    parser.add_argument("--record", metavar="DIR", default=None, help="registra la sessione nella directory")
+    parser.add_argument("--stats-window", type=int, default=1000, help="campioni della finestra delle statistiche")
+    parser.add_argument("--stats-interval", type=float, default=5.0, help="secondi tra due righe di statistiche (0 = mai)")
+    parser.add_argument("--scope", choices=("window", "session"), default="window")
+    parser.add_argument("--alert", action="append", default=[], metavar="RULE", help="soglia, es. '>80' o '<-5' (ripetibile)")
+    parser.add_argument("--hysteresis", type=float, default=0.0)
+    parser.add_argument("--min-duration", type=float, default=0.0)
+    parser.add_argument("--debounce", type=float, default=0.5)
+    parser.add_argument("--duration", type=float, default=None, help="secondi di esecuzione (predefinito: fino a SIGINT/SIGTERM)")
+    parser.add_argument("--metrics-port", type=int, default=None, help="espone le metriche in JSON su http://127.0.0.1:PORT/metrics")
+    args = parser.parse_args()
+
+    try:
+        rules = [parse_rule(rule, args.hysteresis, args.min_duration, args.debounce) for rule in args.alert]
+
+    except (argparse.ArgumentTypeError, ValueError) as exc:
+        parser.error(str(exc))
+
+    if args.metrics_port is not None:
+        from src.metrics.httpEndpoint import MetricsHttpServer
+        MetricsHttpServer(REGISTRY, "127.0.0.1", args.metrics_port).start()
+
+    channels = args.channels.split(",") if args.channels else None
+
+    controller = HeadlessController(args.host, args.tcp_port, args.udp_port, channels, args.record,
+                                    args.stats_window, rules)
+
+    stop_event = threading.Event()
+
+    for signum in (signal.SIGINT, signal.SIGTERM):
+        signal.signal(signum, lambda *_: stop_event.set())
+
+    try:
+        subscribed = controller.start()
+
+    except OSError as exc:
+        print(f"Connessione a {args.host}:{args.tcp_port} non riuscita: {exc}", file=sys.stderr)
+        sys.exit(1)
+
+    print(json.dumps({"time": time.time(), "subscribed": subscribed}), flush=True)
+
+    deadline = None if args.duration is None else time.monotonic() + args.duration
+    interval = args.stats_interval if args.stats_interval > 0 else None
+
+    while not stop_event.is_set():
+        timeout = interval
+
+        if deadline is not None:
+            remaining = deadline - time.monotonic()
+
+            if remaining <= 0:
+                break
+
+            timeout = remaining if timeout is None else min(timeout, remaining)
+
+        if stop_event.wait(timeout) or interval is None:
+            continue
+
+        if deadline is None or time.monotonic() < deadline:
+            print(json.dumps({"time": time.time(), args.scope: controller.summary(args.scope)}), flush=True)
+
+    controller.stop()
+    print(json.dumps({"time": time.time(), "session": controller.summary("session")}), flush=True)
+
+
+if __name__ == "__main__":
+    main()
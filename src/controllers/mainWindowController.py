@@ -31,30 +31,86 @@
 ===============================================================================
 """
 
+import os
 import threading
-import socket
+import time
 
-from PySide6.QtWidgets import QGraphicsView, QCheckBox, QDoubleSpinBox, QListView, QAbstractItemView, QPushButton, QMessageBox
-from PySide6.QtCore import Signal, QObject, Qt
+from PySide6.QtWidgets import QApplication, QGraphicsView, QCheckBox, QDoubleSpinBox, QListView, QAbstractItemView, QPushButton, QMessageBox, QFileDialog, QInputDialog
+from PySide6.QtCore import Signal, QObject, Qt, QTimer, QEvent
 from PySide6.QtGui import QStandardItem, QStandardItemModel
 
 from src.uiLoader import UiLoader
-from src.graph.plotWidget import LivePlotWidget
-from src.model.ModelData import ModelData
+from src.metrics.startup import STARTUP
+
+# NumPy, pyqtgraph e i moduli che li usano vengono importati al primo uso
+# (finish_startup e i singoli comandi), dopo che la finestra è già comparsa
 
 class DataReceiver(QObject):
     """
     Segnale per aggiornare il grafico nel thread principale
     """
-    data_received = Signal(float)
+    blocks_received = Signal(object)    # {nome variabile: (X, valori, istanti)} di un risveglio del ricevitore
+    replay_seeked = Signal(float)       # Nuova posizione (s) della riproduzione, prima dei blocchi successivi
+    alert_raised = Signal(object)       # AlertEvent aggregato prodotto dal motore degli alert
+    export_progress = Signal(float)     # Frazione dell'esportazione completata
+    export_finished = Signal(str, object)   # Percorso esportato ed eventuale errore
+    connected = Signal(object)          # ControlClient connesso, con la lista delle variabili già ricevuta
+    connection_failed = Signal(str)     # Errore del tentativo di connessione
+    transport_negotiated = Signal(object, str, bool)  # ControlClient, trasporto proposto, accettato dal server
+
+class FirstPaintFilter(QObject):
+    """
+    Chiama callback al primo evento di paint del widget osservato, poi si rimuove
+    """
+
+    def __init__(self, widget, callback):
+        super().__init__(widget)
+
+        self.widget = widget
+        self.callback = callback
+
+        widget.installEventFilter(self)
+
+    def eventFilter(self, watched, event):
+        if event.type() == QEvent.Paint:
+            self.widget.removeEventFilter(self)
+            self.callback()
+
+        return False
 
 class MainController(QObject):
     alert_signal = Signal(str)      # Funzionalità solo per MacOS
+    startup_finished = Signal()             # Grafico, alert e ricevitore creati: la UI è utilizzabile
+    first_frame_rendered = Signal(object)   # Tempi di avvio (ms) al primo frame disegnato con dati
 
-    def __init__(self):
+    def __init__(self, fast_start=True, host="127.0.0.1", tcp_port=6000, subscribe=(), ingest_process=False,
+                 transport="auto", retention=None):
+        """
+        Con fast_start la finestra usa la classe compilata ui/ui_mainwindow.py
+        e compare prima degli import pesanti: grafico, statistiche, alert e
+        ricevitore UDP vengono creati dopo il primo paint (finish_startup).
+        Senza fast_start il .ui viene letto a runtime e tutto è creato subito.
+        In entrambi i casi la connessione al server avviene in background e
+        viene ritentata finché non riesce. Le variabili in subscribe vengono
+        sottoscritte appena grafico e connessione sono pronti.
+        Con ingest_process la ricezione UDP gira in un processo separato
+        (IngestProcess) e i campioni arrivano attraverso la memoria condivisa.
+        Con transport "auto" e un server sullo stesso host i campioni arrivano
+        in un ring in memoria condivisa, se il server lo accetta; con "udp"
+        sempre come datagrammi.
+        retention associa a una variabile (None per tutte le altre) la
+        RetentionPolicy che limita la memoria dei suoi campioni.
+        """
         super().__init__()
 
-        self.ui = UiLoader.load_ui("ui/mainwindow.ui")
+        if fast_start:
+            from ui.ui_mainwindow import Ui_MainWindow
+            self.ui = UiLoader.load_compiled(Ui_MainWindow)
+
+        else:
+            self.ui = UiLoader.load_ui("ui/mainwindow.ui")
+
+        STARTUP.mark("ui")
 
         self.graphics_view = self.ui.findChild(QGraphicsView, "graphicsView")
         self.checkMax = self.ui.findChild(QCheckBox, "maxLineCheckBox")
@@ -72,8 +128,152 @@ class MainController(QObject):
         self.spinMin.setMinimum(-1000.0)
         self.spinMax.setMaximum(1000.0)
 
-        self.model = ModelData()
-        self.plot = LivePlotWidget(self.graphics_view, self.model)
+        # Un ModelData per ogni variabile sottoscritta, tutte disegnate sullo stesso grafico
+        self.models = {}
+        self.plot = None
+
+        # Politiche di retention per variabile; None è quella di default (nessun limite)
+        self.retention = dict(retention or {})
+
+        # Registrazione su disco dei blocchi ricevuti, scritta dal thread di ricezione
+        self.recorder = None
+        self.recorder_lock = threading.Lock()
+
+        # Menu File per registrare e riaprire le sessioni
+        file_menu = self.ui.menuBar().addMenu("File")
+        file_menu.addAction("Avvia registrazione...", self.on_start_recording)
+        file_menu.addAction("Ferma registrazione", self.stop_recording)
+        file_menu.addAction("Apri registrazione...", self.on_open_recording)
+        file_menu.addSeparator()
+        file_menu.addAction("Riproduci registrazione...", self.on_start_replay)
+        file_menu.addAction("Vai a...", self.on_seek_replay)
+        file_menu.addAction("Ferma riproduzione", self.stop_replay)
+        file_menu.addSeparator()
+        file_menu.addAction("Esporta dati...", self.on_export)
+        file_menu.addAction("Annulla esportazione", self.cancel_export)
+
+        # Menu Visualizza: riquadro delle metriche sopra il grafico e pannello delle statistiche
+        self.view_menu = self.ui.menuBar().addMenu("Visualizza")
+        self.metrics_action = self.view_menu.addAction("Metriche")
+        self.metrics_action.setCheckable(True)
+
+        # Soglie automatiche a media ± kσ della variabile selezionata nel pannello
+        self.auto_threshold_k = 3.0
+        self.auto_threshold_timer = QTimer(self)
+        self.auto_threshold_timer.setInterval(1000)
+        self.auto_threshold_timer.timeout.connect(self.apply_auto_threshold)
+
+        threshold_menu = self.ui.menuBar().addMenu("Soglie")
+        self.auto_threshold_action = threshold_menu.addAction("Automatiche (media ± kσ)...")
+        self.auto_threshold_action.setCheckable(True)
+        self.auto_threshold_action.toggled.connect(self.on_auto_threshold_toggled)
+
+        # Riproduzione di una sessione registrata attraverso lo stesso percorso dei dati UDP
+        self.replay = None
+        self.replay_variables = {}
+
+        # Esportazione in corso su un thread separato
+        self.exporter = None
+
+        # Connessione con il server
+        self.host = host
+        self.udp_port = 5005
+        self.tcp_port = tcp_port
+        self.udp_recv_buffer = 4 * 1024 * 1024     # Dimensione del buffer di ricezione UDP (byte)
+        self.subscribed = set()
+        self.pending_subscriptions = list(subscribe)
+        self.variables = []
+        self.variable_model = QStandardItemModel()
+
+        self.control = None
+        self.connecting = False
+        self.retry_now = False
+        self.connect_timeout = 2.0      # Secondi massimi per connessione e lista delle variabili
+        self.reconnect_delay = 0.25     # Attesa prima del prossimo tentativo, raddoppiata a ogni errore
+        self.max_reconnect_delay = 5.0
+
+        # Una connessione chiusa dal server viene notata anche senza comandi in uscita
+        self.connection_watchdog = QTimer(self)
+        self.connection_watchdog.setInterval(1000)
+        self.connection_watchdog.timeout.connect(self.check_connection)
+
+        # Configurazione della QListView come una lista con checkbox
+        self.listView.setSelectionMode(QAbstractItemView.NoSelection)
+        self.listView.setModel(self.variable_model)
+        self.listView.clicked.connect(self.on_variable_selected)
+
+        # Segnali dai thread di ricezione, riproduzione, alert, esportazione e connessione
+        self.receiver = DataReceiver()
+        self.receiver.blocks_received.connect(self.on_blocks_received)
+        self.receiver.replay_seeked.connect(self.on_replay_seeked)
+        self.receiver.alert_raised.connect(self.on_alert_raised)
+        self.receiver.export_progress.connect(self.on_export_progress)
+        self.receiver.export_finished.connect(self.on_export_finished)
+        self.receiver.connected.connect(self.on_connected)
+        self.receiver.connection_failed.connect(self.on_connection_failed)
+        self.receiver.transport_negotiated.connect(self.on_transport_negotiated)
+
+        # Valutazione delle soglie fuori dal thread della UI: arrivano solo eventi aggregati
+        self.alert_hysteresis = 0.0     # Rientro oltre la soglia necessario per chiudere una violazione
+        self.alert_min_duration = 0.0   # Secondi minimi di violazione
+        self.alert_debounce = 0.5       # Secondi entro cui una nuova violazione non viene contata
+        self.alert_engine = None
+        self.stream_index = None
+        self.udp_receiver = None
+
+        # Ricezione in un processo separato: il ring condiviso viene svuotato da un timer
+        self.ingest_process = ingest_process
+        self.ingest_timer = None
+        self.ring_overflow = None
+
+        # Trasporto richiesto e ring in cui scrive il server quando accetta la memoria condivisa
+        self.transport = transport
+        self.shm_ring = None
+
+        # Variabile per tracciare l'ultimo alert
+        self.alert_box = None
+
+        # Imposto le soglie iniziali
+        self.alertMaxActive = False
+        self.alertMinActive = False
+        self.lastAlertTime = None
+
+        self.alert_signal.connect(self.show_alert)      # Funzionalità solo per MacOS
+
+        # Tempo di avvio fino al primo frame disegnato con dati ricevuti
+        self.first_data = False
+
+        # Fino a finish_startup i controlli che usano grafico e ricevitore restano disabilitati
+        self.ui.centralWidget().setEnabled(False)
+        self.ui.menuBar().setEnabled(False)
+
+        self.connect_to_server()
+
+        self.paint_filter = FirstPaintFilter(self.ui, self.on_first_paint)
+
+        if not fast_start:
+            self.finish_startup()
+
+    def on_first_paint(self):
+        STARTUP.mark("first_paint")
+
+        # Il resto dell'avvio parte appena la finestra ha finito di disegnarsi
+        if self.plot is None:
+            QTimer.singleShot(0, self.finish_startup)
+
+    def finish_startup(self):
+        """
+        Crea grafico, pannello delle statistiche, motore degli alert, ricevitore UDP
+        ed eventuale ring per il trasporto in memoria condivisa
+        """
+        from src.alerts.alertEngine import AlertEngine
+        from src.graph.plotWidget import LivePlotWidget
+        from src.graph.statsPanel import StatsPanel
+        from src.metrics.registry import REGISTRY
+        from src.network.protocol import is_local_host
+        from src.network.streamIndex import StreamIndex
+
+        self.plot = LivePlotWidget(self.graphics_view)
 
         # Collego i segnali della UI ai metodi del MainController
         self.stopRegBtn.clicked.connect(self.onStopRegBtnClicked)
@@ -90,156 +290,699 @@ class MainController(QObject):
         self.plot.update_min_value.connect(self.spinMin.setValue)
         self.plot.update_max_value.connect(self.spinMax.setValue)
 
-        # Connessione con il server
-        self.host = "127.0.0.1"
-        self.udp_port = 5005
-        self.tcp_port = 6000
-        self.selected_variable = None
+        self.metrics_action.toggled.connect(self.plot.set_metrics_overlay)
+
+        # Pannello delle statistiche incrementali, a destra del grafico (Visualizza > Statistiche)
+        self.stats_panel = StatsPanel(self.models, self.ui, view_range=self.plot.view_range)
+        self.ui.addDockWidget(Qt.RightDockWidgetArea, self.stats_panel)
+        self.stats_panel.hide()
+        self.view_menu.addAction(self.stats_panel.toggleViewAction())
+
+        # Durata della gestione di ogni gruppo di blocchi nel thread principale
+        self.ingest_time = REGISTRY.histogram("controller.blocks")
+
+        self.alert_engine = AlertEngine(self.receiver.alert_raised.emit, rate_limit=2.0)
+        self.alert_engine.start()
+
+        # Indici dei campioni crescenti anche dopo un riavvio del server, con un NaN dove mancano campioni
+        self.stream_index = StreamIndex()
+
+        self.spinMin.valueChanged.connect(self.update_alert_rules)
+        self.spinMax.valueChanged.connect(self.update_alert_rules)
+
+        if self.ingest_process:
+            self.start_ingest_process()
+
+        else:
+            from src.network.udpReceiver import UdpReceiver
+
+            # Avvio del thread per ricevere dati UDP: un segnale per blocco di campioni
+            self.udp_receiver = UdpReceiver(self.host, self.udp_port, self.on_udp_blocks,
+                                            variables=self.variables, recv_buffer_size=self.udp_recv_buffer)
+            self.udp_receiver.start()
+
+        # Il ricevitore UDP resta attivo anche con la memoria condivisa: è il ripiego se il server la rifiuta
+        if self.transport != "udp" and is_local_host(self.host):
+            from src.network.sharedRing import SharedRing
+
+            self.shm_ring = SharedRing()
+            self.start_ring_polling()
 
-        # Comunicazione TCP per ottenere la lista di variabili
-        self.tcp_sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
-        self.tcp_sock.connect((self.host, self.tcp_port))
+        if self.control is not None:
+            self.attach_receiver()
+            self.apply_pending_subscriptions()
+
+        self.ui.centralWidget().setEnabled(True)
+        self.ui.menuBar().setEnabled(True)
+
+        STARTUP.mark("ready")
+
+        # Emesso dal ciclo degli eventi: in avvio lento finish_startup gira ancora nel costruttore
+        QTimer.singleShot(0, self.startup_finished.emit)
+
+    def connect_to_server(self):
+        """
+        Avvia un tentativo di connessione su un thread, senza bloccare la UI.
+        Se un tentativo è già in corso e fallisce, il successivo parte subito.
+        """
+        if self.control is not None:
+            return
+
+        if self.connecting:
+            self.retry_now = True
+            return
+
+        self.connecting = True
+        self.ui.statusBar().showMessage(f"Connessione a {self.host}:{self.tcp_port}...")
+
+        threading.Thread(target=self.open_control, daemon=True).start()
+
+    def open_control(self):
+        """
+        Thread di connessione: il risultato torna al thread principale tramite segnale
+        """
+        from src.network.controlClient import ControlClient
+
+        control = ControlClient(self.host, self.tcp_port)
+
+        try:
+            control.connect(timeout=self.connect_timeout)
+
+        except OSError as exc:
+            control.close()
+            self.receiver.connection_failed.emit(str(exc))
+            return
+
+        self.receiver.connected.emit(control)
+
+    def on_connected(self, control):
+        from src.network.protocol import FORMAT_BINARY
+
+        self.connecting = False
+        self.control = control
+        self.reconnect_delay = 0.25
 
         # Ricezione della lista di variabili
         self.receive_variable_list()
 
-        # Configurazione della QListView come una lista con checkbox
-        self.listView.setSelectionMode(QAbstractItemView.NoSelection)
-        self.listView.clicked.connect(self.on_variable_selected)
+        # Richiesta del formato binario; un server che non lo supporta continua a inviare testo
+        self.send_control("request_format", FORMAT_BINARY)
 
-        # Avvio del thread per ricevere dati UDP
-        self.thread = threading.Thread(target=self.listen_udp, daemon=True)
-        self.thread.start()
+        if self.udp_receiver is not None:
+            self.attach_receiver()
+            self.apply_pending_subscriptions()
 
-        # Variabile per tracciare l'ultimo alert
-        self.alert_box = None
+        self.connection_watchdog.start()
 
-        # Imposto le soglie iniziali
-        self.alertMaxActive = False
-        self.alertMinActive = False
-        self.lastAlertTime = None
+        STARTUP.mark("connected")
+        self.ui.statusBar().showMessage(f"Connesso a {self.host}:{self.tcp_port}", 3000)
 
-        self.alert_signal.connect(self.show_alert)      # Funzionalità solo per MacOS
+    def attach_receiver(self):
+        """
+        Comunica al server la porta del ricevitore e ripristina le sottoscrizioni
+        """
+        self.udp_receiver.variables = list(self.variables)
+
+        # Il server numera i frame per connessione: quelli della connessione precedente non fanno testo.
+        # Gli indici dei campioni di un server ripartito da zero vengono riallineati da stream_index
+        self.udp_receiver.reset_sequences()
+
+        # Il server invia i campioni alla porta effettivamente aperta dal ricevitore
+        if not self.send_control("set_udp_port", self.udp_receiver.port):
+            return
+
+        if not self.negotiate_transport():
+            return
+
+        subscribed = [variable for variable in self.variables if variable in self.subscribed]
+
+        if subscribed:
+            self.send_control("subscribe", subscribed)
+
+    def negotiate_transport(self):
+        """
+        Propone al server il ring in memoria condivisa; se lo rifiuta (server
+        remoto o che non conosce il comando) i campioni continuano ad arrivare via UDP.
+        La risposta viene attesa su un thread, così un server che non risponde non
+        blocca la UI. Restituisce False se la connessione è caduta
+        """
+        from src.network.protocol import TRANSPORT_SHM
+
+        if self.shm_ring is None:
+            return True
+
+        if not self.send_control("propose_transport", TRANSPORT_SHM, self.shm_ring.name):
+            return False
+
+        threading.Thread(target=self.await_transport, args=(self.control, TRANSPORT_SHM), daemon=True).start()
+
+        return True
+
+    def await_transport(self, control, transport):
+        """
+        Thread di negoziazione: la risposta del server torna al thread principale tramite segnale
+        """
+        try:
+            accepted = control.transport_accepted(transport)
+
+        except OSError:
+            accepted = False
+
+        self.receiver.transport_negotiated.emit(control, transport, accepted)
+
+    def on_transport_negotiated(self, control, transport, accepted):
+        # Risposta a una connessione ormai chiusa
+        if control is not self.control:
+            return
+
+        # Entrambi i ricevitori restano attivi: cambia solo da dove arrivano i campioni
+        if accepted:
+            self.ui.statusBar().showMessage(f"Connesso a {self.host}:{self.tcp_port}, trasporto in memoria condivisa", 3000)
+
+        else:
+            self.ui.statusBar().showMessage(f"Connesso a {self.host}:{self.tcp_port}, memoria condivisa rifiutata: "
+                                            "trasporto UDP", 3000)
+
+    def apply_pending_subscriptions(self):
+        """
+        Sottoscrive le variabili richieste all'avvio, come se fossero state spuntate nella lista
+        """
+        pending, self.pending_subscriptions = self.pending_subscriptions, []
+
+        for row in range(self.variable_model.rowCount()):
+            item = self.variable_model.item(row)
+
+            if item.text() in pending:
+                item.setCheckState(Qt.Checked)
+                self.on_variable_selected(item.index())
+
+    def on_connection_failed(self, error):
+        self.connecting = False
+
+        if self.retry_now:
+            self.retry_now = False
+            self.connect_to_server()
+            return
+
+        self.ui.statusBar().showMessage(f"Server {self.host}:{self.tcp_port} non raggiungibile ({error}), "
+                                        f"nuovo tentativo tra {self.reconnect_delay:.1f} s")
+
+        QTimer.singleShot(int(self.reconnect_delay * 1000), self.connect_to_server)
+        self.reconnect_delay = min(self.reconnect_delay * 2, self.max_reconnect_delay)
+
+    def send_control(self, command, *args):
+        """
+        Esegue il metodo command del ControlClient; se la connessione è caduta avvia la riconnessione.
+        Restituisce True se il comando è stato inviato.
+        """
+        if self.control is None:
+            return False
+
+        try:
+            getattr(self.control, command)(*args)
+            return True
+
+        except OSError:
+            self.on_connection_lost()
+            return False
+
+    def check_connection(self):
+        if self.control is not None and self.control.closed_by_peer():
+            self.on_connection_lost()
+
+    def on_connection_lost(self):
+        self.connection_watchdog.stop()
 
-        self.x_counter = 0
-        self.update_counter = 0
+        if self.control is not None:
+            self.control.close()
+            self.control = None
+
+        self.ui.statusBar().showMessage(f"Connessione a {self.host}:{self.tcp_port} persa, riconnessione...")
+        self.connect_to_server()
 
     def toggle_alert_max(self, state):
         """
         Attiva o disattiva gli alert per il superamento del massimo
         """
         self.alertMaxActive = (state == 2)
+        self.update_alert_rules()
 
     def toggle_alert_min(self, state):
         """
         Attiva o disattiva gli alert per il superamento del minimo
         """
         self.alertMinActive = (state == 2)
+        self.update_alert_rules()
+
+    def update_alert_rules(self, *args):
+        """
+        Comunica al motore degli alert le soglie attive
+        """
+        from src.alerts.alertEngine import ABOVE, BELOW, AlertRule
+
+        rules = []
+
+        if self.alertMaxActive:
+            rules.append(AlertRule(ABOVE, self.plot.max_threshold, self.alert_hysteresis, self.alert_min_duration, self.alert_debounce))
+
+        if self.alertMinActive:
+            rules.append(AlertRule(BELOW, self.plot.min_threshold, self.alert_hysteresis, self.alert_min_duration, self.alert_debounce))
+
+        self.alert_engine.set_rules(rules)
+
+    def on_auto_threshold_toggled(self, checked):
+        if not checked:
+            self.auto_threshold_timer.stop()
+            return
+
+        k, ok = QInputDialog.getDouble(self.ui, "Soglie automatiche", "k (numero di deviazioni standard):",
+                                       self.auto_threshold_k, 0.1, 10.0, 1)
+
+        if not ok:
+            self.auto_threshold_action.setChecked(False)
+            return
+
+        self.auto_threshold_k = k
+        self.apply_auto_threshold()
+        self.auto_threshold_timer.start()
+
+    def apply_auto_threshold(self):
+        """
+        Porta le soglie a media ± kσ secondo le statistiche mostrate nel pannello.
+        Le spin box aggiornano a loro volta le linee del grafico e le regole degli alert.
+        """
+        name = self.stats_panel.selected_variable()
+
+        if name is None:
+            return
+
+        summary = self.stats_panel.summary(name)
+
+        # L'ambito "Vista" non ha la deviazione standard
+        if summary is None or summary["count"] < 2 or "std" not in summary:
+            return
+
+        self.spinMin.setValue(summary["mean"] - self.auto_threshold_k * summary["std"])
+        self.spinMax.setValue(summary["mean"] + self.auto_threshold_k * summary["std"])
 
     def receive_variable_list(self):
         """
         Riceve la lista delle variabili dal server e la popola nella QListView
         """
-        data = self.tcp_sock.recv(1024).decode().strip()
+        variable_list = self.control.variables
 
-        variable_list = data.split(",")
+        self.variables = variable_list
 
-        self.variable_model = QStandardItemModel()
+        # Dopo una riconnessione le variabili già sottoscritte restano spuntate
+        self.variable_model.clear()
 
         for var in variable_list:
             item = QStandardItem(var)
             item.setCheckable(True)
             item.setEditable(False)
+            item.setCheckState(Qt.Checked if var in self.subscribed else Qt.Unchecked)
             self.variable_model.appendRow(item)
 
-        self.listView.setModel(self.variable_model)
-
     def on_variable_selected(self, index):
         """
-        Quando l'utente seleziona una variabile, invia il nome al server via TCP
+        Quando l'utente seleziona o deseleziona una variabile, aggiorna le sottoscrizioni sul server via TCP
         """
         item = self.variable_model.itemFromIndex(index)
 
         if item.isCheckable():
             checked = item.checkState() == Qt.Checked
-            selected_variable = item.text()
+            variable = item.text()
 
-            if checked:
-                if selected_variable != self.selected_variable:
-                    self.selected_variable = selected_variable
+            if checked and variable not in self.subscribed:
+                from src.model.ModelData import ModelData
 
-                    self.model.clear_data()
+                self.models[variable] = ModelData(retention=self.retention_for(variable))
+                self.plot.add_series(variable, self.models[variable])
 
-                    self.plot.clear_plot()
-                    self.plot.update_plot()
+                self.subscribed.add(variable)
+                self.send_control("subscribe", [variable])
 
-                    self.tcp_sock.sendall(selected_variable.encode())
+            elif not checked and variable in self.subscribed:
+                self.subscribed.discard(variable)
+                self.send_control("unsubscribe", [variable])
 
-            else:
-                if selected_variable == self.selected_variable:
-                    self.selected_variable = None
+                self.plot.remove_series(variable)
+                del self.models[variable]
 
-                    self.model.clear_data()
+    def retention_for(self, variable):
+        from src.model.retention import RetentionPolicy
 
-                    self.plot.clear_plot()
+        return self.retention.get(variable, self.retention.get(None, RetentionPolicy()))
+
+    def set_retention(self, variable, policy):
+        """
+        Imposta la politica di retention di variable (None: default), applicandola subito ai modelli esistenti
+        """
+        self.retention[variable] = policy
 
-                    self.tcp_sock.sendall(b"STOP")
+        for name, model in self.models.items():
+            if name == variable or (variable is None and name not in self.retention):
+                model.set_retention(policy)
 
     def onStopRegBtnClicked(self):
-        if self.selected_variable:
-            self.tcp_sock.sendall(b"STOP_UDP")
-
+        if self.subscribed and self.send_control("stop_stream"):
             print("Flusso UDP fermato, il grafico rimane visibile")
 
-    def listen_udp(self):
-        self.sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
-        self.sock.bind((self.host, self.udp_port))
+    def on_udp_blocks(self, blocks):
+        """
+        Chiamato dal thread di ricezione: inoltra al thread principale, con un solo segnale,
+        i blocchi delle variabili sottoscritte
+        """
+        subscribed = self.subscribed
+
+        named = {self.variables[channel]: block for channel, block in blocks.items()
+                 if channel < len(self.variables) and self.variables[channel] in subscribed}
 
-        self.receiver = DataReceiver()
-        self.receiver.data_received.connect(self.on_data_received)
+        if not named:
+            return
+
+        named = self.stream_index.apply(named)
+
+        with self.recorder_lock:
+            if self.recorder is not None:
+                for variable, (x_data, y_data, timestamps) in named.items():
+                    self.recorder.append(variable, x_data, y_data, timestamps)
+
+        self.alert_engine.submit(named)
+        self.receiver.blocks_received.emit(named)
+
+    def start_ingest_process(self):
+        """
+        Avvia la ricezione UDP in un processo separato e il timer che ne legge il ring condiviso
+        """
+        from src.network.ingestProcess import IngestProcess
+
+        self.udp_receiver = IngestProcess(self.host, self.udp_port, variables=self.variables,
+                                          recv_buffer_size=self.udp_recv_buffer)
+        self.udp_receiver.start()
+
+        self.start_ring_polling()
+
+    def start_ring_polling(self):
+        """
+        Avvia il timer che svuota i ring condivisi (processo di ingestione e trasporto shm)
+        """
+        if self.ingest_timer is not None:
+            return
+
+        from src.metrics.registry import REGISTRY
+
+        # Campioni scartati dai produttori perché il ring era pieno
+        self.registry = REGISTRY
+        self.ring_overflow = REGISTRY.counter("ingest.ring_overflow")
+
+        self.ingest_timer = QTimer(self)
+        self.ingest_timer.setInterval(5)
+        self.ingest_timer.timeout.connect(self.poll_rings)
+        self.ingest_timer.start()
+
+        QApplication.instance().aboutToQuit.connect(self.stop_rings)
+
+    def rings(self):
+        rings = [self.shm_ring]
+
+        if self.ingest_process and self.udp_receiver is not None:
+            rings.append(self.udp_receiver.ring)
+
+        return [ring for ring in rings if ring is not None]
+
+    def poll_rings(self):
+        rings = self.rings()
+
+        for ring in rings:
+            self.poll_ring(ring)
+
+        # Il contatore nel ring è scritto dal produttore: qui se ne riporta l'incremento
+        self.ring_overflow.add(sum(ring.overflow for ring in rings) - self.ring_overflow.value)
+
+        # Le metriche del ricevitore nel processo di ingestione arrivano dalla pipe
+        if self.ingest_process and self.udp_receiver is not None:
+            self.udp_receiver.update_metrics(self.registry)
+
+    def poll_ring(self, ring):
+        """
+        Svuota un ring condiviso nel thread principale. I blocchi sono viste sulla
+        memoria condivisa: registrazione e ModelData li copiano subito, al motore
+        degli alert, che li elabora più tardi, ne arriva una copia. I campioni
+        persi (blocchi scartati a ring pieno, memoria condivisa senza riordino)
+        vengono segnati con un NaN da stream_index
+        """
+        blocks = ring.read()
+
+        try:
+            subscribed = self.subscribed
+
+            named = {self.variables[channel]: block for channel, block in blocks.items()
+                     if channel < len(self.variables) and self.variables[channel] in subscribed}
+
+            if not named:
+                return
+
+            named = self.stream_index.apply(named)
+
+            with self.recorder_lock:
+                if self.recorder is not None:
+                    for variable, (x_data, y_data, timestamps) in named.items():
+                        self.recorder.append(variable, x_data, y_data, timestamps)
+
+            if self.alert_engine.rules:
+                self.alert_engine.submit({variable: tuple(column.copy() for column in block)
+                                          for variable, block in named.items()})
+
+            self.on_blocks_received(named)
+
+        finally:
+            ring.release()
+
+    def stop_rings(self):
+        if self.ingest_timer is not None:
+            self.ingest_timer.stop()
+            self.ingest_timer = None
 
-        while True:
-            if not self.selected_variable:
+        if self.ingest_process and self.udp_receiver is not None:
+            self.udp_receiver.stop()
+            self.udp_receiver = None
+
+        if self.shm_ring is not None:
+            self.shm_ring.close()
+            self.shm_ring = None
+
+    def on_blocks_received(self, blocks):
+        """
+        Gestisce i blocchi di campioni ricevuti e aggiorna il grafico
+        """
+        start = time.perf_counter()
+
+        for variable, (x_data, y_data, timestamps) in blocks.items():
+            model = self.models.get(variable)
+
+            # Variabile deselezionata mentre il blocco era in coda
+            if model is None:
                 continue
 
-            data, _ = self.sock.recvfrom(1024)
+            model.add_block(x_data, y_data, timestamps)
+
+        self.ingest_time.record(time.perf_counter() - start)
+
+        self.plot.request_update()
+
+        if not self.first_data:
+            self.first_data = True
+            STARTUP.mark("first_data")
+            self.plot.scheduler.call_after_frame(self.on_first_frame)
+
+    def on_first_frame(self):
+        """
+        Primo frame disegnato con dati ricevuti: registra e comunica i tempi di avvio
+        """
+        from src.metrics.registry import REGISTRY
+
+        STARTUP.mark("first_frame")
+        STARTUP.record(REGISTRY)
+
+        report = STARTUP.report()
+
+        self.ui.statusBar().showMessage("Avvio: " + ", ".join(f"{name} {ms:.0f} ms" for name, ms in report.items()), 10000)
+        self.first_frame_rendered.emit(report)
+
+    def on_start_recording(self):
+        directory = QFileDialog.getExistingDirectory(self.ui, "Directory della registrazione")
 
-            try:
-                message = data.decode().strip()
+        if directory:
+            self.start_recording(directory)
 
-                parts = message.split(":")
+    def start_recording(self, directory):
+        """
+        Inizia a registrare i blocchi ricevuti nella directory indicata
+        """
+        from src.recording.recorder import SessionRecorder
+
+        recorder = SessionRecorder(directory)
+
+        with self.recorder_lock:
+            previous, self.recorder = self.recorder, recorder
 
-                if len(parts) == 2:
-                    var_name, value_str = parts
-                    value = float(value_str)
+        if previous is not None:
+            previous.close()
 
-                    self.receiver.data_received.emit(value)
+        self.ui.statusBar().showMessage(f"Registrazione in corso: {directory}")
 
-                    self.x_counter += 1
+    def stop_recording(self):
+        """
+        Chiude la registrazione corrente
+        """
+        with self.recorder_lock:
+            recorder, self.recorder = self.recorder, None
 
-                else:
-                    raise ValueError("Formato messaggio non valido")
+        if recorder is not None:
+            recorder.close()
+            self.ui.statusBar().showMessage("Registrazione terminata")
 
-            except ValueError:
-                print(f"Errore nella conversione del valore: {data}")
+    def on_export(self):
+        path, _ = QFileDialog.getSaveFileName(self.ui, "Esporta dati", "",
+                                              "Colonnare (*.pgc);;NumPy (*.npz);;CSV (*.csv)")
 
-    def on_data_received(self, value):
+        if path:
+            self.start_export(path)
+
+    def start_export(self, path):
         """
-        Gestisce il dato ricevuto e aggiorna il grafico
+        Esporta i dati attuali di tutte le serie in path (formato dato dall'estensione).
+        Lo snapshot è fatto di viste, la scrittura avviene su un thread separato.
         """
-        self.model.add_data(self.x_counter, value)
-        self.x_counter += 1
+        from src.recording.exporter import ExportWorker, snapshot
+
+        if self.exporter is not None:
+            self.show_alert("Esportazione già in corso")
+            return
 
-        if self.alertMaxActive and value > self.plot.max_threshold:
-            self.show_alert(f"Valore sopra soglia: {value:.2f} > {self.plot.max_threshold:.2f}")
+        try:
+            self.exporter = ExportWorker(snapshot(self.models), path, on_progress=self.receiver.export_progress.emit,
+                                         on_finished=self.receiver.export_finished.emit)
+
+        except ValueError as exc:
+            self.show_alert(str(exc))
+            return
+
+        self.exporter.start()
+
+    def cancel_export(self):
+        if self.exporter is not None:
+            self.exporter.stop()
+
+    def on_export_progress(self, fraction):
+        self.ui.statusBar().showMessage(f"Esportazione: {fraction:.0%}")
+
+    def on_export_finished(self, path, error):
+        self.exporter = None
+
+        if error is None:
+            self.ui.statusBar().showMessage(f"Esportazione completata: {path}")
+
+        else:
+            self.ui.statusBar().showMessage(f"Esportazione non riuscita: {error}")
 
-        if self.alertMinActive and value < self.plot.min_threshold:
-            self.show_alert(f"Valore sotto soglia: {value:.2f} < {self.plot.min_threshold:.2f}")
+    def on_open_recording(self):
+        directory = QFileDialog.getExistingDirectory(self.ui, "Apri registrazione")
+
+        if directory:
+            self.open_recording(directory)
+
+    def open_recording(self, directory):
+        """
+        Mappa una sessione registrata e ne aggiunge le variabili al grafico
+        """
+        from src.recording.recorder import load_session
+
+        label = os.path.basename(os.path.normpath(directory))
+
+        for variable, model in load_session(directory).items():
+            name = f"{variable} [{label}]"
+
+            self.plot.remove_series(name)
+            self.models[name] = model
+            self.plot.add_series(name, model)
+
+        self.plot.request_update()
+
+    def on_start_replay(self):
+        directory = QFileDialog.getExistingDirectory(self.ui, "Riproduci registrazione")
+
+        if not directory:
+            return
+
+        speeds = ["1×", "2×", "10×", "100×", "max"]
+        speed, ok = QInputDialog.getItem(self.ui, "Riproduci registrazione", "Velocità:", speeds, 0, False)
+
+        if ok:
+            self.start_replay(directory, None if speed == "max" else float(speed.rstrip("×")))
+
+    def start_replay(self, directory, speed=1.0):
+        """
+        Riproduce una sessione registrata a velocità speed (None = il più veloce possibile).
+        I blocchi seguono lo stesso percorso di quelli ricevuti via UDP.
+        """
+        from src.model.ModelData import ModelData
+        from src.recording.replay import ReplaySource, ReplayPlayer
+
+        self.stop_replay()
+
+        label = os.path.basename(os.path.normpath(directory))
+        source = ReplaySource(directory, speed=speed)
+
+        self.replay_variables = {variable: f"{variable} [{label}]" for variable in source.variables}
+
+        for variable, name in self.replay_variables.items():
+            self.plot.remove_series(name)
+            self.models[name] = ModelData(retention=self.retention_for(variable))
+            self.plot.add_series(name, self.models[name])
+
+        self.replay = ReplayPlayer(source, self.on_replay_blocks, on_seek=self.receiver.replay_seeked.emit)
+        self.replay.start()
+
+    def on_seek_replay(self):
+        if self.replay is None:
+            return
+
+        source = self.replay.source
+        position, ok = QInputDialog.getDouble(self.ui, "Vai a", f"Secondi (0 - {source.duration:.1f}):",
+                                              source.position, 0.0, source.duration, 1)
+
+        if ok:
+            source.seek(position)
+
+    def stop_replay(self):
+        if self.replay is not None:
+            self.replay.stop()
+            self.replay = None
+
+    def on_replay_blocks(self, blocks):
+        """
+        Chiamato dal thread di riproduzione: rinomina le variabili come le serie del grafico
+        """
+        named = {self.replay_variables[variable]: block for variable, block in blocks.items()}
+
+        self.alert_engine.submit(named)
+        self.receiver.blocks_received.emit(named)
+
+    def on_replay_seeked(self, position):
+        """
+        Dopo uno spostamento gli indici ripartono da un altro punto: si svuotano le serie riprodotte
+        """
+        for name in self.replay_variables.values():
+            if name in self.models:
+                self.models[name].clear_data()
+                self.plot.series[name].clear()
 
-        self.update_counter += 1
+        self.plot.request_update()
 
-        if self.update_counter % 2 == 0:
-            self.plot.update_plot()
+    def on_alert_raised(self, event):
+        self.show_alert(event.message())
 
     def show_alert(self, message):
         """
@@ -0,0 +1,106 @@
+"""
+===============================================================================
+ Project:      Python Graph Plotter
+ File:         metricsOverlay.py
+ Author:       Matteo Franchini
+ Created:      17/10/2026
+ License:      MIT License (c) 2025 Matteo Franchini
+ Repository:   https://github.com/MatteoFranchini01/python_graph_plotter
+===============================================================================
+ MIT License
+
+ Copyright (c) 2025 Matteo Franchini
+
+ Permission is hereby granted, free of charge, to any person obtaining a copy
+ of this software and associated documentation files (the "Software"), to deal
+ in the Software without restriction, including without limitation the rights
+ to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+ copies of the Software, and to permit persons to whom the Software is
+ furnished to do so, subject to the following conditions:
+
+ The above copyright notice and this permission notice shall be included in
+ all copies or substantial portions of the Software.
+
+ THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+ IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+ FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+ AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+ LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING
+ FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS
+ IN THE SOFTWARE.
+===============================================================================
+"""
+
+import time
+
+from PySide6.QtCore import QTimer
+from PySide6.QtWidgets import QLabel
+
+# Contatori mostrati come frequenza (valori al secondo) e istogrammi mostrati con i percentili
+RATES = (("receiver.datagrams", "pacchetti/s"), ("receiver.samples", "campioni/s"), ("plot.frames", "frame/s"))
+TOTALS = (("receiver.lost_datagrams", "persi"), ("receiver.overrun", "di cui overrun del client"),
+          ("receiver.reordered_datagrams", "riordinati"), ("receiver.parse_errors", "errori di parsing"))
+LATENCIES = (("receiver.parse", "parse"), ("controller.blocks", "ingestione"), ("plot.update_plot", "update_plot"))
+
+
+class MetricsOverlay(QLabel):
+    """
+    Riquadro semitrasparente nell'angolo del grafico con le metriche principali.
+
+    Legge il registro una volta ogni interval millisecondi, quindi il costo
+    non dipende dalla frequenza dei dati; le frequenze sono calcolate dalla
+    differenza dei contatori tra due letture.
+    """
+
+    def __init__(self, parent, registry, interval=1000):
+        super().__init__(parent)
+
+        self.registry = registry
+        self.previous = None
+
+        self.setStyleSheet("background-color: rgba(0, 0, 0, 160); color: white; padding: 4px; font-family: monospace;")
+        self.move(60, 10)
+
+        self.timer = QTimer(self)
+        self.timer.setInterval(interval)
+        self.timer.timeout.connect(self.refresh)
+
+    def set_active(self, active):
+        if active:
+            self.previous = None
+            self.refresh()
+            self.timer.start()
+
+        else:
+            self.timer.stop()
+
+        self.setVisible(active)
+
+    def refresh(self):
+        snapshot = self.registry.snapshot()
+        counters = snapshot["counters"]
+        histograms = snapshot["histograms"]
+        now = time.perf_counter()
+
+        lines = []
+
+        if self.previous is not None:
+            elapsed = now - self.previous[0]
+
+            for name, label in RATES:
+                rate = (counters.get(name, 0) - self.previous[1].get(name, 0)) / elapsed
+                lines.append(f"{label}: {rate:,.0f}")
+
+        for name, label in TOTALS:
+            lines.append(f"{label}: {counters.get(name, 0):,}")
+
+        for name, label in LATENCIES:
+            summary = histograms.get(name)
+
+            if summary is not None and summary["count"]:
+                lines.append(f"{label}: p50 {summary['p50_ms']:.2f} ms, p99 {summary['p99_ms']:.2f} ms")
+
+        self.previous = (now, counters)
+
+        self.setText("\n".join(lines))
+        self.adjustSize()
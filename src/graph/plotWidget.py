@@ -31,40 +31,431 @@
 ===============================================================================
 """
 
+import time
+
 import numpy as np
 import pyqtgraph as pg
 from PySide6.QtWidgets import QGraphicsView, QGraphicsScene
-from PySide6.QtCore import Signal, QObject, QThread, QTimer
+from PySide6.QtCore import Signal, QObject, Qt
+
+from src.graph.metricsOverlay import MetricsOverlay
+from src.graph.renderScheduler import RenderScheduler
+from src.metrics.registry import REGISTRY
 
-class PlotUpdateThread(QThread):
+# Classi di soglia dei punti; GAP marca i NaN che interrompono la curva e non viene disegnata
+GAP = -1
+BELOW_MIN = 0
+NORMAL = 1
+ABOVE_MAX = 2
+
+def classify(y_data, min_threshold, max_threshold):
     """
-    Thread per aggiornare il grafico senza bloccare la UI
+    Restituisce per ogni valore la classe di soglia (BELOW_MIN, NORMAL, ABOVE_MAX o GAP)
     """
-    update_signal = Signal()
+    classes = (y_data > max_threshold).view(np.int8) - (y_data < min_threshold).view(np.int8) + NORMAL
 
-    def __init__(self, interval=50):
-        super().__init__()
+    gaps = np.isnan(y_data)
+
+    if gaps.any():
+        classes[gaps] = GAP
+
+    return classes
+
+def nearest_index(x_data, y_data, x, y, x_tolerance, y_tolerance, max_candidates=64):
+    """
+    Indice del punto più vicino a (x, y) entro le tolleranze, o None.
+
+    x_data deve essere crescente: una ricerca binaria trova i punti entro
+    x_tolerance e solo quelli (al più max_candidates attorno a x) vengono
+    confrontati anche in Y, quindi il costo è O(log n) qualunque sia la storia.
+    La distanza è normalizzata sulle tolleranze, cioè misurata in pixel.
+    """
+    begin = int(np.searchsorted(x_data, x - x_tolerance, side="left"))
+    end = int(np.searchsorted(x_data, x + x_tolerance, side="right"))
+
+    if end - begin > max_candidates:
+        center = int(np.searchsorted(x_data, x))
+        begin = max(begin, center - max_candidates // 2)
+        end = min(end, begin + max_candidates)
+
+    if begin >= end:
+        return None
+
+    dx = (x_data[begin:end] - x) / x_tolerance
+    dy = (y_data[begin:end] - y) / y_tolerance
+    distance = dx * dx + dy * dy
+
+    # I NaN dei campioni mancanti non sono mai il punto più vicino
+    distance[np.isnan(distance)] = np.inf
+
+    index = int(np.argmin(distance))
+
+    if distance[index] > 1.0:
+        return None
+
+    return begin + index
+
+class ClassScatter:
+    """
+    Scatter composto da un ScatterPlotItem per classe di soglia.
+
+    Ogni item usa un solo pennello condiviso, quindi non esistono QBrush per
+    singolo punto e ricolorare significa solo ridistribuire i punti tra gli item.
+    """
+
+    def __init__(self, plot_widget, brushes, hoverable=False):
+        self.plot_widget = plot_widget
+
+        # L'hit test di pyqtgraph controlla ogni punto: si abilita solo se richiesto
+        self.items = [pg.ScatterPlotItem(size=7, pen=pg.mkPen(None), brush=brush, hoverable=hoverable)
+                      for brush in brushes]
+
+        for item in self.items:
+            self.plot_widget.addItem(item)
+
+    def connect(self, slot):
+        """
+        Collega gli eventi hover e click di tutti gli item allo slot
+        """
+        for item in self.items:
+            item.sigHovered.connect(slot)
+            item.sigClicked.connect(slot)
+
+    def add_points(self, x_data, y_data, classes):
+        """
+        Aggiunge i punti agli item della rispettiva classe
+        """
+        for cls, item in enumerate(self.items):
+            mask = classes == cls
+
+            if mask.any():
+                item.addPoints(x=x_data[mask], y=y_data[mask])
+
+    def set_points(self, x_data, y_data, classes):
+        """
+        Sostituisce tutti i punti
+        """
+        for cls, item in enumerate(self.items):
+            mask = classes == cls
+            item.setData(x=x_data[mask], y=y_data[mask])
+
+    def clear(self):
+        for item in self.items:
+            item.clear()
+
+    def setVisible(self, visible):
+        for item in self.items:
+            item.setVisible(visible)
+
+    def remove(self):
+        for item in self.items:
+            self.plot_widget.removeItem(item)
+
+class PlotChunk:
+    """
+    Porzione di curva e scatter che copre al massimo chunk_size campioni consecutivi.
+
+    Solo l'ultimo chunk riceve nuovi punti: quelli completi non vengono più
+    toccati, quindi il costo di un frame dipende dai campioni nuovi e non
+    dalla lunghezza della storia. Esistono solo i chunk inquadrati dalla vista.
+    """
+
+    def __init__(self, plot_widget, start, pen, brushes, hoverable=False):
+        self.plot_widget = plot_widget
+        self.start = start      # Indice assoluto del primo campione del chunk
+        self.count = 0
+
+        # connect="finite" interrompe la curva sui NaN dei campioni mancanti
+        self.curve = pg.PlotCurveItem(pen=pen, connect="finite")
+        self.plot_widget.addItem(self.curve)
+
+        # Senza pennelli il chunk disegna solo la curva
+        self.scatter = ClassScatter(plot_widget, brushes, hoverable) if brushes else None
+
+    @property
+    def end(self):
+        return self.start + self.count
+
+    def remove(self):
+        """
+        Rimuove gli elementi grafici del chunk dal grafico
+        """
+        self.plot_widget.removeItem(self.curve)
+
+        if self.scatter is not None:
+            self.scatter.remove()
+
+class PlotSeries:
+    """
+    Elementi grafici di una variabile: chunk a piena risoluzione e vista decimata.
+
+    Ogni serie legge dal proprio ModelData e tiene traccia di ciò che ha già
+    disegnato, così più variabili condividono lo stesso grafico senza
+    ridisegnarsi a vicenda.
+    """
+
+    def __init__(self, plot_widget, model, color, chunk_size, show_points, on_hover):
+        self.plot_widget = plot_widget
+        self.model = model
+        self.pen = pg.mkPen(color)
+        self.chunk_size = chunk_size
+        self.on_hover = on_hover
+
+        # Pennelli condivisi per classe di soglia: sotto il minimo, normale, sopra il massimo
+        self.class_brushes = (pg.mkBrush("r"), pg.mkBrush(color), pg.mkBrush("r"))
+
+        # Linea e scatter a piena risoluzione, suddivisi in chunk indicizzati per numero
+        self.chunks = {}
+        self.rendered_count = 0         # Campioni del modello già considerati
+        self.last_frame = None          # Ultimo stato disegnato (campioni, vista, punti massimi)
+
+        # Linea e scatter decimati usati quando la vista contiene troppi campioni
+        self.lod_curve = pg.PlotCurveItem(pen=self.pen, connect="finite")
+        self.plot_widget.addItem(self.lod_curve)
+        self.lod_data = None            # Punti decimati mostrati, per la ricerca del punto più vicino
+
+        # Panoramica tratteggiata dei campioni già scartati dalla retention del modello
+        self.archive_curve = pg.PlotCurveItem(pen=pg.mkPen(color, style=Qt.DashLine), connect="finite")
+        self.archive_curve.setVisible(False)
+        self.plot_widget.addItem(self.archive_curve)
+
+        self.lod_scatter = None
+        self.set_show_points(show_points)
+
+    def set_show_points(self, show_points):
+        """
+        Abilita o disabilita lo scatter dei punti (la curva resta sempre visibile)
+        """
+        if show_points == (self.lod_scatter is not None):
+            return
+
+        self.clear()
+
+        if show_points:
+            self.lod_scatter = ClassScatter(self.plot_widget, self.class_brushes, self.on_hover is not None)
+
+            if self.on_hover is not None:
+                self.lod_scatter.connect(self.on_hover)
+
+        else:
+            self.lod_scatter.remove()
+            self.lod_scatter = None
+
+    def update(self, x_min, x_max, max_points, thresholds):
+        """
+        Disegna la porzione di dati della serie compresa tra x_min e x_max
+        """
+        # Viste senza copia sui buffer del modello
+        x_data, y_data = self.model.get_data()
+
+        total = self.model.total_count
+
+        # Il modello è stato svuotato senza passare da clear()
+        if total < self.rendered_count:
+            self.clear()
+
+        self.rendered_count = total
+
+        frame = (total, x_min, x_max, max_points)
+
+        if len(y_data) == 0 or frame == self.last_frame:
+            return
+
+        self.last_frame = frame
+
+        self.render_archive(x_min, x_max, max_points)
+
+        begin, end = self.model.index_range(x_min, x_max)
+
+        # Un punto in più per lato, così la curva esce dai bordi della vista
+        begin = max(begin - 1, 0)
+        end = min(end + 1, len(y_data))
+
+        if end - begin > max_points:
+            self.render_decimated(begin, end, max_points, thresholds)
+
+        else:
+            self.render_raw(begin, end, thresholds)
+
+    def render_raw(self, begin, end, thresholds):
+        """
+        Mostra a piena risoluzione gli indici locali [begin, end) tramite i chunk.
+        I chunk fuori dalla vista vengono rilasciati, quello in coda riceve solo i punti nuovi.
+        """
+        if self.lod_curve.isVisible():
+            self.clear_decimated()
+
+        if begin >= end:
+            self.remove_chunks()
+            return
+
+        first = self.model.first_index
+        total = self.model.total_count
+
+        first_key = (first + begin) // self.chunk_size
+        last_key = (first + end - 1) // self.chunk_size
+
+        for key in [key for key in self.chunks if key < first_key or key > last_key]:
+            self.chunks.pop(key).remove()
+
+        for key in range(first_key, last_key + 1):
+            start = max(key * self.chunk_size, first)
+            stop = min((key + 1) * self.chunk_size, total)
+
+            chunk = self.chunks.get(key)
+
+            if chunk is None:
+                chunk = self.new_chunk(key, start)
+
+            if chunk.end < stop:
+                self.append_points(chunk, chunk.end - first, stop - first, thresholds)
+
+    def render_decimated(self, begin, end, max_points, thresholds):
+        """
+        Mostra gli indici locali [begin, end) decimati con la piramide min/max
+        """
+        self.remove_chunks()
+
+        x, y = self.model.get_decimated(begin, end, max_points)
+
+        self.lod_data = (x, y)
+        self.lod_curve.setData(x, y)
+        self.lod_curve.setVisible(True)
+
+        if self.lod_scatter is not None:
+            self.lod_scatter.set_points(x, y, classify(y, *thresholds))
+            self.lod_scatter.setVisible(True)
+
+    def render_archive(self, x_min, x_max, max_points):
+        """
+        Mostra la parte della vista che precede la finestra del modello con i punti dell'archivio
+        """
+        x, y = self.model.get_archive(x_min, x_max, max_points)
+
+        if len(x):
+            self.archive_curve.setData(x, y)
+            self.archive_curve.setVisible(True)
+
+        elif self.archive_curve.isVisible():
+            self.clear_archive()
+
+    def clear_archive(self):
+        self.archive_curve.setData([], [])
+        self.archive_curve.setVisible(False)
+
+    def append_points(self, chunk, begin, end, thresholds):
+        """
+        Aggiunge al chunk i campioni [begin, end) (indici locali del modello)
+        """
+        x_data, y_data = self.model.get_data()
 
-        self.interval = interval
+        if chunk.scatter is not None:
+            new_y = y_data[begin:end]
+            chunk.scatter.add_points(x_data[begin:end], new_y, classify(new_y, *thresholds))
 
-        self.running = True
+        # La curva include l'ultimo punto del chunk precedente per restare continua
+        curve_begin = max(chunk.start - self.model.first_index - 1, 0)
+        chunk.curve.setData(x_data[curve_begin:end], y_data[curve_begin:end])
 
-    def run(self):
+        chunk.count += end - begin
+
+    def new_chunk(self, key, start):
         """
-        Esegue l'aggiornamento periodico del grafico
+        Crea il chunk key a partire dall'indice assoluto start
         """
-        while self.running:
-            self.update_signal.emit()
-            self.msleep(self.interval)
+        brushes = self.class_brushes if self.lod_scatter is not None else None
+
+        chunk = PlotChunk(self.plot_widget, start, self.pen, brushes, self.on_hover is not None)
+
+        # Connetto gli eventi hover e click ai metodi
+        if chunk.scatter is not None and self.on_hover is not None:
+            chunk.scatter.connect(self.on_hover)
 
-    def stop(self):
+        self.chunks[key] = chunk
+
+        return chunk
+
+    def remove_chunks(self):
         """
-        Ferma il thread in modo sicuro
+        Rimuove tutti i chunk dal grafico
         """
-        self.running = False
+        for chunk in self.chunks.values():
+            chunk.remove()
+
+        self.chunks = {}
+
+    def clear_decimated(self):
+        """
+        Svuota e nasconde la vista decimata
+        """
+        self.lod_curve.setData([], [])
+        self.lod_curve.setVisible(False)
+        self.lod_data = None
+
+        if self.lod_scatter is not None:
+            self.lod_scatter.clear()
+            self.lod_scatter.setVisible(False)
+
+    def nearest_point(self, x, y, x_tolerance, y_tolerance):
+        """
+        Punto disegnato più vicino a (x, y): tra quelli decimati se la vista è
+        decimata, altrimenti tra i campioni del modello. Restituisce (x, y) o None.
+        """
+        x_data, y_data = self.lod_data if self.lod_data is not None else self.model.get_data()
+
+        index = nearest_index(x_data, y_data, x, y, x_tolerance, y_tolerance)
 
-        self.quit()
-        self.wait()
+        if index is None:
+            return None
+
+        return float(x_data[index]), float(y_data[index])
+
+    def recolor(self, thresholds):
+        """
+        Ridistribuisce i punti disegnati tra le classi di soglia con un solo passaggio NumPy
+        """
+        self.last_frame = None
+
+        if not self.chunks or self.lod_scatter is None:
+            return
+
+        x_data, y_data = self.model.get_data()
+        first = self.model.first_index
+
+        begin = max(min(chunk.start for chunk in self.chunks.values()) - first, 0)
+        end = max(chunk.end for chunk in self.chunks.values()) - first
+
+        classes = classify(y_data[begin:end], *thresholds)
+
+        for chunk in self.chunks.values():
+            lo = max(chunk.start - first, 0)
+            hi = chunk.end - first
+
+            chunk.scatter.set_points(x_data[lo:hi], y_data[lo:hi], classes[lo - begin:hi - begin])
+
+    def clear(self):
+        """
+        Rimuove tutti i punti disegnati; il prossimo update() riparte da zero
+        """
+        self.remove_chunks()
+        self.clear_decimated()
+        self.clear_archive()
+        self.rendered_count = 0
+        self.last_frame = None
+
+    def remove(self):
+        """
+        Rimuove la serie dal grafico
+        """
+        self.clear()
+        self.plot_widget.removeItem(self.lod_curve)
+        self.plot_widget.removeItem(self.archive_curve)
+
+        if self.lod_scatter is not None:
+            self.lod_scatter.remove()
+
+# Colori delle serie, nell'ordine in cui vengono aggiunte
+SERIES_COLORS = ("y", "c", "m", "g", "w", "b")
 
 class LivePlotWidget(QObject):
     toggle_min = Signal(bool)
@@ -72,15 +463,21 @@ class LivePlotWidget(QObject):
     update_min_value = Signal(float)
     update_max_value = Signal(float)
 
-    def __init__(self, graphics_view: QGraphicsView, model, max_visible_points=100):
+    def __init__(self, graphics_view: QGraphicsView, model=None, max_visible_points=100, chunk_size=1024,
+                 points_per_pixel=4, max_scatter_series=8, hover_radius=8, scatter_hover=False):
         """
         Inizializza il grafico e lo integra nella QGraphicsView.
+        Se viene passato un model, il grafico parte con una sola serie.
         """
         super().__init__()
 
-        self.model = model
         self.graphics_view = graphics_view
         self.max_visible_points = max_visible_points  # Numero massimo di punti visibili nella finestra
+        self.chunk_size = chunk_size  # Campioni per chunk di curva/scatter
+        self.points_per_pixel = points_per_pixel  # Punti per pixel oltre i quali si decima
+        self.max_scatter_series = max_scatter_series  # Oltre questo numero di serie si disegnano solo le curve
+        self.hover_radius = hover_radius  # Distanza massima in pixel tra il mouse e il punto evidenziato
+        self.scatter_hover = scatter_hover  # Usa anche l'hit test dei ScatterPlotItem (lento con molti punti)
 
         self.scene = QGraphicsScene()
         self.graphics_view.setScene(self.scene)
@@ -89,20 +486,19 @@ class LivePlotWidget(QObject):
         self.plot_widget = pg.PlotWidget()
         self.scene.addWidget(self.plot_widget)
 
-        # Linea del grafico
-        self.curve = self.plot_widget.plot([], [], pen="y")
-
         # Configuriamo interazioni
         self.plot_widget.setMouseEnabled(x=True, y=True)  # Zoom e pan liberi
         self.plot_widget.setLimits(xMin=0)  # Evita di andare a sinistra di 0
 
-        # Scatter plot per i punti con colore variabile
-        self.scatter = pg.ScatterPlotItem(size=7, pen=pg.mkPen(None))
-        self.plot_widget.addItem(self.scatter)
+        # Serie disegnate, indicizzate per nome della variabile
+        self.series = {}
+        self.color_index = 0
 
-        # Connetto gli eventi hover e click ai metodi
-        self.scatter.sigHovered.connect(self.show_tooltip)
-        self.scatter.sigClicked.connect(self.show_tooltip)
+        # La vista segue gli ultimi campioni finché l'utente non fa zoom o pan
+        self.follow = True
+        self.view_box = self.plot_widget.getViewBox()
+        self.view_box.sigRangeChangedManually.connect(self.on_range_changed_manually)
+        self.plot_widget.getPlotItem().autoBtn.clicked.connect(self.follow_latest)
 
         # Linee orizzontali interattive
         self.min_line = pg.InfiniteLine(angle=0, movable=True, pen="r", label="Min", labelOpts={"position": 0.1})
@@ -123,44 +519,214 @@ class LivePlotWidget(QObject):
         self.min_threshold = -1000
         self.max_threshold = 1000
 
-        # Thread per l'aggiornamento del grafico
-        self.update_thread = PlotUpdateThread(interval=50)
-        self.update_thread.update_signal.connect(self.update_plot)
-        self.update_thread.start()
+        # Frame disegnati solo su richiesta, al più uno per refresh dello schermo
+        self.scheduler = RenderScheduler(self.update_plot, REGISTRY, parent=self)
+
+        # Zoom, pan e ridimensionamenti cambiano i campioni da disegnare
+        self.view_box.sigRangeChanged.connect(self.request_update)
+        self.view_box.sigResized.connect(self.request_update)
 
         # Creo un testo per il valore dei punti
         self.value_label = pg.TextItem("", anchor=(0.5, 1.5), color="w")
         self.plot_widget.addItem(self.value_label)
         self.value_label.setVisible(False)
 
-    def update_plot(self):
+        # Hover e click cercano il punto più vicino con una ricerca binaria sulle X
+        self.plot_widget.scene().sigMouseMoved.connect(self.on_mouse_moved)
+        self.plot_widget.scene().sigMouseClicked.connect(self.on_mouse_clicked)
+
+        # Durata di update_plot e riquadro opzionale con le metriche del processo
+        self.frame_time = REGISTRY.histogram("plot.update_plot")
+        self.metrics_overlay = None
+
+        if model is not None:
+            self.add_series("default", model)
+
+    def add_series(self, name, model, color=None):
         """
-        Aggiunge un nuovo valore e aggiorna il grafico senza perdere i dati.
+        Aggiunge una serie che disegna i dati di model
         """
-        x_data, y_data = self.model.get_data()
+        if name in self.series:
+            return self.series[name]
 
-        if not x_data or not y_data:
-            return
+        if color is None:
+            color = SERIES_COLORS[self.color_index % len(SERIES_COLORS)]
+            self.color_index += 1
+
+        show_points = len(self.series) < self.max_scatter_series
+
+        on_hover = self.show_tooltip if self.scatter_hover else None
+
+        self.series[name] = PlotSeries(self.plot_widget, model, color, self.chunk_size, show_points, on_hover)
+
+        self.update_points_visibility()
+        self.request_update()
+
+        return self.series[name]
+
+    def remove_series(self, name):
+        """
+        Rimuove la serie name dal grafico
+        """
+        series = self.series.pop(name, None)
+
+        if series is not None:
+            series.remove()
+            self.update_points_visibility()
+            self.request_update()
+
+    def update_points_visibility(self):
+        """
+        Con molte serie lo scatter costa più di quanto aiuti: si disegnano solo le curve
+        """
+        show_points = len(self.series) <= self.max_scatter_series
 
-        y_data = np.array(y_data)
-        x_data = np.array(x_data)
+        for series in self.series.values():
+            series.set_show_points(show_points)
 
-        self.curve.setData(x_data, y_data)
+    @property
+    def thresholds(self):
+        return self.min_threshold, self.max_threshold
 
-        colors = np.full(len(y_data), pg.mkBrush("y"), dtype=object)  # Default: Giallo
-        colors[y_data < self.min_threshold] = pg.mkBrush("r")  # Sotto soglia
-        colors[y_data > self.max_threshold] = pg.mkBrush("r")  # Sopra soglia
+    def request_update(self, *args):
+        """
+        Chiede un nuovo frame: più richieste nello stesso refresh producono un solo frame
+        """
+        self.scheduler.request()
+
+    def update_plot(self):
+        """
+        Disegna la porzione di dati inquadrata dalla vista per ogni serie.
+
+        Se i campioni nell'intervallo X visibile sono pochi vengono disegnati
+        i chunk a piena risoluzione, aggiornati in modo incrementale; altrimenti
+        si usa la piramide min/max del modello, con circa points_per_pixel
+        punti per pixel orizzontale. Il costo dipende quindi dalla larghezza
+        del widget e non dalla lunghezza della storia.
+        """
+        if not self.series:
+            return
 
-        self.scatter.setData(
-            x = x_data,
-            y = y_data,
-            brush = [pg.mkBrush(c) for c in colors],
-            hoverable = True
-        )
+        start = time.perf_counter()
 
         # Mantiene la finestra visibile senza cancellare i dati vecchi
-        if len(x_data) > self.max_visible_points:
-            self.plot_widget.setXRange(x_data[-self.max_visible_points], x_data[-1], padding=0)
+        if self.follow:
+            self.follow_window()
+
+        x_min, x_max = self.view_box.viewRange()[0]
+        max_points = self.points_per_pixel * max(1, int(self.view_box.width()))
+
+        for series in self.series.values():
+            series.update(x_min, x_max, max_points, self.thresholds)
+
+        self.frame_time.record(time.perf_counter() - start)
+
+    def view_range(self):
+        """
+        Intervallo X inquadrato
+        """
+        return tuple(self.view_box.viewRange()[0])
+
+    def follow_window(self):
+        """
+        Inquadra gli ultimi max_visible_points campioni della serie più avanti
+        """
+        latest = None
+
+        for series in self.series.values():
+            x_data = series.model.full_data_x
+
+            if len(x_data) > self.max_visible_points and (latest is None or x_data[-1] > latest[-1]):
+                latest = x_data
+
+        if latest is not None:
+            self.plot_widget.setXRange(latest[-self.max_visible_points], latest[-1], padding=0)
+
+    def set_metrics_overlay(self, visible):
+        """
+        Mostra o nasconde il riquadro delle metriche sopra il grafico
+        """
+        if visible and self.metrics_overlay is None:
+            self.metrics_overlay = MetricsOverlay(self.plot_widget, REGISTRY)
+
+        if self.metrics_overlay is not None:
+            self.metrics_overlay.set_active(visible)
+
+    def recolor(self):
+        """
+        Ricolora tutte le serie dopo un cambio di soglia
+        """
+        for series in self.series.values():
+            series.recolor(self.thresholds)
+
+    def on_range_changed_manually(self, *args):
+        """
+        Zoom o pan dell'utente: smette di seguire gli ultimi campioni
+        """
+        self.follow = False
+
+    def follow_latest(self):
+        """
+        Torna a seguire gli ultimi campioni ricevuti
+        """
+        self.follow = True
+
+        for series in self.series.values():
+            series.last_frame = None
+
+        self.request_update()
+
+    def nearest_point(self, scene_pos):
+        """
+        Punto disegnato più vicino alla posizione della scena, entro hover_radius pixel, o None
+        """
+        if not self.series or not self.view_box.sceneBoundingRect().contains(scene_pos):
+            return None
+
+        pos = self.view_box.mapSceneToView(scene_pos)
+        pixel_width, pixel_height = self.view_box.viewPixelSize()
+
+        x_tolerance = self.hover_radius * pixel_width
+        y_tolerance = self.hover_radius * pixel_height
+
+        if x_tolerance <= 0 or y_tolerance <= 0:
+            return None
+
+        best = None
+        best_distance = None
+
+        for series in self.series.values():
+            point = series.nearest_point(pos.x(), pos.y(), x_tolerance, y_tolerance)
+
+            if point is None:
+                continue
+
+            distance = ((point[0] - pos.x()) / x_tolerance) ** 2 + ((point[1] - pos.y()) / y_tolerance) ** 2
+
+            if best is None or distance < best_distance:
+                best, best_distance = point, distance
+
+        return best
+
+    def on_mouse_moved(self, scene_pos):
+        self.show_value(self.nearest_point(scene_pos))
+
+    def on_mouse_clicked(self, event):
+        self.show_value(self.nearest_point(event.scenePos()))
+
+    def show_value(self, point):
+        """
+        Mostra il valore del punto (x, y) sopra di esso, o nasconde l'etichetta se point è None
+        """
+        if point is None:
+            self.value_label.setVisible(False)
+            return
+
+        x, y = point
+
+        self.value_label.setText(f"📍 {y:.2f}")
+        self.value_label.setPos(x, y)
+        self.value_label.setVisible(True)
 
     def show_tooltip(self, scatter, points):
         """
@@ -168,15 +734,10 @@ class LivePlotWidget(QObject):
         """
         if points is not None and len(points) > 0:
             point = points[0]  # Prendi il primo punto vicino al mouse
-            x, y = point.pos()
-
-            # Sposta il label sopra il punto e mostra il valore
-            self.value_label.setText(f"📍 {y:.2f}")
-            self.value_label.setPos(x, y)
-            self.value_label.setVisible(True)  # Mostra il valore
+            self.show_value(tuple(point.pos()))
 
         else:
-            self.value_label.setVisible(False)  # Nascondi se non ci sono punti
+            self.show_value(None)  # Nascondi se non ci sono punti
 
     # def on_point_clicked(self, scatter, points):
     #     """
@@ -191,22 +752,24 @@ class LivePlotWidget(QObject):
         """
         Cancella il grafico rimuovendo tutti i dati
         """
-        self.curve.setData([], [])
-        self.scatter.setData([])
+        for series in self.series.values():
+            series.clear()
+
+        self.request_update()
 
     def min_line_moved(self):
         """
         Quando la linea del minimo viene trascinata, aggiorna la UI
         """
         self.update_min_value.emit(self.min_line.value())
-        self.update_plot()
+        self.request_update()
 
     def max_line_moved(self):
         """
         Quando la linea del massimo viene trascinata, aggiorna la UI
         """
         self.update_max_value.emit(self.max_line.value())
-        self.update_plot()
+        self.request_update()
 
     def toggle_min_visibility(self, enabled):
         """
@@ -226,7 +789,8 @@ class LivePlotWidget(QObject):
         """
         self.min_threshold = value
         self.min_line.setValue(value)
-        self.update_plot()
+        self.recolor()
+        self.request_update()
 
     def set_max_value(self, value):
         """
@@ -234,4 +798,5 @@ class LivePlotWidget(QObject):
         """
         self.max_threshold = value
         self.max_line.setValue(value)
-        self.update_plot()
+        self.recolor()
+        self.request_update()
@@ -0,0 +1,156 @@
+"""
+===============================================================================
+ Project:      Python Graph Plotter
+ File:         renderScheduler.py
+ Author:       Matteo Franchini
+ Created:      17/10/2026
+ License:      MIT License (c) 2025 Matteo Franchini
+ Repository:   https://github.com/MatteoFranchini01/python_graph_plotter
+===============================================================================
+ MIT License
+
+ Copyright (c) 2025 Matteo Franchini
+
+ Permission is hereby granted, free of charge, to any person obtaining a copy
+ of this software and associated documentation files (the "Software"), to deal
+ in the Software without restriction, including without limitation the rights
+ to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+ copies of the Software, and to permit persons to whom the Software is
+ furnished to do so, subject to the following conditions:
+
+ The above copyright notice and this permission notice shall be included in
+ all copies or substantial portions of the Software.
+
+ THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+ IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+ FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+ AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+ LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING
+ FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS
+ IN THE SOFTWARE.
+===============================================================================
+"""
+
+import time
+import traceback
+
+from PySide6.QtCore import QObject, QTimer, Qt
+from PySide6.QtGui import QGuiApplication
+
+
+def display_interval(default=1000 / 60):
+    """
+    Durata in millisecondi di un refresh dello schermo principale
+    """
+    screen = QGuiApplication.primaryScreen()
+
+    if screen is None or screen.refreshRate() <= 0:
+        return default
+
+    return 1000 / screen.refreshRate()
+
+
+class RenderScheduler(QObject):
+    """
+    Pianifica i frame del grafico sul thread della GUI.
+
+    Chi modifica dati, vista o soglie chiama request() e il frame viene
+    disegnato al più una volta per refresh dello schermo, raccogliendo tutte
+    le richieste arrivate nel frattempo. Senza richieste il timer resta fermo
+    e non viene disegnato nulla. Se i frame costano più del budget
+    (load della durata dell'intervallo) l'intervallo si allunga fino a
+    max_interval, e torna al refresh dello schermo quando il carico scende.
+    """
+
+    def __init__(self, render, registry, interval=None, max_interval=250, load=0.5, parent=None):
+        super().__init__(parent)
+
+        self.render = render
+        self.min_interval = interval if interval is not None else display_interval()
+        self.max_interval = max_interval
+        self.load = load
+
+        self.interval = self.min_interval   # Intervallo corrente tra due frame, in ms
+        self.frame_cost = 0.0               # Media mobile della durata di un frame, in ms
+        self.last_frame = 0.0
+        self.dirty = False
+        self.active = True
+        self.after_frame = []               # Callback da chiamare una volta dopo il prossimo frame
+
+        self.timer = QTimer(self)
+        self.timer.setSingleShot(True)
+        self.timer.setTimerType(Qt.PreciseTimer)
+        self.timer.timeout.connect(self.on_timeout)
+
+        self.frames = registry.counter("plot.frames")
+        self.requests = registry.counter("plot.frame_requests")
+        self.errors = registry.counter("plot.render_errors")
+
+    def request(self):
+        """
+        Segna il grafico come da ridisegnare e pianifica il prossimo frame utile
+        """
+        self.requests.add()
+
+        if self.dirty or not self.active:
+            return
+
+        self.dirty = True
+
+        elapsed = (time.perf_counter() - self.last_frame) * 1000
+        self.timer.start(max(0, int(self.interval - elapsed)))
+
+    def on_timeout(self):
+        start = time.perf_counter()
+
+        # Le richieste fatte durante il frame (es. lo spostamento della vista
+        # che segue gli ultimi campioni) sono già incluse nel frame stesso
+        try:
+            self.render()
+
+        except Exception:
+            # Un frame fallito non deve fermare i successivi: l'errore viene riportato e si continua
+            self.errors.add()
+            traceback.print_exc()
+
+        finally:
+            self.dirty = False
+
+        self.last_frame = time.perf_counter()
+        self.frames.add()
+        self.adapt((self.last_frame - start) * 1000)
+
+        if self.after_frame:
+            callbacks, self.after_frame = self.after_frame, []
+
+            for callback in callbacks:
+                callback()
+
+    def adapt(self, cost):
+        """
+        Adatta l'intervallo tra i frame alla durata misurata dell'ultimo frame
+        """
+        self.frame_cost = cost if self.frame_cost == 0.0 else 0.8 * self.frame_cost + 0.2 * cost
+        self.interval = min(max(self.frame_cost / self.load, self.min_interval), self.max_interval)
+
+    def call_after_frame(self, callback):
+        """
+        Chiama callback una sola volta, subito dopo il prossimo frame disegnato
+        """
+        self.after_frame.append(callback)
+        self.request()
+
+    @property
+    def frame_rate(self):
+        return 1000 / self.interval
+
+    def stop(self):
+        """
+        Annulla il frame pianificato e ignora le richieste successive
+        """
+        self.active = False
+        self.dirty = False
+        self.timer.stop()
+
+    def start(self):
+        self.active = True
@@ -0,0 +1,158 @@
+"""
+===============================================================================
+ Project:      Python Graph Plotter
+ File:         statsPanel.py
+ Author:       Matteo Franchini
+ Created:      17/10/2026
+ License:      MIT License (c) 2025 Matteo Franchini
+ Repository:   https://github.com/MatteoFranchini01/python_graph_plotter
+===============================================================================
+ MIT License
+
+ Copyright (c) 2025 Matteo Franchini
+
+ Permission is hereby granted, free of charge, to any person obtaining a copy
+ of this software and associated documentation files (the "Software"), to deal
+ in the Software without restriction, including without limitation the rights
+ to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+ copies of the Software, and to permit persons to whom the Software is
+ furnished to do so, subject to the following conditions:
+
+ The above copyright notice and this permission notice shall be included in
+ all copies or substantial portions of the Software.
+
+ THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+ IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+ FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+ AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+ LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING
+ FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS
+ IN THE SOFTWARE.
+===============================================================================
+"""
+
+from PySide6.QtCore import Qt, QTimer
+from PySide6.QtWidgets import (QAbstractItemView, QComboBox, QDockWidget, QTableWidget, QTableWidgetItem,
+                               QVBoxLayout, QWidget)
+
+# Colonne della tabella: chiave del riepilogo e intestazione
+COLUMNS = (("min", "Min"), ("max", "Max"), ("mean", "Media"), ("std", "Dev. std"),
+           ("p50", "P50"), ("p95", "P95"), ("p99", "P99"), ("count", "Campioni"), ("memory", "Memoria"))
+
+SCOPES = (("window", "Ultimi campioni"), ("session", "Sessione"), ("view", "Vista"))
+
+
+class StatsPanel(QDockWidget):
+    """
+    Pannello affiancato al grafico con le statistiche di ogni variabile.
+
+    Legge i riepiloghi già calcolati in modo incrementale da ModelData.stats,
+    quindi l'aggiornamento periodico costa una riga di tabella per variabile
+    e non dipende dal numero di campioni ricevuti. L'ultima colonna riporta
+    la memoria occupata da campioni e piramide di ogni variabile.
+
+    L'ambito "Vista" riassume l'intervallo X inquadrato dal grafico
+    (view_range) con i bucket della piramide, quindi costa poco anche su
+    intervalli lunghi; per questo riporta solo minimo, massimo, media e numero.
+    """
+
+    def __init__(self, models, parent=None, interval=500, view_range=None):
+        super().__init__("Statistiche", parent)
+
+        self.models = models    # Dizionario condiviso {nome: ModelData} del controller
+        self.view_range = view_range
+
+        self.scope_box = QComboBox()
+
+        for _, label in SCOPES:
+            self.scope_box.addItem(label)
+
+        self.table = QTableWidget(0, len(COLUMNS))
+        self.table.setHorizontalHeaderLabels([label for _, label in COLUMNS])
+        self.table.setEditTriggers(QAbstractItemView.NoEditTriggers)
+        self.table.setSelectionBehavior(QAbstractItemView.SelectRows)
+        self.table.setSelectionMode(QAbstractItemView.SingleSelection)
+
+        container = QWidget()
+        layout = QVBoxLayout(container)
+        layout.setContentsMargins(0, 0, 0, 0)
+        layout.addWidget(self.scope_box)
+        layout.addWidget(self.table)
+        self.setWidget(container)
+
+        self.timer = QTimer(self)
+        self.timer.setInterval(interval)
+        self.timer.timeout.connect(self.refresh)
+        self.timer.start()
+
+    @property
+    def scope(self):
+        return SCOPES[self.scope_box.currentIndex()][0]
+
+    def summary(self, name):
+        """
+        Riepilogo della variabile name secondo l'ambito selezionato (None se non ci sono campioni)
+        """
+        model = self.models[name]
+
+        if self.scope == "view":
+            if self.view_range is None:
+                return None
+
+            return model.summary(*model.index_range(*self.view_range()))
+
+        return model.stats.window_summary() if self.scope == "window" else model.stats.session_summary()
+
+    def selected_variable(self):
+        """
+        Variabile della riga selezionata, altrimenti la prima
+        """
+        rows = self.table.selectionModel().selectedRows()
+
+        if rows:
+            item = self.table.verticalHeaderItem(rows[0].row())
+
+            if item is not None and item.text() in self.models:
+                return item.text()
+
+        return next(iter(self.models), None)
+
+    def refresh(self):
+        if not self.isVisible():
+            return
+
+        names = list(self.models)
+        selected = self.selected_variable()
+
+        if self.table.rowCount() != len(names):
+            self.table.setRowCount(len(names))
+
+        self.table.setVerticalHeaderLabels(names)
+
+        for row, name in enumerate(names):
+            summary = self.summary(name)
+
+            for column, (key, _) in enumerate(COLUMNS):
+                if key == "memory":
+                    text = f"{self.models[name].memory_usage()['total'] / (1 << 20):.1f} MB"
+
+                elif summary is None or key not in summary:
+                    text = "-"
+
+                elif key == "count":
+                    text = f"{summary[key]:,}"
+
+                else:
+                    text = f"{summary[key]:.3f}"
+
+                item = self.table.item(row, column)
+
+                if item is None:
+                    item = QTableWidgetItem()
+                    item.setTextAlignment(Qt.AlignRight | Qt.AlignVCenter)
+                    self.table.setItem(row, column, item)
+
+                item.setText(text)
+
+        if selected in names:
+            self.table.selectRow(names.index(selected))
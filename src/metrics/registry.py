@@ -0,0 +1,233 @@
+"""
+===============================================================================
+ Project:      Python Graph Plotter
+ File:         registry.py
+ Author:       Matteo Franchini
+ Created:      17/10/2026
+ License:      MIT License (c) 2025 Matteo Franchini
+ Repository:   https://github.com/MatteoFranchini01/python_graph_plotter
+===============================================================================
+ MIT License
+
+ Copyright (c) 2025 Matteo Franchini
+
+ Permission is hereby granted, free of charge, to any person obtaining a copy
+ of this software and associated documentation files (the "Software"), to deal
+ in the Software without restriction, including without limitation the rights
+ to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+ copies of the Software, and to permit persons to whom the Software is
+ furnished to do so, subject to the following conditions:
+
+ The above copyright notice and this permission notice shall be included in
+ all copies or substantial portions of the Software.
+
+ THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+ IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+ FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+ AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+ LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING
+ FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS
+ IN THE SOFTWARE.
+===============================================================================
+"""
+
+import threading
+import time
+
+import numpy as np
+
+
+class Counter:
+    """
+    Contatore monotono. L'incremento è una somma su un intero Python, quindi
+    costa pochissimo; ogni contatore va incrementato da un solo thread.
+    """
+
+    __slots__ = ("name", "value")
+
+    def __init__(self, name):
+        self.name = name
+        self.value = 0
+
+    def add(self, amount=1):
+        self.value += amount
+
+
+class Histogram:
+    """
+    Istogramma di durate con bucket log-lineari in stile HDR.
+
+    I valori sono registrati in nanosecondi: sotto 2**significant_bits ogni
+    nanosecondo ha il proprio bucket, sopra ogni potenza di due è divisa in
+    2**(significant_bits - 1) bucket, quindi l'errore relativo resta sotto
+    2**(1 - significant_bits) (circa 3% con 6 bit) su tutto l'intervallo.
+    Registrare un valore costa qualche operazione su interi e un incremento
+    di lista; i quantili si calcolano solo quando vengono letti.
+    """
+
+    def __init__(self, name, significant_bits=6, max_seconds=1000.0):
+        self.name = name
+        self.significant_bits = significant_bits
+        self.sub_buckets = 1 << significant_bits
+
+        self.counts = [0] * (self.index(int(max_seconds * 1e9)) + 1)
+        self.count = 0
+        self.total = 0
+        self.max = 0
+
+    def index(self, value):
+        """
+        Bucket del valore value (nanosecondi)
+        """
+        if value < self.sub_buckets:
+            return value
+
+        shift = value.bit_length() - self.significant_bits
+
+        return shift * (self.sub_buckets >> 1) + (value >> shift)
+
+    def lower_bound(self, index):
+        """
+        Valore più piccolo (nanosecondi) che cade nel bucket index
+        """
+        if index < self.sub_buckets:
+            return index
+
+        half = self.sub_buckets >> 1
+        shift = index // half - 1
+
+        return (index - shift * half) << shift
+
+    def record(self, seconds):
+        value = int(seconds * 1e9)
+        index = self.index(value)
+
+        if index >= len(self.counts):
+            index = len(self.counts) - 1
+
+        self.counts[index] += 1
+        self.count += 1
+        self.total += value
+
+        if value > self.max:
+            self.max = value
+
+    def quantiles(self, fractions):
+        """
+        Quantili fractions (in [0, 1]) in secondi, stimati dal centro dei bucket
+        """
+        if self.count == 0:
+            return [0.0] * len(fractions)
+
+        cumulative = np.cumsum(self.counts)
+        indices = np.searchsorted(cumulative, np.asarray(fractions) * self.count, side="left")
+
+        values = []
+
+        for index in indices.tolist():
+            low = self.lower_bound(index)
+            high = self.lower_bound(index + 1)
+            values.append(min((low + high) / 2, self.max) * 1e-9)
+
+        return values
+
+    def summary(self):
+        p50, p90, p99, p999 = self.quantiles([0.5, 0.9, 0.99, 0.999])
+
+        return {
+            "count": self.count,
+            "mean_ms": self.total / self.count * 1e-6 if self.count else 0.0,
+            "p50_ms": p50 * 1e3,
+            "p90_ms": p90 * 1e3,
+            "p99_ms": p99 * 1e3,
+            "p999_ms": p999 * 1e3,
+            "max_ms": self.max * 1e-6,
+        }
+
+
+class Registry:
+    """
+    Insieme di contatori e istogrammi indicizzati per nome ("componente.metrica").
+
+    La creazione è protetta da un lock, l'aggiornamento no: i componenti
+    tengono il riferimento al contatore o all'istogramma e lo aggiornano dal
+    proprio thread. Una lettura concorrente può vedere valori di un istante
+    prima, mai valori inconsistenti.
+    """
+
+    def __init__(self):
+        self.counters = {}
+        self.histograms = {}
+        self.lock = threading.Lock()
+        self.started = time.time()
+
+    def counter(self, name):
+        with self.lock:
+            if name not in self.counters:
+                self.counters[name] = Counter(name)
+
+            return self.counters[name]
+
+    def histogram(self, name, **kwargs):
+        with self.lock:
+            if name not in self.histograms:
+                self.histograms[name] = Histogram(name, **kwargs)
+
+            return self.histograms[name]
+
+    def snapshot(self, prefix=""):
+        """
+        Valori correnti serializzabili in JSON, eventualmente solo quelli che iniziano per prefix
+        """
+        with self.lock:
+            counters = [counter for name, counter in self.counters.items() if name.startswith(prefix)]
+            histograms = [histogram for name, histogram in self.histograms.items() if name.startswith(prefix)]
+
+        return {
+            "uptime_seconds": time.time() - self.started,
+            "counters": {counter.name: counter.value for counter in counters},
+            "histograms": {histogram.name: histogram.summary() for histogram in histograms},
+        }
+
+    def export(self, prefix=""):
+        """
+        Stato grezzo dei contatori e degli istogrammi (solo i bucket non vuoti), da
+        riportare con merge() nel registro di un altro processo
+        """
+        with self.lock:
+            counters = [counter for name, counter in self.counters.items() if name.startswith(prefix)]
+            histograms = [histogram for name, histogram in self.histograms.items() if name.startswith(prefix)]
+
+        return {
+            "counters": {counter.name: counter.value for counter in counters},
+            "histograms": {histogram.name: ({index: count for index, count in enumerate(histogram.counts) if count},
+                                            histogram.count, histogram.total, histogram.max)
+                           for histogram in histograms},
+        }
+
+    def merge(self, state, previous=None):
+        """
+        Aggiunge le metriche di un altro processo con gli stessi nomi: state e previous
+        sono due export() successivi dello stesso registro (previous None al primo),
+        quindi viene sommato solo l'incremento tra i due
+        """
+        if previous is None:
+            previous = {"counters": {}, "histograms": {}}
+
+        for name, value in state["counters"].items():
+            self.counter(name).add(value - previous["counters"].get(name, 0))
+
+        for name, (counts, count, total, maximum) in state["histograms"].items():
+            previous_counts, previous_count, previous_total, _ = previous["histograms"].get(name, ({}, 0, 0, 0))
+            histogram = self.histogram(name)
+
+            for index, value in counts.items():
+                histogram.counts[index] += value - previous_counts.get(index, 0)
+
+            histogram.count += count - previous_count
+            histogram.total += total - previous_total
+            histogram.max = max(histogram.max, maximum)
+
+
+# Registro del processo, condiviso da ricevitore, grafico, controller e server
+REGISTRY = Registry()
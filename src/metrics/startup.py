@@ -0,0 +1,73 @@
+"""
+===============================================================================
+ Project:      Python Graph Plotter
+ File:         startup.py
+ Author:       Matteo Franchini
+ Created:      17/10/2026
+ License:      MIT License (c) 2025 Matteo Franchini
+ Repository:   https://github.com/MatteoFranchini01/python_graph_plotter
+===============================================================================
+ MIT License
+
+ Copyright (c) 2025 Matteo Franchini
+
+ Permission is hereby granted, free of charge, to any person obtaining a copy
+ of this software and associated documentation files (the "Software"), to deal
+ in the Software without restriction, including without limitation the rights
+ to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+ copies of the Software, and to permit persons to whom the Software is
+ furnished to do so, subject to the following conditions:
+
+ The above copyright notice and this permission notice shall be included in
+ all copies or substantial portions of the Software.
+
+ THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+ IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+ FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+ AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+ LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING
+ FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS
+ IN THE SOFTWARE.
+===============================================================================
+"""
+
+import time
+
+# Istante di importazione del modulo: main.py lo importa per primo, prima di Qt e NumPy
+ORIGIN = time.perf_counter()
+
+
+class StartupTimer:
+    """
+    Tempi delle fasi di avvio in millisecondi da origin.
+
+    Ogni fase viene registrata una sola volta (la prima); il modulo non
+    importa NumPy né il registro delle metriche, così può essere usato
+    prima di qualunque import pesante.
+    """
+
+    def __init__(self, origin=ORIGIN):
+        self.origin = origin
+        self.marks = {}
+
+    def mark(self, name):
+        if name not in self.marks:
+            self.marks[name] = (time.perf_counter() - self.origin) * 1000
+
+        return self.marks[name]
+
+    def report(self):
+        """
+        Fasi registrate, in millisecondi, nell'ordine in cui sono avvenute
+        """
+        return {name: round(ms, 1) for name, ms in sorted(self.marks.items(), key=lambda item: item[1])}
+
+    def record(self, registry):
+        """
+        Copia i tempi nel registro come istogrammi startup.<fase>
+        """
+        for name, ms in self.marks.items():
+            registry.histogram(f"startup.{name}").record(ms / 1000)
+
+
+STARTUP = StartupTimer()
@@ -31,20 +31,419 @@
 ===============================================================================
 """
 
+import time
+
+import numpy as np
+
+from src.model.lodPyramid import LodPyramid, bucket_points, merge, samples as sample_buckets
+from src.model.retention import RetentionPolicy
+from src.model.statistics import RollingStatistics
+
+
 class ModelData:
-    def __init__(self):
-        self.full_data_x = []
+    """
+    Contenitore dei campioni ricevuti, basato su buffer NumPy float64.
+
+    I campioni sono salvati in due buffer preallocati (X e Y) che crescono
+    raddoppiando la capacità. Con una politica di retention (max_samples è
+    la forma breve per il solo numero di campioni) il modello conserva solo
+    una finestra: i campioni più vecchi vengono scartati spostando l'inizio
+    della finestra, in O(1) ammortizzato. Con un limite di campioni o di byte
+    la capacità è fissa; con max_age vengono conservati anche gli istanti dei
+    campioni. I campioni scartati restano nei livelli grossolani della
+    piramide (get_archive), se la politica lo prevede.
+
+    get_data() restituisce viste contigue senza copia. Una vista già
+    restituita non viene mai sovrascritta: quando serve spazio i dati vivi
+    vengono copiati in un nuovo buffer invece di essere spostati sul posto.
+
+    Ogni append aggiorna anche una piramide min/max (lod) usata da
+    get_decimated() per servire la vista con un numero di punti limitato,
+    e le statistiche incrementali (stats) della sessione e degli ultimi
+    stats_window campioni.
+    """
+
+    def __init__(self, initial_capacity=4096, max_samples=None, stats_window=1000, retention=None):
+        if max_samples is not None and max_samples <= 0:
+            raise ValueError("max_samples deve essere un intero positivo")
+
+        if retention is None:
+            retention = RetentionPolicy(max_samples=max_samples)
+
+        elif max_samples is not None:
+            retention = retention._replace(max_samples=max_samples)
+
+        self.initial_capacity = max(1, int(initial_capacity))
+        self.apply_policy(retention)
+
+        self.lod = LodPyramid()
+        self.stats = RollingStatistics(stats_window)
+
+        self._allocate()
+
+    @classmethod
+    def from_arrays(cls, x_data, y_data, timestamps=None, lod=None, stats=None, **kwargs):
+        """
+        Crea un modello che usa direttamente gli array indicati (ad esempio file
+        mappati in memoria) come buffer, senza copiarli. Un append successivo
+        sposta i dati in un nuovo buffer in RAM; gli array originali non vengono mai scritti.
+        Piramide (lod) e statistiche (stats) già calcolate sugli stessi campioni,
+        ad esempio salvate con la registrazione, evitano di leggere tutta la sessione.
+        """
+        model = cls(**kwargs)
+
+        model._x = x_data
+        model._y = y_data
+        model._end = len(y_data)
+        model._total = len(y_data)
+
+        if model._t is not None:
+            model._t = timestamps if timestamps is not None else np.full(len(y_data), time.time())
+
+        if lod is not None and lod.count == len(y_data):
+            model.lod = lod
+
+        if stats is not None and stats.samples == len(y_data) and stats.window == model.stats.window:
+            model.stats = stats
+
+        # Piramide e statistiche mancanti vengono costruite a blocchi per non allocare temporanei grandi quanto la sessione
+        step = 1 << 20
+
+        for begin in range(0, len(y_data), step):
+            if model.lod is not lod:
+                model.lod.extend(x_data[begin:begin + step], y_data[begin:begin + step])
+
+            if model.stats is not stats:
+                model.stats.extend(y_data[begin:begin + step])
+
+        if len(y_data):
+            model._evict()
+
+        return model
+
+    def apply_policy(self, retention):
+        self.retention = retention
+        self.max_samples = retention.sample_limit()
+        self.max_age = retention.max_age
+
+    def set_retention(self, retention):
+        """
+        Cambia la politica di retention mantenendo i campioni più recenti che vi rientrano
+        """
+        x_data, y_data = self.get_data()
+        timestamps = self._t[self._start:self._end] if self._t is not None else None
+
+        self.apply_policy(retention)
+
+        live = len(y_data) if self.max_samples is None else min(len(y_data), self.max_samples)
+        capacity = 2 * self.max_samples if self.max_samples is not None else max(self.initial_capacity, 2 * live)
+
+        self._x = np.empty(capacity, dtype=np.float64)
+        self._y = np.empty(capacity, dtype=np.float64)
+        self._x[:live] = x_data[len(y_data) - live:]
+        self._y[:live] = y_data[len(y_data) - live:]
+
+        if self.max_age is None:
+            self._t = None
+
+        else:
+            self._t = np.empty(capacity, dtype=np.float64)
+
+            # Ai campioni ricevuti senza istanti viene attribuito l'istante del cambio di politica
+            self._t[:live] = timestamps[len(y_data) - live:] if timestamps is not None else time.time()
+
+        self._start = 0
+        self._end = live
+
+        if live:
+            self._evict()
+
+        self.trim_lod()
+
+    def _allocate(self):
+        """
+        Alloca buffer vuoti e azzera gli indici
+        """
+        capacity = self.initial_capacity
+
+        if self.max_samples is not None:
+            # Doppia capacità: la compattazione avviene una volta ogni max_samples campioni
+            capacity = 2 * self.max_samples
+
+        self._x = np.empty(capacity, dtype=np.float64)
+        self._y = np.empty(capacity, dtype=np.float64)
+
+        # Istanti dei campioni, solo se servono per la retention per età
+        self._t = np.empty(capacity, dtype=np.float64) if self.max_age is not None else None
+
+        self._start = 0
+        self._end = 0
+        self._total = 0
+        self._trimmed = 0   # first_index all'ultimo trim della piramide
+
+    def _reserve(self, count):
+        """
+        Garantisce spazio per altri count campioni in coda ai buffer
+        """
+        if self._end + count <= len(self._y):
+            return
+
+        live = self._end - self._start
+
+        if self.max_samples is not None:
+            live = min(live, self.max_samples - count)
+            capacity = 2 * self.max_samples
+
+        else:
+            capacity = max(self.initial_capacity, 2 * (live + count))
+
+        new_x = np.empty(capacity, dtype=np.float64)
+        new_y = np.empty(capacity, dtype=np.float64)
+
+        new_x[:live] = self._x[self._end - live:self._end]
+        new_y[:live] = self._y[self._end - live:self._end]
+
+        if self._t is not None:
+            new_t = np.empty(capacity, dtype=np.float64)
+            new_t[:live] = self._t[self._end - live:self._end]
+            self._t = new_t
+
+        self._x = new_x
+        self._y = new_y
+        self._start = 0
+        self._end = live
+
+    def add_data(self, x, y, timestamp=None):
+        """
+        Aggiunge un singolo campione. Senza timestamp la retention per età usa l'istante di arrivo
+        """
+        self._reserve(1)
+
+        self._x[self._end] = x
+        self._y[self._end] = y
+
+        if self._t is not None:
+            self._t[self._end] = time.time() if timestamp is None else timestamp
+
+        self._end += 1
+        self._total += 1
+
+        self.lod.append(x, y)
+        self.stats.add(y)
 
-        self.full_data_y = []
+        self._evict()
 
-    def add_data(self, x, y):
-        self.full_data_x.append(x)
+    def add_block(self, x, y, timestamps=None):
+        """
+        Aggiunge un blocco di campioni con una sola copia vettoriale.
+        Senza timestamps la retention per età usa l'istante di arrivo del blocco
+        """
+        x = np.asarray(x, dtype=np.float64)
+        y = np.asarray(y, dtype=np.float64)
 
-        self.full_data_y.append(y)
+        count = len(y)
+
+        if count == 0:
+            return
+
+        self._total += count
+
+        self.lod.extend(x, y)
+
+        if self.max_samples is not None and count > self.max_samples:
+            # Le statistiche della sessione vedono anche i campioni scartati. Copia: le
+            # statistiche tengono i blocchi in attesa e y può essere una vista su memoria
+            # riutilizzata dal chiamante (ad esempio il ring condiviso di IngestProcess)
+            self.stats.extend(np.array(y[:-self.max_samples]))
+
+            x = x[-self.max_samples:]
+            y = y[-self.max_samples:]
+
+            if timestamps is not None:
+                timestamps = timestamps[-self.max_samples:]
+
+            count = self.max_samples
+
+        self._reserve(count)
+
+        self._x[self._end:self._end + count] = x
+        self._y[self._end:self._end + count] = y
+
+        if self._t is not None:
+            self._t[self._end:self._end + count] = time.time() if timestamps is None else timestamps
+
+        self._end += count
+
+        # Vista sul buffer del modello, che non viene mai sovrascritto: nessuna copia
+        self.stats.extend(self._y[self._end - count:self._end])
+
+        self._evict()
+
+    def _evict(self):
+        """
+        Applica la retention spostando l'inizio della finestra; la piramide
+        scarta i bucket fuori dalla finestra oltre quelli dell'archivio
+        """
+        start = self._start
+
+        if self.max_samples is not None and self._end - start > self.max_samples:
+            start = self._end - self.max_samples
+
+        if self._t is not None:
+            cutoff = self._t[self._end - 1] - self.max_age
+
+            if self._t[start] < cutoff:
+                start += int(np.searchsorted(self._t[start:self._end], cutoff, side="left"))
+
+        self._start = start
+
+        # Anche _reserve e i blocchi più lunghi della finestra scartano campioni
+        if self.first_index != self._trimmed:
+            self.trim_lod()
+
+    def trim_lod(self):
+        """
+        Scarta i bucket della piramide fuori dalla finestra oltre quelli dell'archivio, che con
+        max_bytes si riducono man mano che la piramide guadagna livelli
+        """
+        self.lod.trim(self.first_index, self.retention.archive_limit(len(self.lod.levels)))
+        self._trimmed = self.first_index
 
     def get_data(self):
-        return self.full_data_x, self.full_data_y
+        """
+        Restituisce le viste (senza copia) di X e Y dei campioni memorizzati
+        """
+        return self._x[self._start:self._end], self._y[self._start:self._end]
+
+    def index_range(self, x_min, x_max):
+        """
+        Restituisce l'intervallo di indici locali [begin, end) con X in [x_min, x_max]
+        """
+        x_data = self._x[self._start:self._end]
+
+        begin = int(np.searchsorted(x_data, x_min, side="left"))
+        end = int(np.searchsorted(x_data, x_max, side="right"))
+
+        return begin, end
+
+    def get_decimated(self, begin, end, max_points):
+        """
+        Restituisce al più circa max_points punti min/max per gli indici locali [begin, end)
+        """
+        x_data, y_data = self.get_data()
+
+        if end - begin <= max_points:
+            return x_data[begin:end], y_data[begin:end]
+
+        first = self.first_index
+        buckets = max(1, max_points // 2)
+
+        # Pochi campioni oltre il budget: i bucket del livello 0 sarebbero troppo pochi, si raggruppano i grezzi
+        if end - begin < buckets * self.lod.factor // 2:
+            items = sample_buckets(x_data[begin:end], y_data[begin:end])
+
+            return bucket_points(merge(items, first + begin, -(-(end - begin) // buckets)))
+
+        x, y, stop = self.lod.query(first + begin, first + end, max_points)
+
+        # Coda non ancora aggregata dalla piramide
+        stop = max(stop - first, begin)
+
+        if stop < end:
+            x = np.concatenate((x, x_data[stop:end]))
+            y = np.concatenate((y, y_data[stop:end]))
+
+        return x, y
+
+    def summary(self, begin, end):
+        """
+        Minimo, massimo, media e numero dei valori (NaN esclusi) degli indici
+        locali [begin, end), letti dai bucket della piramide: solo i bordi non
+        allineati ai bucket vengono letti dai campioni. None se non ci sono valori
+        """
+        first = self.first_index
+
+        totals, uncovered = self.lod.aggregate(first + begin, first + end)
+        y_min, y_max, total, count = totals
+
+        for lo, hi in uncovered:
+            values = self._y[self._start + lo - first:self._start + hi - first]
+            values = values[~np.isnan(values)]
+
+            if len(values):
+                y_min = np.fmin(y_min, values.min())
+                y_max = np.fmax(y_max, values.max())
+                total += values.sum()
+                count += len(values)
+
+        if count == 0:
+            return None
+
+        return {"min": float(y_min), "max": float(y_max), "mean": float(total / count), "count": int(count)}
+
+    def get_archive(self, x_min, x_max, max_points):
+        """
+        Restituisce al più circa max_points punti min/max dei campioni già
+        scartati dalla finestra con X in [x_min, x_max], dai livelli della
+        piramide che li coprono ancora. Senza archivio restituisce array vuoti
+        """
+        first = self.first_index
+        x_data = self.full_data_x
+
+        if first == 0 or not self.retention.archive or (len(x_data) and x_min >= x_data[0]):
+            return np.empty(0), np.empty(0)
+
+        begin, size = self.lod.locate(x_min)
+
+        if len(x_data) and x_max >= x_data[0]:
+            end = first
+
+        else:
+            end, size = self.lod.locate(x_max)
+            end = min(end + 2 * size, first)
+
+        x, y, _ = self.lod.query(max(begin - size, 0), end, max_points)
+
+        return x, y
+
+    def memory_usage(self):
+        """
+        Byte occupati dai buffer dei campioni e dalla piramide (finestra e archivio)
+        """
+        samples = self._x.nbytes + self._y.nbytes + (self._t.nbytes if self._t is not None else 0)
+        lod = self.lod.nbytes()
+
+        return {"samples": samples, "lod": lod, "total": samples + lod}
 
     def clear_data(self):
-        self.full_data_x = []
-        self.full_data_y = []
+        """
+        Scarta tutti i campioni e torna alla capacità iniziale
+        """
+        self.lod.clear()
+        self.stats.clear()
+        self._allocate()
+
+    @property
+    def full_data_x(self):
+        return self._x[self._start:self._end]
+
+    @property
+    def full_data_y(self):
+        return self._y[self._start:self._end]
+
+    @property
+    def first_index(self):
+        """
+        Indice assoluto del primo campione ancora memorizzato
+        """
+        return self._total - (self._end - self._start)
+
+    @property
+    def total_count(self):
+        """
+        Numero di campioni ricevuti dall'ultimo clear_data(), scartati inclusi
+        """
+        return self._total
+
+    def __len__(self):
+        return self._end - self._start
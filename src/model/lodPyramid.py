@@ -0,0 +1,469 @@
+"""
+===============================================================================
+ Project:      Python Graph Plotter
+ File:         lodPyramid.py
+ Author:       Matteo Franchini
+ Created:      17/10/2026
+ License:      MIT License (c) 2025 Matteo Franchini
+ Repository:   https://github.com/MatteoFranchini01/python_graph_plotter
+===============================================================================
+ MIT License
+
+ Copyright (c) 2025 Matteo Franchini
+
+ Permission is hereby granted, free of charge, to any person obtaining a copy
+ of this software and associated documentation files (the "Software"), to deal
+ in the Software without restriction, including without limitation the rights
+ to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+ copies of the Software, and to permit persons to whom the Software is
+ furnished to do so, subject to the following conditions:
+
+ The above copyright notice and this permission notice shall be included in
+ all copies or substantial portions of the Software.
+
+ THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+ IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+ FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+ AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+ LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING
+ FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS
+ IN THE SOFTWARE.
+===============================================================================
+"""
+
+import os
+
+import numpy as np
+
+# Righe di un bucket: minimo e massimo con la loro posizione X, somma e numero dei valori non NaN
+X_MIN, Y_MIN, X_MAX, Y_MAX, SUM, COUNT = range(6)
+ROWS = 6
+
+
+class LodLevel:
+    """
+    Livello della piramide: per ogni bucket memorizza il minimo e il massimo
+    con la rispettiva posizione X, la somma e il numero dei valori (da cui
+    la media), in un unico buffer (ROWS, capacità).
+
+    I bucket più vecchi possono essere scartati con trim(): l'inizio si
+    sposta in avanti e lo spazio viene recuperato alla crescita successiva,
+    quindi lo scarto costa O(1) ammortizzato. I bucket sono indicizzati in
+    modo assoluto: il primo conservato è offset.
+    """
+
+    def __init__(self, factor):
+        self.factor = factor
+
+        self.data = np.empty((ROWS, 64), dtype=np.float64)
+        self.begin = 0      # Colonna di data del primo bucket conservato
+        self.size = 0       # Bucket conservati
+        self.offset = 0     # Indice assoluto del primo bucket conservato
+
+        self.pending = np.empty((ROWS, factor), dtype=np.float64)
+        self.pending_count = 0
+
+    def push(self, items):
+        """
+        Accoda elementi del livello inferiore e restituisce i bucket completati
+        """
+        if self.pending_count:
+            items = np.concatenate((self.pending[:, :self.pending_count], items), axis=1)
+
+        full = (items.shape[1] // self.factor) * self.factor
+        rest = items.shape[1] - full
+
+        self.pending[:, :rest] = items[:, full:]
+        self.pending_count = rest
+
+        if full == 0:
+            return None
+
+        buckets = combine(items[:, :full].reshape(ROWS, -1, self.factor))
+        self.extend(buckets)
+
+        return buckets
+
+    def extend(self, buckets):
+        """
+        Aggiunge bucket già aggregati in coda al livello
+        """
+        count = buckets.shape[1]
+
+        # Senza spazio in coda si compatta in un nuovo buffer, che recupera anche i bucket scartati
+        if self.begin + self.size + count > self.data.shape[1]:
+            data = np.empty((ROWS, max(64, 2 * (self.size + count))), dtype=np.float64)
+            data[:, :self.size] = self.buckets()
+            self.data = data
+            self.begin = 0
+
+        self.data[:, self.begin + self.size:self.begin + self.size + count] = buckets
+        self.size += count
+
+    @property
+    def end(self):
+        """
+        Indice assoluto successivo all'ultimo bucket completato
+        """
+        return self.offset + self.size
+
+    def buckets(self):
+        return self.data[:, self.begin:self.begin + self.size]
+
+    def trim(self, first):
+        """
+        Scarta i bucket con indice assoluto minore di first
+        """
+        drop = min(first - self.offset, self.size)
+
+        if drop > 0:
+            self.begin += drop
+            self.size -= drop
+            self.offset += drop
+
+        # Un blocco grande può aver fatto crescere il buffer ben oltre i bucket conservati
+        if self.data.shape[1] > max(64, 4 * self.size):
+            data = np.empty((ROWS, max(64, 2 * self.size)), dtype=np.float64)
+            data[:, :self.size] = self.buckets()
+            self.data = data
+            self.begin = 0
+
+    def nbytes(self):
+        return self.data.nbytes + self.pending.nbytes
+
+    def points(self, begin, end):
+        """
+        Restituisce i bucket assoluti [begin, end) come coppie di punti ordinate per X
+        """
+        return bucket_points(self.columns(begin, end))
+
+    def columns(self, begin, end):
+        """
+        Vista sui bucket assoluti [begin, end)
+        """
+        start = self.begin + begin - self.offset
+
+        return self.data[:, start:start + end - begin]
+
+
+def bucket_points(buckets):
+    """
+    Converte bucket (ROWS, n) in coppie di punti minimo/massimo ordinate per X
+    """
+    x_min, y_min, x_max, y_max = buckets[:Y_MAX + 1]
+    count = buckets.shape[1]
+
+    min_first = x_min <= x_max
+
+    x = np.empty((count, 2), dtype=np.float64)
+    y = np.empty((count, 2), dtype=np.float64)
+
+    x[:, 0] = np.where(min_first, x_min, x_max)
+    y[:, 0] = np.where(min_first, y_min, y_max)
+    x[:, 1] = np.where(min_first, x_max, x_min)
+    y[:, 1] = np.where(min_first, y_max, y_min)
+
+    return x.ravel(), y.ravel()
+
+
+def merge(buckets, first, group):
+    """
+    Riunisce bucket (ROWS, n) consecutivi, il primo di indice assoluto first, in
+    gruppi di group bucket allineati ai multipli di group: spostando la vista i
+    gruppi restano gli stessi e la curva non cambia forma. I gruppi ai bordi
+    vengono completati con bucket vuoti (NaN, conteggio zero)
+    """
+    lead = first % group
+    count = buckets.shape[1]
+    total = -(-(lead + count) // group) * group
+
+    padded = np.empty((ROWS, total), dtype=np.float64)
+    padded[Y_MIN] = padded[Y_MAX] = np.nan
+    padded[SUM:] = 0.0
+
+    # X dei bucket vuoti uguale a quella del bucket vicino: non viene scelta, ma resta ordinata
+    padded[[X_MIN, X_MAX], :lead] = buckets[[X_MIN, X_MAX], :1]
+    padded[[X_MIN, X_MAX], lead + count:] = buckets[[X_MIN, X_MAX], -1:]
+    padded[:, lead:lead + count] = buckets
+
+    return combine(padded.reshape(ROWS, -1, group))
+
+
+def combine(groups):
+    """
+    Riduce gruppi (ROWS, n, factor) a bucket (ROWS, n) mantenendo minimo e
+    massimo e sommando somme e conteggi. I NaN vengono ignorati; un gruppo
+    di soli NaN produce NaN.
+    """
+    rows = np.arange(groups.shape[1])
+
+    i_min = np.where(np.isnan(groups[Y_MIN]), np.inf, groups[Y_MIN]).argmin(axis=1)
+    i_max = np.where(np.isnan(groups[Y_MAX]), -np.inf, groups[Y_MAX]).argmax(axis=1)
+
+    buckets = np.empty(groups.shape[:2], dtype=np.float64)
+    buckets[X_MIN] = groups[X_MIN][rows, i_min]
+    buckets[Y_MIN] = groups[Y_MIN][rows, i_min]
+    buckets[X_MAX] = groups[X_MAX][rows, i_max]
+    buckets[Y_MAX] = groups[Y_MAX][rows, i_max]
+    buckets[SUM:] = groups[SUM:].sum(axis=2)
+
+    return buckets
+
+
+def samples(x, y):
+    """
+    Elementi del livello 0 per i campioni indicati: ogni campione è un bucket di un solo valore
+    """
+    finite = ~np.isnan(y)
+
+    return np.stack((x, y, x, y, np.where(finite, y, 0.0), finite.astype(np.float64)))
+
+
+class LodPyramid:
+    """
+    Piramide multi-risoluzione min/max aggiornata in modo incrementale.
+
+    Il livello k raggruppa factor ** (k + 1) campioni. Ogni bucket conserva
+    il minimo e il massimo con la loro posizione, così picchi e
+    attraversamenti di soglia restano visibili a qualunque livello di zoom.
+
+    Con trim() i livelli scartano i bucket più vecchi: quelli fini si
+    accorciano prima, i grossolani continuano a coprire la storia passata.
+
+    query() e aggregate() usano i bucket più grandi compatibili con la
+    richiesta, quindi costano in proporzione ai punti restituiti (o al
+    numero di livelli) e non ai campioni coperti. save() e load() la
+    conservano accanto a una registrazione.
+    """
+
+    def __init__(self, factor=8):
+        self.factor = factor
+
+        self.clear()
+
+    def clear(self):
+        self.levels = [LodLevel(self.factor)]
+        self.count = 0      # Campioni aggiunti in totale
+
+    def append(self, x, y):
+        """
+        Aggiunge un singolo campione
+        """
+        level = self.levels[0]
+        item = (x, y, x, y, y, 1.0) if y == y else (x, y, x, y, 0.0, 0.0)
+        self.count += 1
+
+        # Percorso veloce: il campione completa il bucket solo una volta ogni factor
+        if level.pending_count < self.factor - 1:
+            level.pending[:, level.pending_count] = item
+            level.pending_count += 1
+            return
+
+        self.push(np.array(item, dtype=np.float64).reshape(ROWS, 1))
+
+    def extend(self, x, y):
+        """
+        Aggiunge un blocco di campioni e propaga i bucket completati verso l'alto
+        """
+        self.count += len(y)
+        self.push(samples(x, y))
+
+    def push(self, items):
+        """
+        Propaga colonne già aggregate (righe X_MIN..COUNT) a partire dal livello 0
+        """
+        for level in self.levels:
+            items = level.push(items)
+
+            if items is None:
+                return
+
+        # Finché l'ultimo livello ha abbastanza bucket ne alimenta uno nuovo. trim() conserva
+        # sempre più di factor bucket per livello, quindi l'ultimo è ancora completo
+        while self.levels[-1].end >= self.factor:
+            top = self.levels[-1]
+
+            level = LodLevel(self.factor)
+            level.push(top.buckets())
+            self.levels.append(level)
+
+    def trim(self, first, keep=0):
+        """
+        Scarta i bucket che coprono solo campioni prima dell'indice assoluto first,
+        conservando comunque gli ultimi keep bucket di ogni livello (archivio)
+        """
+        keep = max(keep, 2 * self.factor)
+
+        for k, level in enumerate(self.levels):
+            level.trim(min(first // self.factor ** (k + 1), level.end - keep))
+
+    def first_sample(self, level):
+        """
+        Primo indice assoluto coperto dal livello
+        """
+        return self.levels[level].offset * self.factor ** (level + 1)
+
+    def locate(self, x):
+        """
+        Cerca la posizione x nel livello più fine che la copre. Restituisce
+        (indice, bucket): l'indice assoluto del primo campione del bucket che
+        contiene x, a meno di un bucket, e la dimensione del bucket in campioni
+        """
+        for k, level in enumerate(self.levels):
+            if level.size == 0:
+                continue
+
+            x_positions = level.buckets()[0]
+            size = self.factor ** (k + 1)
+
+            if x_positions[0] <= x or k == len(self.levels) - 1:
+                bucket = max(int(np.searchsorted(x_positions, x)) - 1, 0)
+
+                return (level.offset + bucket) * size, size
+
+        return 0, 1
+
+    def nbytes(self):
+        return sum(level.nbytes() for level in self.levels)
+
+    def aggregate(self, begin, end):
+        """
+        Minimo, massimo, somma e numero dei valori dei campioni assoluti [begin, end),
+        scomposti nei bucket più grandi contenuti nell'intervallo: al più
+        2 * (factor - 1) bucket per livello. Restituisce ([min, max, somma,
+        conteggio], intervalli) dove intervalli sono i tratti [a, b) non coperti
+        da bucket completi, da aggiungere leggendo i campioni grezzi.
+        """
+        totals = [np.nan, np.nan, 0.0, 0.0]
+        uncovered = []
+
+        self.collect(len(self.levels) - 1, begin, end, totals, uncovered)
+
+        return totals, uncovered
+
+    def collect(self, k, begin, end, totals, uncovered):
+        if begin >= end:
+            return
+
+        if k < 0:
+            uncovered.append((begin, end))
+            return
+
+        size = self.factor ** (k + 1)
+        level = self.levels[k]
+
+        first = max(-(-begin // size), level.offset)
+        last = min(end // size, level.end)
+
+        if last <= first:
+            self.collect(k - 1, begin, end, totals, uncovered)
+            return
+
+        start = level.begin + first - level.offset
+        buckets = level.data[:, start:start + last - first]
+
+        totals[0] = np.fmin(totals[0], np.fmin.reduce(buckets[Y_MIN]))
+        totals[1] = np.fmax(totals[1], np.fmax.reduce(buckets[Y_MAX]))
+        totals[2] += buckets[SUM].sum()
+        totals[3] += buckets[COUNT].sum()
+
+        self.collect(k - 1, begin, first * size, totals, uncovered)
+        self.collect(k - 1, last * size, end, totals, uncovered)
+
+    def save(self, path):
+        """
+        Salva la piramide in un file .npz, scritto in modo atomico
+        """
+        arrays = {"factor": np.array(self.factor), "count": np.array(self.count)}
+
+        for k, level in enumerate(self.levels):
+            arrays[f"buckets{k}"] = level.buckets()
+            arrays[f"pending{k}"] = level.pending[:, :level.pending_count]
+            arrays[f"offset{k}"] = np.array(level.offset)
+
+        with open(path + ".tmp", "wb") as file:
+            np.savez(file, **arrays)
+
+        os.replace(path + ".tmp", path)
+
+    @classmethod
+    def load(cls, path):
+        """
+        Carica una piramide salvata con save()
+        """
+        with np.load(path) as arrays:
+            pyramid = cls(int(arrays["factor"]))
+            pyramid.count = int(arrays["count"])
+            pyramid.levels = []
+
+            for k in range(sum(1 for name in arrays.files if name.startswith("buckets"))):
+                level = LodLevel(pyramid.factor)
+                level.offset = int(arrays[f"offset{k}"])
+                level.extend(arrays[f"buckets{k}"])
+
+                pending = arrays[f"pending{k}"]
+                level.pending[:, :pending.shape[1]] = pending
+                level.pending_count = pending.shape[1]
+
+                pyramid.levels.append(level)
+
+        return pyramid
+
+    def query(self, begin, end, max_points):
+        """
+        Restituisce i punti decimati dei campioni assoluti [begin, end).
+
+        Sceglie il livello più fine che resta entro max_points; poiché due
+        livelli differiscono di factor volte, i bucket del livello ancora più
+        fine vengono riuniti a gruppi in modo da restituire tra max_points / 2
+        e max_points punti circa. La coda non ancora aggregata viene completata
+        con i livelli inferiori. Ritorna (x, y, stop) dove stop è il primo
+        indice assoluto non coperto, da completare con i campioni grezzi.
+        """
+        buckets = max(1, max_points // 2)
+        level = 0
+
+        # Il livello più fine che resta entro max_points e copre ancora begin
+        while level < len(self.levels) - 1 and ((end - begin) > buckets * self.factor ** (level + 1)
+                                                or self.first_sample(level) > begin):
+            level += 1
+
+        # Bucket del livello più fine riuniti a gruppi, se il livello scelto resterebbe sotto la metà del budget
+        group = 1
+
+        if level > 0 and self.first_sample(level - 1) <= begin and (end - begin) < buckets * self.factor ** (level + 1) // 2:
+            level -= 1
+            group = -(-(end - begin) // (buckets * self.factor ** (level + 1)))
+
+        xs, ys = [], []
+        pos = begin
+
+        for k in range(level, -1, -1):
+            size = self.factor ** (k + 1)
+            lod = self.levels[k]
+
+            first = pos // size
+            last = min(lod.end, -(-end // size))
+
+            # I livelli più fini sono stati accorciati di più: il resto va completato dal chiamante
+            if first < lod.offset:
+                break
+
+            if last > first:
+                if k == level and group > 1:
+                    x, y = bucket_points(merge(lod.columns(first, last), first, group))
+
+                else:
+                    x, y = lod.points(first, last)
+
+                xs.append(x)
+                ys.append(y)
+                pos = last * size
+
+            if pos >= end:
+                break
+
+        if not xs:
+            return np.empty(0), np.empty(0), pos
+
+        return np.concatenate(xs), np.concatenate(ys), pos
@@ -0,0 +1,171 @@
+"""
+===============================================================================
+ Project:      Python Graph Plotter
+ File:         retention.py
+ Author:       Matteo Franchini
+ Created:      17/10/2026
+ License:      MIT License (c) 2025 Matteo Franchini
+ Repository:   https://github.com/MatteoFranchini01/python_graph_plotter
+===============================================================================
+ MIT License
+
+ Copyright (c) 2025 Matteo Franchini
+
+ Permission is hereby granted, free of charge, to any person obtaining a copy
+ of this software and associated documentation files (the "Software"), to deal
+ in the Software without restriction, including without limitation the rights
+ to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+ copies of the Software, and to permit persons to whom the Software is
+ furnished to do so, subject to the following conditions:
+
+ The above copyright notice and this permission notice shall be included in
+ all copies or substantial portions of the Software.
+
+ THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+ IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+ FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+ AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+ LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING
+ FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS
+ IN THE SOFTWARE.
+===============================================================================
+"""
+
+from typing import NamedTuple
+
+# Byte di ogni colonna di campioni (float64), allocata con capacità doppia rispetto alla finestra
+COLUMN_BYTES = 2 * 8
+
+# Byte della piramide per campione della finestra: 48 byte per bucket da 8 campioni, più i
+# livelli superiori (8/7), con capacità doppia come i buffer dei campioni
+LOD_BYTES = 14
+
+# Con max_bytes, parte del limite riservata ai livelli della piramide oltre la finestra (archivio)
+ARCHIVE_SHARE = 4
+
+# Byte fissi di ogni livello (capacità minima e bucket in formazione) e di ogni bucket
+# conservato nell'archivio: un livello ridimensiona il buffer oltre quattro volte i bucket conservati
+LEVEL_BYTES = (64 + 8) * 48
+ARCHIVE_BUCKET_BYTES = 4 * 48
+
+
+class RetentionPolicy(NamedTuple):
+    """
+    Limiti di memoria dei campioni di una variabile. I limiti indicati si
+    applicano insieme: resta la finestra più corta.
+
+    I campioni scartati restano visibili come panoramica se archive è vero:
+    la piramide min/max conserva per ogni livello almeno archive_buckets
+    bucket anche fuori dalla finestra, quindi la storia più vecchia viene
+    mostrata a risoluzione via via più grossolana con memoria limitata.
+
+    max_bytes comprende anche l'archivio: un quarto del limite è riservato ai
+    livelli della piramide (bucket dell'archivio e spazio fisso di ogni
+    livello), il resto alla finestra. Con molti livelli i bucket conservati
+    per livello diminuiscono (archive_limit()). Sotto circa 128 KB il limite
+    non basta a coprire lo spazio fisso dei livelli.
+    """
+
+    max_samples: int = None     # Campioni nella finestra
+    max_age: float = None       # Secondi tra il campione più recente e il più vecchio conservato (istanti dei campioni)
+    max_bytes: int = None       # Byte di buffer e piramide, archivio compreso
+    archive: bool = True
+    archive_buckets: int = 4096     # Bucket conservati al più per livello della piramide oltre la finestra
+
+    def sample_limit(self):
+        """
+        Numero massimo di campioni nella finestra dato da max_samples e max_bytes, None se illimitato
+        """
+        limits = []
+
+        if self.max_samples is not None:
+            limits.append(int(self.max_samples))
+
+        if self.max_bytes is not None:
+            limits.append((int(self.max_bytes) - self.archive_bytes()) // self.bytes_per_sample())
+
+        return max(1, min(limits)) if limits else None
+
+    def archive_bytes(self):
+        """
+        Byte di max_bytes riservati ai livelli della piramide oltre la finestra, 0 senza max_bytes
+        """
+        return int(self.max_bytes) // ARCHIVE_SHARE if self.max_bytes is not None else 0
+
+    def archive_limit(self, levels):
+        """
+        Bucket da conservare per livello oltre la finestra in una piramide di levels livelli
+        """
+        if not self.archive:
+            return 0
+
+        if self.max_bytes is None:
+            return self.archive_buckets
+
+        per_level = self.archive_bytes() // max(1, levels) - LEVEL_BYTES
+
+        return max(0, min(self.archive_buckets, per_level // ARCHIVE_BUCKET_BYTES))
+
+    def bytes_per_sample(self):
+        """
+        Byte occupati da ogni campione della finestra: X, Y e, con max_age, gli istanti
+        """
+        columns = 3 if self.max_age is not None else 2
+
+        return columns * COLUMN_BYTES + LOD_BYTES
+
+    @property
+    def bounded(self):
+        return self.max_samples is not None or self.max_age is not None or self.max_bytes is not None
+
+    @classmethod
+    def parse(cls, spec):
+        """
+        Crea una politica da "max_samples=1e6,max_age=3600,max_bytes=256M,archive=0".
+        I byte accettano i suffissi K, M e G (potenze di 1024)
+        """
+        values = {}
+
+        for item in spec.split(","):
+            if not item.strip():
+                continue
+
+            key, _, value = item.partition("=")
+            key = key.strip()
+            value = value.strip()
+
+            if key == "max_samples":
+                values[key] = int(float(value))
+
+            elif key == "max_age":
+                values[key] = float(value)
+
+            elif key == "max_bytes":
+                values[key] = parse_bytes(value)
+
+            elif key == "archive":
+                values[key] = value.lower() not in ("0", "false", "no")
+
+            elif key == "archive_buckets":
+                values[key] = int(value)
+
+            else:
+                raise ValueError(f"Parametro di retention sconosciuto: {key}")
+
+        return cls(**values)
+
+
+def parse_bytes(text):
+    """
+    Converte "512K", "256M", "2G" o un numero in byte
+    """
+    text = text.strip().upper().rstrip("B")
+    multiplier = 1
+
+    for suffix, factor in (("K", 1 << 10), ("M", 1 << 20), ("G", 1 << 30)):
+        if text.endswith(suffix):
+            text = text[:-1]
+            multiplier = factor
+            break
+
+    return int(float(text) * multiplier)
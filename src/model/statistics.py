@@ -0,0 +1,480 @@
+"""
+===============================================================================
+ Project:      Python Graph Plotter
+ File:         statistics.py
+ Author:       Matteo Franchini
+ Created:      17/10/2026
+ License:      MIT License (c) 2025 Matteo Franchini
+ Repository:   https://github.com/MatteoFranchini01/python_graph_plotter
+===============================================================================
+ MIT License
+
+ Copyright (c) 2025 Matteo Franchini
+
+ Permission is hereby granted, free of charge, to any person obtaining a copy
+ of this software and associated documentation files (the "Software"), to deal
+ in the Software without restriction, including without limitation the rights
+ to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+ copies of the Software, and to permit persons to whom the Software is
+ furnished to do so, subject to the following conditions:
+
+ The above copyright notice and this permission notice shall be included in
+ all copies or substantial portions of the Software.
+
+ THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+ IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+ FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+ AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+ LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING
+ FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS
+ IN THE SOFTWARE.
+===============================================================================
+"""
+
+import os
+
+import numpy as np
+
+
+class LogBuckets:
+    """
+    Conteggi su indici interi di bucket, in un array che cresce ai due estremi
+    """
+
+    def __init__(self):
+        self.counts = np.zeros(0, dtype=np.int64)
+        self.offset = 0     # Indice di bucket di counts[0]
+
+    def add(self, indices):
+        low = int(indices.min())
+        high = int(indices.max())
+
+        if len(self.counts) == 0:
+            self.offset = low
+
+        elif low < self.offset or high >= self.offset + len(self.counts):
+            new_offset = min(low, self.offset)
+            size = max(high + 1, self.offset + len(self.counts)) - new_offset
+
+            counts = np.zeros(size, dtype=np.int64)
+            counts[self.offset - new_offset:self.offset - new_offset + len(self.counts)] = self.counts
+
+            self.counts = counts
+            self.offset = new_offset
+
+        if len(self.counts) == 0:
+            self.counts = np.zeros(high - low + 1, dtype=np.int64)
+
+        # Solo il tratto di bucket toccato dal blocco
+        self.counts[low - self.offset:high - self.offset + 1] += np.bincount(indices - low, minlength=high - low + 1)
+
+    @property
+    def total(self):
+        return int(self.counts.sum())
+
+
+class QuantileSketch:
+    """
+    Sketch dei quantili con errore relativo garantito (in stile DDSketch).
+
+    Ogni valore finisce nel bucket ceil(log_gamma(|v|)), con gamma scelto in
+    modo che ogni bucket copra un intervallo di ampiezza relativa
+    2 * relative_accuracy; i valori negativi hanno una seconda serie di
+    bucket. La memoria cresce con il logaritmo dell'intervallo dei valori,
+    non con il numero di campioni, e l'inserimento di un blocco è vettoriale.
+    """
+
+    def __init__(self, relative_accuracy=0.01, min_value=1e-9):
+        self.relative_accuracy = relative_accuracy
+        self.gamma = (1 + relative_accuracy) / (1 - relative_accuracy)
+        self.log_gamma = np.log(self.gamma)
+        self.min_value = min_value      # Valori più piccoli in modulo contano come zero
+
+        self.clear()
+
+    def clear(self):
+        self.positive = LogBuckets()
+        self.negative = LogBuckets()
+        self.zeros = 0
+        self.count = 0
+
+    def extend(self, values):
+        self.count += len(values)
+
+        positive = values[values > self.min_value]
+        negative = values[values < -self.min_value]
+
+        self.zeros += len(values) - len(positive) - len(negative)
+
+        if len(positive):
+            self.positive.add(np.ceil(np.log(positive) * (1 / self.log_gamma)).astype(np.int64))
+
+        if len(negative):
+            self.negative.add(np.ceil(np.log(-negative) * (1 / self.log_gamma)).astype(np.int64))
+
+    def quantile(self, fraction):
+        """
+        Valore approssimato del quantile fraction in [0, 1]
+        """
+        if self.count == 0:
+            return np.nan
+
+        rank = fraction * (self.count - 1)
+
+        # Ordine crescente: negativi dal modulo più grande, zeri, positivi dal più piccolo
+        negative = self.negative.counts[::-1]
+        negatives = int(negative.sum())
+
+        if rank < negatives:
+            position = int(np.searchsorted(np.cumsum(negative), rank, side="right"))
+            index = self.negative.offset + len(negative) - 1 - position
+
+            return -self.bucket_value(index)
+
+        if rank < negatives + self.zeros:
+            return 0.0
+
+        position = int(np.searchsorted(np.cumsum(self.positive.counts), rank - negatives - self.zeros, side="right"))
+
+        return self.bucket_value(self.positive.offset + position)
+
+    def bucket_value(self, index):
+        # Punto dell'intervallo (gamma^(i-1), gamma^i] con lo stesso errore relativo ai due estremi
+        return 2 * self.gamma ** index / (self.gamma + 1)
+
+
+class MonotonicDeque:
+    """
+    Massimo degli ultimi window campioni con una deque monotona.
+
+    La deque contiene i candidati al massimo: valori seguiti solo da valori
+    più piccoli, in ordine decrescente. Un blocco viene accodato in modo
+    vettoriale: un candidato sopravvive se è maggiore del massimo dei valori
+    che lo seguono (un accumulate da destra), poi si scartano quelli usciti
+    dalla finestra. Ogni campione entra ed esce una volta sola.
+    """
+
+    def __init__(self, window):
+        self.window = window
+
+        self.values = np.zeros(0)
+        self.positions = np.zeros(0, dtype=np.int64)
+
+    def extend(self, values, first_position):
+        # Massimo dei valori successivi a ogni posizione del blocco (-inf per l'ultimo)
+        following = np.empty_like(values)
+        following[-1] = -np.inf
+        following[:-1] = np.maximum.accumulate(values[::-1])[::-1][1:]
+
+        survivors = np.flatnonzero(values > following)
+
+        # Dei vecchi candidati restano quelli maggiori di tutto il blocco (cioè di following[0] e values[0])
+        block_max = following[0] if following[0] > values[0] else values[0]
+        old = self.values > block_max
+
+        last_position = first_position + len(values) - 1
+
+        self.values = np.concatenate((self.values[old], values[survivors]))
+        self.positions = np.concatenate((self.positions[old], first_position + survivors))
+
+        # Candidati usciti dalla finestra: sono in testa, perché le posizioni sono crescenti
+        expired = int(np.searchsorted(self.positions, last_position - self.window, side="right"))
+
+        if expired:
+            self.values = self.values[expired:]
+            self.positions = self.positions[expired:]
+
+    @property
+    def maximum(self):
+        return self.values[0] if len(self.values) else np.nan
+
+    def clear(self):
+        self.values = np.zeros(0)
+        self.positions = np.zeros(0, dtype=np.int64)
+
+
+class RollingStatistics:
+    """
+    Statistiche incrementali di un canale, sull'intera sessione e sugli
+    ultimi window campioni, con costo ammortizzato O(1) per campione.
+
+    Sessione: media e varianza con Welford, combinando ogni blocco con la
+    formula di Chan; minimo, massimo e quantili da uno sketch logaritmico.
+    Finestra: somme spostate aggiornate con i campioni che entrano ed escono
+    da un buffer circolare (ricalcolate esattamente ogni window campioni per
+    non accumulare errore) e minimo/massimo da due deque monotone.
+
+    save() e load() conservano lo stato accanto a una registrazione, così
+    riaprirla non richiede di rileggere tutti i campioni.
+
+    Campioni e blocchi vengono accumulati ed elaborati insieme ogni batch
+    campioni (o alla lettura di un riepilogo), così il costo fisso delle
+    operazioni NumPy si ripartisce su molti campioni e add() costa solo un
+    append. I blocchi accumulati non vengono copiati: chi chiama extend()
+    non deve modificarli. I NaN (campioni persi) vengono ignorati.
+    """
+
+    def __init__(self, window=1000, relative_accuracy=0.01, batch=16384):
+        self.window = window
+        self.batch = batch
+        self.sketch = QuantileSketch(relative_accuracy)
+
+        self.clear()
+
+    def clear(self):
+        self.pending = []           # Campioni singoli in attesa
+        self.pending_blocks = []    # Blocchi in attesa
+        self.pending_count = 0
+
+        self.samples = 0            # Campioni elaborati, NaN compresi
+        self.count = 0
+        self.mean = 0.0
+        self.m2 = 0.0
+        self.min = np.inf
+        self.max = -np.inf
+        self.sketch.clear()
+
+        self.ring = np.empty(self.window)
+        self.window_count = 0           # Campioni finiti accodati alla finestra in totale
+        self.window_shift = 0.0         # Riferimento delle somme, per limitare la cancellazione numerica
+        self.window_sum = 0.0
+        self.window_sumsq = 0.0
+        self.since_recompute = 0
+        self.maxima = MonotonicDeque(self.window)
+        self.minima = MonotonicDeque(self.window)
+
+    def add(self, value):
+        self.pending.append(value)
+        self.pending_count += 1
+
+        if self.pending_count >= self.batch:
+            self.flush()
+
+    def extend(self, values):
+        if self.pending:
+            self.pending_blocks.append(np.array(self.pending, dtype=np.float64))
+            self.pending = []
+
+        self.pending_blocks.append(values)
+        self.pending_count += len(values)
+
+        if self.pending_count >= self.batch:
+            self.flush()
+
+    def flush(self):
+        """
+        Elabora i campioni in attesa
+        """
+        if self.pending:
+            self.pending_blocks.append(np.array(self.pending, dtype=np.float64))
+            self.pending = []
+
+        if not self.pending_blocks:
+            return
+
+        blocks, self.pending_blocks = self.pending_blocks, []
+        self.samples += self.pending_count
+        self.pending_count = 0
+
+        self.process(blocks[0] if len(blocks) == 1 else np.concatenate(blocks))
+
+    def process(self, values):
+        values = np.asarray(values, dtype=np.float64)
+        values = values[np.isfinite(values)]
+
+        count = len(values)
+
+        if count == 0:
+            return
+
+        # Sessione: Welford per il blocco, Chan per unirlo al totale
+        block_mean = values.mean()
+        centered = values - block_mean
+        block_m2 = float(np.dot(centered, centered))
+
+        total = self.count + count
+        delta = block_mean - self.mean
+
+        self.mean += delta * count / total
+        self.m2 += block_m2 + delta * delta * self.count * count / total
+        self.count = total
+
+        self.min = min(self.min, values.min())
+        self.max = max(self.max, values.max())
+        self.sketch.extend(values)
+
+        # Finestra
+        first_position = self.window_count
+
+        self.maxima.extend(values, first_position)
+        self.minima.extend(-values, first_position)
+
+        self.push_window(values)
+
+    def push_window(self, values):
+        """
+        Accoda i valori al buffer circolare: il campione di posizione p occupa
+        lo slot p % window, quindi ogni valore nuovo sovrascrive quello che esce
+        """
+        window = self.window
+        count = len(values)
+
+        if count >= window:
+            first = self.window_count + count - window
+            self.ring[(first + np.arange(window)) % window] = values[-window:]
+
+            self.window_count += count
+            self.recompute_window()
+
+            return
+
+        start = self.window_count % window
+        filled = min(self.window_count, window)
+
+        # Al più due tratti contigui del buffer circolare
+        first = min(count, window - start)
+        spans = ((start, start + first, 0, first), (0, count - first, first, count))
+
+        for ring_begin, ring_end, begin, end in spans:
+            if ring_end <= ring_begin:
+                continue
+
+            # Escono i valori sovrascritti; gli slot oltre filled non contengono ancora valori
+            leaving_end = min(ring_end, filled)
+
+            if leaving_end > ring_begin:
+                leaving = self.ring[ring_begin:leaving_end] - self.window_shift
+                self.window_sum -= leaving.sum()
+                self.window_sumsq -= np.dot(leaving, leaving)
+
+            self.ring[ring_begin:ring_end] = values[begin:end]
+
+        entering = values - self.window_shift
+        self.window_sum += entering.sum()
+        self.window_sumsq += np.dot(entering, entering)
+
+        self.window_count += count
+        self.since_recompute += count
+
+        if self.since_recompute >= window:
+            self.recompute_window()
+
+    def recompute_window(self):
+        """
+        Ricalcola le somme della finestra dai valori, centrate sulla media corrente
+        """
+        values = self.window_values()
+
+        self.window_shift = float(values.mean()) if len(values) else 0.0
+
+        shifted = values - self.window_shift
+        self.window_sum = float(shifted.sum())
+        self.window_sumsq = float(np.dot(shifted, shifted))
+        self.since_recompute = 0
+
+    def window_values(self):
+        """
+        Valori della finestra (non in ordine)
+        """
+        return self.ring[:min(self.window_count, self.window)]
+
+    def session_summary(self):
+        self.flush()
+
+        if self.count == 0:
+            return None
+
+        return {
+            "count": self.count,
+            "min": float(self.min),
+            "max": float(self.max),
+            "mean": float(self.mean),
+            "std": float(np.sqrt(self.m2 / self.count)),
+            "p50": float(self.sketch.quantile(0.5)),
+            "p95": float(self.sketch.quantile(0.95)),
+            "p99": float(self.sketch.quantile(0.99)),
+        }
+
+    def window_summary(self):
+        self.flush()
+
+        count = min(self.window_count, self.window)
+
+        if count == 0:
+            return None
+
+        mean = self.window_shift + self.window_sum / count
+        variance = max(self.window_sumsq / count - (self.window_sum / count) ** 2, 0.0)
+
+        # I percentili della finestra si leggono dai valori: al più window campioni, solo su richiesta
+        p50, p95, p99 = np.percentile(self.window_values(), [50, 95, 99])
+
+        return {
+            "count": count,
+            "min": float(-self.minima.maximum),
+            "max": float(self.maxima.maximum),
+            "mean": float(mean),
+            "std": float(np.sqrt(variance)),
+            "p50": float(p50),
+            "p95": float(p95),
+            "p99": float(p99),
+        }
+
+    def save(self, path):
+        """
+        Salva lo stato di sessione, finestra e sketch in un file .npz, scritto in modo atomico
+        """
+        self.flush()
+
+        sketch = self.sketch
+
+        arrays = {
+            "window": np.array(self.window),
+            "batch": np.array(self.batch),
+            "relative_accuracy": np.array(sketch.relative_accuracy),
+            "samples": np.array(self.samples),
+            "count": np.array(self.count),
+            "session": np.array([self.mean, self.m2, self.min, self.max]),
+            "positive": sketch.positive.counts,
+            "negative": sketch.negative.counts,
+            "sketch": np.array([sketch.positive.offset, sketch.negative.offset, sketch.zeros, sketch.count]),
+            "ring": self.ring,
+            "window_state": np.array([self.window_shift, self.window_sum, self.window_sumsq]),
+            "window_counts": np.array([self.window_count, self.since_recompute]),
+            "maxima": self.maxima.values,
+            "maxima_positions": self.maxima.positions,
+            "minima": self.minima.values,
+            "minima_positions": self.minima.positions,
+        }
+
+        with open(path + ".tmp", "wb") as file:
+            np.savez(file, **arrays)
+
+        os.replace(path + ".tmp", path)
+
+    @classmethod
+    def load(cls, path):
+        """
+        Carica statistiche salvate con save()
+        """
+        with np.load(path) as arrays:
+            stats = cls(int(arrays["window"]), float(arrays["relative_accuracy"]), int(arrays["batch"]))
+
+            stats.samples = int(arrays["samples"])
+            stats.count = int(arrays["count"])
+            stats.mean, stats.m2, stats.min, stats.max = (float(value) for value in arrays["session"])
+
+            sketch = stats.sketch
+            sketch.positive.counts = arrays["positive"]
+            sketch.negative.counts = arrays["negative"]
+            sketch.positive.offset, sketch.negative.offset, sketch.zeros, sketch.count = (int(value) for value in arrays["sketch"])
+
+            stats.ring = arrays["ring"]
+            stats.window_shift, stats.window_sum, stats.window_sumsq = (float(value) for value in arrays["window_state"])
+            stats.window_count, stats.since_recompute = (int(value) for value in arrays["window_counts"])
+            stats.maxima.values = arrays["maxima"]
+            stats.maxima.positions = arrays["maxima_positions"]
+            stats.minima.values = arrays["minima"]
+            stats.minima.positions = arrays["minima_positions"]
+
+        return stats
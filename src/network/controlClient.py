@@ -0,0 +1,233 @@
+"""
+===============================================================================
+ Project:      Python Graph Plotter
+ File:         controlClient.py
+ Author:       Matteo Franchini
+ Created:      17/10/2026
+ License:      MIT License (c) 2025 Matteo Franchini
+ Repository:   https://github.com/MatteoFranchini01/python_graph_plotter
+===============================================================================
+ MIT License
+
+ Copyright (c) 2025 Matteo Franchini
+
+ Permission is hereby granted, free of charge, to any person obtaining a copy
+ of this software and associated documentation files (the "Software"), to deal
+ in the Software without restriction, including without limitation the rights
+ to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+ copies of the Software, and to permit persons to whom the Software is
+ furnished to do so, subject to the following conditions:
+
+ The above copyright notice and this permission notice shall be included in
+ all copies or substantial portions of the Software.
+
+ THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+ IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+ FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+ AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+ LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING
+ FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS
+ IN THE SOFTWARE.
+===============================================================================
+"""
+
+import json
+import select
+import socket
+import threading
+
+from src.network.protocol import FORMAT_BINARY, TRANSPORT_SHM, TRANSPORT_UDP
+
+
+class ControlClient:
+    """
+    Client del canale di controllo TCP di UDPServer.
+
+    Alla connessione il server invia la lista delle variabili; poi il client
+    invia comandi testuali terminati da newline:
+        FORMAT <text|binary>        formato dei datagrammi UDP
+        SUBSCRIBE <a,b,...>         aggiunge variabili al flusso
+        UNSUBSCRIBE <a,b,...>       rimuove variabili dal flusso
+        STOP_UDP                    ferma il flusso di tutte le variabili
+        UDP <porta>                 porta UDP locale a cui inviare i campioni
+        STATS                       metriche del server, in JSON su una riga
+        TRANSPORT udp               campioni in datagrammi UDP (default)
+        TRANSPORT shm <nome>        campioni scritti nel SharedRing <nome> del client;
+                                    il server risponde "OK <trasporto>" o "ERR <motivo>"
+    """
+
+    def __init__(self, host="127.0.0.1", port=6000):
+        self.host = host
+        self.port = port
+
+        self.sock = None
+        self.variables = []
+
+        # Le risposte possono essere attese da un thread mentre la UI invia altri comandi
+        self.send_lock = threading.Lock()
+        self.buffer = b""       # Dati ricevuti oltre l'ultima riga letta
+
+    def connect(self, timeout=None):
+        """
+        Si connette al server e riceve la lista delle variabili
+        """
+        self.sock = socket.create_connection((self.host, self.port), timeout=timeout)
+        self.buffer = b""
+
+        # Anche l'attesa della lista rispetta timeout; receive_variable_list torna poi bloccante
+        self.variables = self.receive_variable_list()
+
+        return self.variables
+
+    def receive_variable_list(self):
+        """
+        Legge la lista delle variabili, separate da virgola e terminata da newline.
+        Un server che non invia il newline viene atteso per al più 0.2 secondi.
+        """
+        data = self.sock.recv(4096)
+
+        try:
+            self.sock.settimeout(0.2)
+
+            while not data.endswith(b"\n"):
+                chunk = self.sock.recv(4096)
+
+                if not chunk:
+                    break
+
+                data += chunk
+
+        except socket.timeout:
+            pass
+
+        finally:
+            self.sock.settimeout(None)
+
+        return [name for name in data.decode().strip().split(",") if name]
+
+    def send_command(self, command):
+        with self.send_lock:
+            self.sock.sendall(f"{command}\n".encode())
+
+    def request_format(self, data_format=FORMAT_BINARY):
+        self.send_command(f"FORMAT {data_format}")
+
+    def set_udp_port(self, port):
+        self.send_command(f"UDP {port}")
+
+    def subscribe(self, names):
+        self.send_command("SUBSCRIBE " + ",".join(names))
+
+    def unsubscribe(self, names):
+        self.send_command("UNSUBSCRIBE " + ",".join(names))
+
+    def stop_stream(self):
+        self.send_command("STOP_UDP")
+
+    def request_stats(self, timeout=2.0):
+        """
+        Chiede al server le sue metriche e attende la risposta su una riga
+        """
+        self.send_command("STATS")
+
+        return json.loads(self.read_line(timeout))
+
+    def request_transport(self, transport, ring_name=None, timeout=0.5):
+        """
+        Chiede al server di inviare i campioni con transport e ne attende la risposta
+        """
+        self.propose_transport(transport, ring_name)
+
+        return self.transport_accepted(transport, timeout)
+
+    def propose_transport(self, transport, ring_name=None):
+        """
+        Invia il comando TRANSPORT senza attendere la risposta: il server lo esegue
+        prima dei comandi successivi, quindi si può sottoscrivere subito
+        """
+        if transport == TRANSPORT_SHM:
+            self.send_command(f"TRANSPORT {transport} {ring_name}")
+
+        else:
+            self.send_command(f"TRANSPORT {transport}")
+
+    def transport_accepted(self, transport, timeout=0.5):
+        """
+        Legge la risposta a propose_transport: True se il server accetta. Un server
+        che non conosce il comando non risponde e dopo timeout secondi il client resta su UDP.
+
+        Un server lento potrebbe però rispondere dopo il timeout e passare comunque
+        al trasporto proposto: in quel caso si chiede esplicitamente UDP e si scartano
+        le risposte fino alla sua conferma, così nessuna risposta in ritardo resta in
+        coda e client e server concordano sul trasporto
+        """
+        try:
+            return self.read_line(timeout).decode(errors="replace").strip() == f"OK {transport}"
+
+        except socket.timeout:
+            pass
+
+        except ConnectionError:
+            return False
+
+        if transport != TRANSPORT_UDP:
+            try:
+                self.send_command(f"TRANSPORT {TRANSPORT_UDP}")
+
+                while self.read_line(timeout).decode(errors="replace").strip() != f"OK {TRANSPORT_UDP}":
+                    pass
+
+            except (socket.timeout, ConnectionError):
+                pass
+
+        return False
+
+    def read_line(self, timeout):
+        """
+        Legge una risposta del server terminata da newline. Le righe arrivate insieme
+        restano nel buffer per le letture successive; se il server chiude la connessione
+        prima del newline solleva ConnectionError. Il timeout del socket viene ripristinato
+        """
+        previous = self.sock.gettimeout()
+
+        try:
+            self.sock.settimeout(timeout)
+
+            while b"\n" not in self.buffer:
+                chunk = self.sock.recv(65536)
+
+                if not chunk:
+                    raise ConnectionError("connessione chiusa dal server durante la risposta")
+
+                self.buffer += chunk
+
+        finally:
+            self.sock.settimeout(previous)
+
+        line, _, self.buffer = self.buffer.partition(b"\n")
+
+        return line + b"\n"
+
+    def closed_by_peer(self):
+        """
+        True se il server ha chiuso la connessione (socket leggibile con zero byte in coda).
+        Non consuma dati: il server scrive solo in risposta ai comandi.
+        """
+        if self.sock is None:
+            return True
+
+        readable, _, _ = select.select([self.sock], [], [], 0)
+
+        if not readable:
+            return False
+
+        try:
+            return self.sock.recv(1, socket.MSG_PEEK) == b""
+
+        except OSError:
+            return True
+
+    def close(self):
+        if self.sock is not None:
+            self.sock.close()
+            self.sock = None
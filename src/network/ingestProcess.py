@@ -0,0 +1,208 @@
+"""
+===============================================================================
+ Project:      Python Graph Plotter
+ File:         ingestProcess.py
+ Author:       Matteo Franchini
+ Created:      17/10/2026
+ License:      MIT License (c) 2025 Matteo Franchini
+ Repository:   https://github.com/MatteoFranchini01/python_graph_plotter
+===============================================================================
+ MIT License
+
+ Copyright (c) 2025 Matteo Franchini
+
+ Permission is hereby granted, free of charge, to any person obtaining a copy
+ of this software and associated documentation files (the "Software"), to deal
+ in the Software without restriction, including without limitation the rights
+ to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+ copies of the Software, and to permit persons to whom the Software is
+ furnished to do so, subject to the following conditions:
+
+ The above copyright notice and this permission notice shall be included in
+ all copies or substantial portions of the Software.
+
+ THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+ IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+ FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+ AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+ LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING
+ FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS
+ IN THE SOFTWARE.
+===============================================================================
+"""
+
+import multiprocessing
+import time
+
+from src.network.sharedRing import SharedRing
+
+# Secondi tra due richieste delle metriche del ricevitore al processo figlio
+METRICS_INTERVAL = 0.5
+
+
+def ingest_main(ring_name, connection, host, port, variables, recv_buffer_size, reorder_window, reorder_timeout):
+    """
+    Processo di ingestione: un UdpReceiver che scrive i blocchi nel ring
+    condiviso. Il thread principale esegue i comandi ricevuti dalla pipe
+    finché il processo padre non chiede lo stop o chiude la pipe; al
+    comando metrics risponde con lo stato delle metriche del ricevitore.
+    """
+    from src.metrics.registry import REGISTRY
+    from src.network.udpReceiver import UdpReceiver
+
+    # Il figlio condivide il resource tracker del padre, che ha creato il segmento
+    ring = SharedRing(ring_name, track=True)
+
+    def on_blocks(blocks):
+        for channel, (x_data, y_data, timestamps) in blocks.items():
+            ring.write(channel, x_data, y_data, timestamps)
+
+    receiver = UdpReceiver(host, port, on_blocks, variables=variables, recv_buffer_size=recv_buffer_size,
+                           reorder_window=reorder_window, reorder_timeout=reorder_timeout)
+    receiver.start()
+
+    # Porta effettiva, da comunicare al server
+    connection.send(receiver.port)
+
+    try:
+        while True:
+            command, argument = connection.recv()
+
+            if command == "metrics":
+                # Solo su richiesta: un padre che non legge la pipe non la riempie
+                connection.send(("metrics", REGISTRY.export("receiver.")))
+
+            elif command == "variables":
+                receiver.variables = list(argument)
+
+            elif command == "reset_sequences":
+                receiver.reset_sequences()
+
+            elif command == "stop":
+                break
+
+    except (EOFError, OSError):
+        pass
+
+    receiver.stop()
+    ring.close()
+
+
+class IngestProcess:
+    """
+    Ricezione UDP in un processo separato, con la stessa interfaccia di
+    UdpReceiver (start, stop, port, variables, reset_sequences).
+
+    Socket, decodifica e riordino girano nel processo figlio e non competono
+    con Qt per il GIL; i campioni arrivano al processo della UI attraverso
+    un SharedRing, da cui il controller li legge (read/release) e li copia
+    direttamente nei ModelData senza copie intermedie. Le metriche del
+    ricevitore vengono chieste dalla pipe e update_metrics() le riporta nel
+    registro del processo della UI con gli stessi nomi.
+    """
+
+    def __init__(self, host, port, variables=(), recv_buffer_size=4 * 1024 * 1024, capacity=1 << 20,
+                 reorder_window=32, reorder_timeout=0.05):
+        self.host = host
+        self.port = port
+        self._variables = list(variables)
+        self.recv_buffer_size = recv_buffer_size
+        self.reorder_window = reorder_window
+        self.reorder_timeout = reorder_timeout
+
+        self.ring = SharedRing(capacity=capacity)
+
+        self.connection = None
+        self.process = None
+        self.metrics = None     # Ultime metriche ricevute dal figlio, già riportate nel registro
+        self.metrics_requested = 0.0
+
+    @property
+    def variables(self):
+        return self._variables
+
+    @variables.setter
+    def variables(self, variables):
+        self._variables = list(variables)
+
+        if self.connection is not None:
+            self.connection.send(("variables", self._variables))
+
+    def reset_sequences(self):
+        if self.connection is not None:
+            self.connection.send(("reset_sequences", None))
+
+    def update_metrics(self, registry):
+        """
+        Riporta in registry le metriche arrivate dal processo figlio e, ogni
+        METRICS_INTERVAL secondi, ne chiede di nuove. Non blocca
+        """
+        if self.connection is None:
+            return
+
+        try:
+            while self.connection.poll():
+                message, state = self.connection.recv()
+
+                if message == "metrics":
+                    registry.merge(state, self.metrics)
+                    self.metrics = state
+
+            now = time.monotonic()
+
+            if now - self.metrics_requested >= METRICS_INTERVAL:
+                self.connection.send(("metrics", None))
+                self.metrics_requested = now
+
+        except (EOFError, OSError):
+            pass
+
+    def start(self, timeout=10.0):
+        """
+        Avvia il processo e attende che il socket UDP sia aperto
+        """
+        # spawn e non fork: il processo della UI ha già thread (Qt, alert) che fork non duplicherebbe
+        context = multiprocessing.get_context("spawn")
+
+        self.connection, child_connection = context.Pipe()
+
+        self.process = context.Process(
+            target=ingest_main, daemon=True,
+            args=(self.ring.name, child_connection, self.host, self.port, self._variables, self.recv_buffer_size,
+                  self.reorder_window, self.reorder_timeout))
+        self.process.start()
+
+        child_connection.close()
+
+        try:
+            if not self.connection.poll(timeout):
+                raise EOFError()
+
+            self.port = self.connection.recv()
+
+        except EOFError:
+            self.stop()
+            raise RuntimeError("Il processo di ingestione non si è avviato")
+
+    def stop(self):
+        if self.connection is not None:
+            try:
+                self.connection.send(("stop", None))
+
+            except OSError:
+                pass
+
+            self.connection.close()
+            self.connection = None
+
+        if self.process is not None:
+            self.process.join(timeout=2.0)
+
+            if self.process.is_alive():
+                self.process.terminate()
+
+            self.process = None
+
+        if self.ring is not None:
+            self.ring.close()
+            self.ring = None
@@ -0,0 +1,193 @@
+"""
+===============================================================================
+ Project:      Python Graph Plotter
+ File:         protocol.py
+ Author:       Matteo Franchini
+ Created:      17/10/2026
+ License:      MIT License (c) 2025 Matteo Franchini
+ Repository:   https://github.com/MatteoFranchini01/python_graph_plotter
+===============================================================================
+ MIT License
+
+ Copyright (c) 2025 Matteo Franchini
+
+ Permission is hereby granted, free of charge, to any person obtaining a copy
+ of this software and associated documentation files (the "Software"), to deal
+ in the Software without restriction, including without limitation the rights
+ to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+ copies of the Software, and to permit persons to whom the Software is
+ furnished to do so, subject to the following conditions:
+
+ The above copyright notice and this permission notice shall be included in
+ all copies or substantial portions of the Software.
+
+ THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+ IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+ FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+ AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+ LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING
+ FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS
+ IN THE SOFTWARE.
+===============================================================================
+"""
+
+import ipaddress
+import struct
+from typing import NamedTuple
+
+import numpy as np
+
+# Formati di trasmissione negoziati sul canale TCP con il comando FORMAT
+FORMAT_TEXT = "text"
+FORMAT_BINARY = "binary"
+
+# Trasporti negoziati sul canale TCP con il comando TRANSPORT: datagrammi UDP
+# oppure, tra processi sullo stesso host, un SharedRing creato dal client
+TRANSPORT_UDP = "udp"
+TRANSPORT_SHM = "shm"
+
+# Versione 1 del frame binario: header little-endian seguito dai campioni impacchettati
+#   magic (2s) | version (B) | flags (B) | channel (H) | count (H)
+#   sequence (I) | first_index (Q) | timestamp (d) | period (d)
+MAGIC = b"\xa5\x5a"
+VERSION = 1
+HEADER = struct.Struct("<2sBBHHIQdd")
+
+# Posizione del numero di sequenza nell'header, per rinumerare un frame già codificato
+SEQUENCE = struct.Struct("<I")
+SEQUENCE_OFFSET = struct.calcsize("<2sBBHH")
+
+FLAG_FLOAT64 = 0x01     # Campioni float64 invece di float32
+
+MAX_DATAGRAM = 65507
+MAX_SAMPLES_FLOAT64 = (MAX_DATAGRAM - HEADER.size) // 8
+
+
+class Frame(NamedTuple):
+    channel: int        # Indice della variabile nella lista inviata via TCP
+    sequence: int       # Numero progressivo del datagramma sul canale, per client
+    first_index: int    # Indice assoluto del primo campione
+    timestamp: float    # Istante di acquisizione del primo campione (secondi epoch)
+    period: float       # Intervallo tra campioni consecutivi (secondi)
+    values: np.ndarray
+
+    def timestamps(self):
+        """
+        Restituisce l'istante di acquisizione di ogni campione
+        """
+        return self.timestamp + self.period * np.arange(len(self.values))
+
+    def indices(self):
+        """
+        Restituisce l'indice assoluto di ogni campione come float64, pronto per l'asse X
+        """
+        return np.arange(self.first_index, self.first_index + len(self.values), dtype=np.float64)
+
+
+def encode_frame(channel, sequence, first_index, timestamp, period, values, dtype=np.float64):
+    """
+    Codifica un blocco di campioni in un frame binario
+    """
+    dtype = np.dtype(dtype)
+
+    if dtype not in (np.float32, np.float64):
+        raise ValueError(f"Tipo dei campioni non supportato: {dtype}")
+
+    payload = np.ascontiguousarray(values, dtype=dtype.newbyteorder("<"))
+
+    if len(payload) > MAX_SAMPLES_FLOAT64 * 8 // dtype.itemsize:
+        raise ValueError(f"Troppi campioni per un singolo datagramma: {len(payload)}")
+
+    flags = FLAG_FLOAT64 if dtype == np.float64 else 0
+
+    header = HEADER.pack(MAGIC, VERSION, flags, channel, len(payload),
+                         sequence & 0xFFFFFFFF, first_index, timestamp, period)
+
+    return header + payload.tobytes()
+
+
+def renumber_frame(frame, sequence):
+    """
+    Restituisce il frame codificato con il numero di sequenza indicato; se è già
+    quello restituisce il frame stesso, altrimenti una copia (il payload non viene ricodificato)
+    """
+    sequence &= 0xFFFFFFFF
+
+    if SEQUENCE.unpack_from(frame, SEQUENCE_OFFSET)[0] == sequence:
+        return frame
+
+    data = bytearray(frame)
+    SEQUENCE.pack_into(data, SEQUENCE_OFFSET, sequence)
+
+    return bytes(data)
+
+
+def decode_frame(data):
+    """
+    Decodifica un frame binario; i valori sono una vista sul buffer ricevuto
+    """
+    if len(data) < HEADER.size:
+        raise ValueError("Frame troppo corto")
+
+    magic, version, flags, channel, count, sequence, first_index, timestamp, period = HEADER.unpack_from(data)
+
+    if magic != MAGIC:
+        raise ValueError("Frame senza magic number")
+
+    if version != VERSION:
+        raise ValueError(f"Versione del frame non supportata: {version}")
+
+    dtype = np.dtype("<f8") if flags & FLAG_FLOAT64 else np.dtype("<f4")
+
+    if len(data) != HEADER.size + count * dtype.itemsize:
+        raise ValueError("Lunghezza del frame non coerente con l'header")
+
+    values = np.frombuffer(data, dtype=dtype, count=count, offset=HEADER.size)
+
+    return Frame(channel, sequence, first_index, timestamp, period, values)
+
+
+def is_binary(data):
+    """
+    Indica se il datagramma è un frame binario invece di un messaggio testuale
+    """
+    return data[:2] == MAGIC
+
+
+def is_local_host(host):
+    """
+    Indica se host è l'interfaccia di loopback, dove è possibile il trasporto in memoria condivisa
+    """
+    if host == "localhost":
+        return True
+
+    try:
+        address = ipaddress.ip_address(host)
+
+    except ValueError:
+        return False
+
+    # Anche un client IPv4 visto da un socket IPv6 (::ffff:127.0.0.1)
+    if address.version == 6 and address.ipv4_mapped is not None:
+        address = address.ipv4_mapped
+
+    return address.is_loopback
+
+
+def encode_text(name, value):
+    """
+    Codifica un singolo campione nel formato testuale "<nome>:<valore>"
+    """
+    return f"{name}:{value}".encode()
+
+
+def decode_text(data):
+    """
+    Decodifica un messaggio testuale "<nome>:<valore>"
+    """
+    parts = data.decode().strip().split(":")
+
+    if len(parts) != 2:
+        raise ValueError("Formato messaggio non valido")
+
+    return parts[0], float(parts[1])
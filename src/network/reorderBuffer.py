@@ -0,0 +1,167 @@
+"""
+===============================================================================
+ Project:      Python Graph Plotter
+ File:         reorderBuffer.py
+ Author:       Matteo Franchini
+ Created:      17/10/2026
+ License:      MIT License (c) 2025 Matteo Franchini
+ Repository:   https://github.com/MatteoFranchini01/python_graph_plotter
+===============================================================================
+ MIT License
+
+ Copyright (c) 2025 Matteo Franchini
+
+ Permission is hereby granted, free of charge, to any person obtaining a copy
+ of this software and associated documentation files (the "Software"), to deal
+ in the Software without restriction, including without limitation the rights
+ to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+ copies of the Software, and to permit persons to whom the Software is
+ furnished to do so, subject to the following conditions:
+
+ The above copyright notice and this permission notice shall be included in
+ all copies or substantial portions of the Software.
+
+ THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+ IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+ FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+ AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+ LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING
+ FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS
+ IN THE SOFTWARE.
+===============================================================================
+"""
+
+import numpy as np
+
+
+class ReorderBuffer:
+    """
+    Finestra di riordino dei frame binari di un canale.
+
+    I frame vengono consegnati in ordine di numero di sequenza. Un frame in
+    anticipo resta in attesa finché arriva quello mancante, finché in attesa
+    ci sono più di window frame oppure finché il più vecchio aspetta da più
+    di timeout secondi: a quel punto i frame mancanti sono dichiarati persi.
+    Un frame che arriva dopo essere stato dichiarato perso (o duplicato)
+    viene scartato, perché i campioni successivi sono già stati consegnati.
+
+    Dove gli indici dei campioni non sono consecutivi viene inserito un
+    campione NaN, così la curva si interrompe invece di unire i due tratti.
+    """
+
+    def __init__(self, registry, name, window=32, timeout=0.05):
+        self.window = window
+        self.timeout = timeout
+
+        self.next_sequence = None   # Prossimo numero di sequenza da consegnare
+        self.highest = None         # Numero di sequenza più alto ricevuto
+        self.next_index = None      # Indice atteso del primo campione del prossimo frame
+        self.pending = {}           # Numero di sequenza -> (frame, istante di arrivo)
+
+        # Contatori del canale e totali del ricevitore
+        self.lost = registry.counter(f"receiver.{name}.lost")
+        self.reordered = registry.counter(f"receiver.{name}.reordered")
+        self.late = registry.counter(f"receiver.{name}.late")
+        self.total_lost = registry.counter("receiver.lost_datagrams")
+        self.total_reordered = registry.counter("receiver.reordered_datagrams")
+        self.total_late = registry.counter("receiver.late_datagrams")
+
+    def reset(self):
+        """
+        Dimentica la numerazione: il prossimo frame fa da nuovo riferimento. L'indice
+        atteso resta, così un salto degli indici interrompe comunque la curva
+        """
+        self.next_sequence = None
+        self.highest = None
+
+    def push(self, frame, now):
+        """
+        Inserisce un frame e restituisce le parti (X, valori, istanti) pronte, in ordine
+        """
+        sequence = frame.sequence
+
+        if self.next_sequence is None:
+            self.next_sequence = sequence
+            self.highest = sequence
+
+        elif sequence < self.next_sequence:
+            if self.next_sequence - sequence <= 16 * self.window:
+                self.late.add()
+                self.total_late.add()
+
+                return []
+
+            # Numerazione ripartita (server riavviato): si consegna ciò che resta e si riparte
+            parts = self.release(now, flush=True)
+
+            self.next_sequence = sequence
+            self.highest = sequence
+            self.next_index = None
+
+            return parts + self.push(frame, now)
+
+        # Caso comune: il frame atteso senza nulla in attesa viene consegnato subito
+        if sequence == self.next_sequence and not self.pending:
+            self.next_sequence += 1
+            self.highest = max(self.highest, sequence)
+
+            return [self.deliver(frame)]
+
+        if sequence in self.pending:
+            self.late.add()
+            self.total_late.add()
+
+            return []
+
+        if sequence < self.highest:
+            self.reordered.add()
+            self.total_reordered.add()
+
+        self.highest = max(self.highest, sequence)
+        self.pending[sequence] = (frame, now)
+
+        return self.release(now)
+
+    def release(self, now, flush=False):
+        """
+        Consegna i frame in ordine; i buchi vengono saltati quando la finestra
+        è piena, quando il frame in attesa più vecchio è scaduto o con flush
+        """
+        parts = []
+
+        while self.pending:
+            entry = self.pending.pop(self.next_sequence, None)
+
+            if entry is not None:
+                parts.append(self.deliver(entry[0]))
+                self.next_sequence += 1
+                continue
+
+            expired = now - min(arrival for _, arrival in self.pending.values()) > self.timeout
+
+            if not (flush or expired or len(self.pending) > self.window):
+                break
+
+            first = min(self.pending)
+
+            self.lost.add(first - self.next_sequence)
+            self.total_lost.add(first - self.next_sequence)
+
+            self.next_sequence = first
+
+        return parts
+
+    def deliver(self, frame):
+        x_data = frame.indices()
+        y_data = frame.values
+        timestamps = frame.timestamps()
+
+        if self.next_index is not None and frame.first_index > self.next_index:
+            # Campioni mancanti: un NaN al primo indice mancante interrompe la curva
+            x_data = np.concatenate(([self.next_index], x_data))
+            y_data = np.concatenate(([np.nan], y_data))
+            timestamps = np.concatenate(([timestamps[0]], timestamps))
+
+        self.next_index = frame.first_index + len(frame.values)
+
+        return x_data, y_data, timestamps
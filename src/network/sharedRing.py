@@ -0,0 +1,268 @@
+"""
+===============================================================================
+ Project:      Python Graph Plotter
+ File:         sharedRing.py
+ Author:       Matteo Franchini
+ Created:      17/10/2026
+ License:      MIT License (c) 2025 Matteo Franchini
+ Repository:   https://github.com/MatteoFranchini01/python_graph_plotter
+===============================================================================
+ MIT License
+
+ Copyright (c) 2025 Matteo Franchini
+
+ Permission is hereby granted, free of charge, to any person obtaining a copy
+ of this software and associated documentation files (the "Software"), to deal
+ in the Software without restriction, including without limitation the rights
+ to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+ copies of the Software, and to permit persons to whom the Software is
+ furnished to do so, subject to the following conditions:
+
+ The above copyright notice and this permission notice shall be included in
+ all copies or substantial portions of the Software.
+
+ THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+ IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+ FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+ AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+ LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING
+ FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS
+ IN THE SOFTWARE.
+===============================================================================
+"""
+
+import sys
+from multiprocessing import resource_tracker, shared_memory
+
+import numpy as np
+
+# Header: ogni contatore su una propria linea di cache da 64 byte, così produttore
+# e consumatore non si contendono la stessa linea (false sharing)
+HEAD = 0            # Campioni scritti in totale (solo il produttore)
+OVERFLOW = 1        # Campioni scartati perché il ring era pieno (solo il produttore)
+TAIL = 8            # Campioni letti in totale (solo il consumatore)
+CAPACITY = 16       # Capacità in campioni (scritta alla creazione)
+MAGIC = 17          # Identifica un segmento creato da SharedRing (scritto alla creazione, per ultimo)
+HEADER_SIZE = 24 * 8
+
+RING_MAGIC = int.from_bytes(b"PGRING01", "little")
+
+# Colonne di ogni campione: X, valore e istante in float64, canale in uint16
+RECORD_SIZE = 3 * 8 + 2
+
+# Segmenti creati da questo processo: chi vi si collega dallo stesso processo
+# condivide il resource tracker del creatore
+created_here = set()
+
+
+class SharedRing:
+    """
+    Ring buffer single-producer/single-consumer di campioni in
+    multiprocessing.shared_memory.
+
+    head e tail sono contatori a 64 bit monotoni, ognuno scritto da un solo
+    processo con un'unica store allineata (atomica su x86-64 e AArch64). Il
+    produttore copia i campioni e solo dopo pubblica il nuovo head; il
+    consumatore legge fino all'head letto e solo dopo averli usati avanza
+    tail. Sulle architetture con ordinamento debole delle store (ARM) la
+    pubblicazione si affida alle barriere implicite delle chiamate di
+    sistema tra i due lati; su x86-64 l'ordine è garantito dall'hardware.
+
+    I blocchi restituiti da read() sono viste sulla memoria condivisa, valide
+    fino a release(): chi ne ha bisogno dopo deve copiarli.
+    """
+
+    def __init__(self, name=None, capacity=1 << 20, track=False):
+        if name is None:
+            self.shm = shared_memory.SharedMemory(create=True, size=HEADER_SIZE + capacity * RECORD_SIZE)
+            self.owner = True
+
+            created_here.add(self.shm.name)
+
+        else:
+            self.shm = attach(name, track)
+            self.owner = False
+
+            # Il nome può arrivare da un altro processo (comando TRANSPORT): prima di
+            # scrivere si verifica che il segmento sia davvero un ring e che sia abbastanza grande
+            try:
+                validate(self.shm)
+
+            except ValueError:
+                self.shm.close()
+                raise
+
+        self.header = np.ndarray(HEADER_SIZE // 8, dtype=np.uint64, buffer=self.shm.buf)
+
+        if self.owner:
+            self.header[:] = 0
+            self.header[CAPACITY] = capacity
+            self.header[MAGIC] = RING_MAGIC
+
+        self.capacity = int(self.header[CAPACITY])
+
+        offset = HEADER_SIZE
+        columns = []
+
+        for dtype in (np.float64, np.float64, np.float64, np.uint16):
+            columns.append(np.ndarray(self.capacity, dtype=dtype, buffer=self.shm.buf, offset=offset))
+            offset += self.capacity * np.dtype(dtype).itemsize
+
+        self.x, self.y, self.t, self.channel = columns
+
+        # Head letto dall'ultimo read(), fino al quale release() libera lo spazio
+        self.read_head = None
+
+    @property
+    def name(self):
+        return self.shm.name
+
+    @property
+    def overflow(self):
+        return int(self.header[OVERFLOW])
+
+    def __len__(self):
+        return int(self.header[HEAD]) - int(self.header[TAIL])
+
+    def write(self, channel, x_data, y_data, timestamps):
+        """
+        Lato produttore: accoda un blocco di un canale. Se non c'è spazio il
+        blocco intero viene scartato e contato in overflow: il produttore non
+        aspetta mai il consumatore. Il salto negli indici che ne risulta viene
+        interrotto con un NaN dal consumatore (StreamIndex). Restituisce True
+        se il blocco è stato scritto.
+        """
+        count = len(y_data)
+        head = int(self.header[HEAD])
+
+        if head + count - int(self.header[TAIL]) > self.capacity:
+            self.header[OVERFLOW] += count
+            return False
+
+        start = head % self.capacity
+        first = min(count, self.capacity - start)
+
+        # Due tratti contigui: fino alla fine del ring e dall'inizio
+        for begin, end, position in ((0, first, start), (first, count, 0)):
+            if begin == end:
+                continue
+
+            size = end - begin
+            self.x[position:position + size] = x_data[begin:end]
+            self.y[position:position + size] = y_data[begin:end]
+            self.t[position:position + size] = timestamps[begin:end]
+            self.channel[position:position + size] = channel
+
+        # Pubblicazione: i campioni sono già in memoria quando il consumatore vede il nuovo head
+        self.header[HEAD] = head + count
+
+        return True
+
+    def read(self):
+        """
+        Lato consumatore: restituisce {canale: (X, valori, istanti)} con i
+        campioni disponibili. Un canale che occupa un solo tratto contiguo
+        viene restituito come vista senza copia, altrimenti i tratti vengono
+        concatenati. Lo spazio resta occupato fino a release().
+        """
+        tail = int(self.header[TAIL])
+        head = int(self.header[HEAD])
+
+        self.read_head = head
+
+        if head == tail:
+            return {}
+
+        start = tail % self.capacity
+        end = start + (head - tail)
+
+        spans = [(start, min(end, self.capacity))]
+
+        if end > self.capacity:
+            spans.append((0, end - self.capacity))
+
+        runs = {}
+
+        for begin, stop in spans:
+            channels = self.channel[begin:stop]
+
+            # Confini dei tratti consecutivi dello stesso canale
+            bounds = np.flatnonzero(channels[1:] != channels[:-1]) + 1
+            starts = np.concatenate(([0], bounds))
+            stops = np.concatenate((bounds, [stop - begin]))
+
+            for run_start, run_stop in zip((starts + begin).tolist(), (stops + begin).tolist()):
+                channel = int(self.channel[run_start])
+                runs.setdefault(channel, []).append((self.x[run_start:run_stop], self.y[run_start:run_stop],
+                                                     self.t[run_start:run_stop]))
+
+        blocks = {}
+
+        for channel, parts in runs.items():
+            if len(parts) == 1:
+                blocks[channel] = parts[0]
+
+            else:
+                blocks[channel] = tuple(np.concatenate(column) for column in zip(*parts))
+
+        return blocks
+
+    def release(self):
+        """
+        Lato consumatore: libera i campioni restituiti dall'ultimo read()
+        """
+        if self.read_head is not None:
+            self.header[TAIL] = self.read_head
+            self.read_head = None
+
+    def close(self):
+        """
+        Rilascia le viste e la mappatura; il processo che ha creato il ring elimina anche il segmento
+        """
+        self.header = self.x = self.y = self.t = self.channel = None
+        self.shm.close()
+
+        if self.owner:
+            self.shm.unlink()
+            created_here.discard(self.shm.name)
+
+
+def validate(shm):
+    """
+    Solleva ValueError se il segmento non contiene un SharedRing valido
+    """
+    if shm.size < HEADER_SIZE:
+        raise ValueError(f"Segmento troppo piccolo per un ring: {shm.size} byte")
+
+    header = np.ndarray(HEADER_SIZE // 8, dtype=np.uint64, buffer=shm.buf)
+    magic, capacity = int(header[MAGIC]), int(header[CAPACITY])
+
+    # Nessuna vista deve restare sul buffer, altrimenti close() fallisce
+    del header
+
+    if magic != RING_MAGIC:
+        raise ValueError("Il segmento non è un SharedRing")
+
+    if capacity <= 0 or shm.size < HEADER_SIZE + capacity * RECORD_SIZE:
+        raise ValueError(f"Capacità del ring non valida: {capacity}")
+
+
+def attach(name, track=False):
+    """
+    Apre un segmento esistente senza registrarlo nel resource tracker: lo
+    elimina solo il processo che l'ha creato, non chi vi si collega.
+
+    Un processo figlio avviato con spawn condivide il resource tracker del
+    padre, dove il segmento è già registrato: in quel caso va passato
+    track=True, altrimenti la deregistrazione cancellerebbe quella del padre.
+    Lo stesso vale per i segmenti creati dal processo stesso.
+    """
+    if sys.version_info >= (3, 13):
+        return shared_memory.SharedMemory(name=name, track=track)
+
+    shm = shared_memory.SharedMemory(name=name)
+
+    if not track and shm.name not in created_here:
+        resource_tracker.unregister(shm._name, "shared_memory")
+
+    return shm
@@ -0,0 +1,127 @@
+"""
+===============================================================================
+ Project:      Python Graph Plotter
+ File:         streamIndex.py
+ Author:       Matteo Franchini
+ Created:      17/10/2026
+ License:      MIT License (c) 2025 Matteo Franchini
+ Repository:   https://github.com/MatteoFranchini01/python_graph_plotter
+===============================================================================
+ MIT License
+
+ Copyright (c) 2025 Matteo Franchini
+
+ Permission is hereby granted, free of charge, to any person obtaining a copy
+ of this software and associated documentation files (the "Software"), to deal
+ in the Software without restriction, including without limitation the rights
+ to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+ copies of the Software, and to permit persons to whom the Software is
+ furnished to do so, subject to the following conditions:
+
+ The above copyright notice and this permission notice shall be included in
+ all copies or substantial portions of the Software.
+
+ THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+ IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+ FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+ AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+ LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING
+ FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS
+ IN THE SOFTWARE.
+===============================================================================
+"""
+
+import threading
+
+import numpy as np
+
+
+class StreamIndex:
+    """
+    Mantiene crescente e continuo l'asse X di ogni variabile.
+
+    Il server numera i campioni dall'avvio: dopo un suo riavvio (o una
+    riconnessione a un server ripartito) gli indici tornano a 0 e, aggiunti
+    ai dati già presenti, farebbero tornare indietro la X. Quando un
+    campione ha un indice minore del successivo atteso, gli indici da lì in
+    poi vengono spostati per proseguire la storia esistente.
+
+    Quando invece gli indici saltano in avanti (blocchi scartati da un ring
+    pieno, trasporto in memoria condivisa che non passa da ReorderBuffer)
+    mancano dei campioni. In entrambi i casi un campione NaN interrompe la
+    curva, come fa ReorderBuffer per i datagrammi persi; se il salto è già
+    delimitato da un NaN non se ne aggiunge un altro. Registrazione, alert e
+    modelli ricevono così gli stessi indici, sempre crescenti.
+
+    apply() può essere chiamato sia dal thread di ricezione UDP sia dal
+    thread principale (ring condivisi).
+    """
+
+    def __init__(self):
+        self.lock = threading.Lock()
+
+        self.offsets = {}   # Variabile -> spostamento sommato agli indici del server
+        self.expected = {}  # Variabile -> X atteso del prossimo campione
+        self.finite = {}    # Variabile -> ultimo valore consegnato non NaN
+
+    def apply(self, blocks):
+        """
+        Restituisce i blocchi {variabile: (X, valori, istanti)} con gli indici riallineati
+        """
+        with self.lock:
+            return {variable: self.follow(variable, *block) for variable, block in blocks.items()}
+
+    def follow(self, variable, x_data, y_data, timestamps):
+        if not len(x_data):
+            return x_data, y_data, timestamps
+
+        offset = self.offsets.get(variable, 0.0)
+        expected = self.expected.get(variable)
+        finite = self.finite.get(variable, False)
+
+        # Punti in cui gli indici non proseguono di uno all'interno del blocco (più frame letti insieme da un ring)
+        jumps = np.flatnonzero(x_data[1:] != x_data[:-1] + 1) + 1
+
+        # Caso comune: indici consecutivi al blocco precedente, il blocco passa senza copie
+        if not len(jumps) and (expected is None or x_data[0] + offset == expected):
+            if offset:
+                x_data = x_data + offset
+
+            self.expected[variable] = x_data[-1] + 1
+            self.finite[variable] = y_data[-1] == y_data[-1]
+
+            return x_data, y_data, timestamps
+
+        bounds = [0, *jumps.tolist(), len(x_data)]
+        xs, ys, ts = [], [], []
+
+        for begin, end in zip(bounds[:-1], bounds[1:]):
+            first = x_data[begin] + offset
+
+            if begin > 0:
+                finite = y_data[begin - 1] == y_data[begin - 1]
+
+            if expected is not None and first != expected:
+                # Un NaN su uno dei due lati interrompe già la curva
+                separate = bool(finite and y_data[begin] == y_data[begin])
+
+                if separate:
+                    xs.append([expected])
+                    ys.append([np.nan])
+                    ts.append(timestamps[begin:begin + 1])
+
+                # Nuovo flusso: prosegue dopo la storia esistente e l'eventuale NaN
+                if first < expected:
+                    offset += expected + separate - first
+
+            xs.append(x_data[begin:end] + offset)
+            ys.append(y_data[begin:end])
+            ts.append(timestamps[begin:end])
+
+            expected = xs[-1][-1] + 1
+
+        self.offsets[variable] = offset
+        self.expected[variable] = expected
+        self.finite[variable] = y_data[-1] == y_data[-1]
+
+        return np.concatenate(xs), np.concatenate(ys), np.concatenate(ts)
@@ -0,0 +1,306 @@
+"""
+===============================================================================
+ Project:      Python Graph Plotter
+ File:         udpReceiver.py
+ Author:       Matteo Franchini
+ Created:      17/10/2026
+ License:      MIT License (c) 2025 Matteo Franchini
+ Repository:   https://github.com/MatteoFranchini01/python_graph_plotter
+===============================================================================
+ MIT License
+
+ Copyright (c) 2025 Matteo Franchini
+
+ Permission is hereby granted, free of charge, to any person obtaining a copy
+ of this software and associated documentation files (the "Software"), to deal
+ in the Software without restriction, including without limitation the rights
+ to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+ copies of the Software, and to permit persons to whom the Software is
+ furnished to do so, subject to the following conditions:
+
+ The above copyright notice and this permission notice shall be included in
+ all copies or substantial portions of the Software.
+
+ THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+ IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+ FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+ AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+ LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING
+ FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS
+ IN THE SOFTWARE.
+===============================================================================
+"""
+
+import selectors
+import socket
+import struct
+import sys
+import threading
+import time
+
+import numpy as np
+
+from src.metrics.registry import REGISTRY
+from src.network.protocol import decode_frame, decode_text, is_binary
+from src.network.reorderBuffer import ReorderBuffer
+
+# Opzione Linux che allega a ogni datagramma il numero di datagrammi scartati dal socket
+# per buffer pieno (non esposta dal modulo socket)
+SO_RXQ_OVFL = getattr(socket, "SO_RXQ_OVFL", 40 if sys.platform.startswith("linux") else None)
+
+
+class UdpReceiver:
+    """
+    Ricevitore UDP su thread dedicato, senza attesa attiva.
+
+    Il thread resta bloccato su un selector (con timeout, per potersi fermare)
+    e a ogni risveglio svuota tutti i datagrammi in coda. I campioni dello
+    stesso canale vengono concatenati e consegnati con una sola chiamata a
+    on_blocks({channel: (x_data, y_data, timestamps)}) per risveglio, per
+    tutti i canali.
+
+    I messaggi testuali non hanno indici né istanti di acquisizione: X viene
+    assegnata con un contatore per canale, come faceva il vecchio
+    ricevitore, e l'istante è quello di ricezione.
+
+    I frame binari di ogni canale passano da una ReorderBuffer, che li
+    rimette in ordine, conta persi e riordinati e interrompe la curva con un
+    NaN sui campioni mancanti. Su Linux il kernel riporta anche i datagrammi
+    scartati perché il buffer del socket era pieno (overrun del client): la
+    differenza tra persi e overrun è la perdita avvenuta in rete.
+    """
+
+    def __init__(self, host, port, on_blocks, variables=(), recv_buffer_size=4 * 1024 * 1024,
+                 timeout=0.2, max_datagrams=4096, reorder_window=32, reorder_timeout=0.05, registry=REGISTRY):
+        self.host = host
+        self.port = port
+        self.on_blocks = on_blocks
+        self.variables = list(variables)            # Nome delle variabili, indicizzate per canale
+        self.recv_buffer_size = recv_buffer_size    # SO_RCVBUF richiesto al kernel
+        self.timeout = timeout                      # Secondi massimi di blocco sul selector
+        self.max_datagrams = max_datagrams          # Datagrammi massimi per risveglio
+        self.reorder_window = reorder_window        # Frame in attesa oltre i quali un buco è una perdita
+        self.reorder_timeout = reorder_timeout      # Secondi di attesa massima di un frame mancante
+
+        self.text_counters = {}
+        self.reorder_buffers = {}
+        self.reset_requested = False
+        self.registry = registry
+
+        # Metriche del ricevitore
+        self.datagrams = registry.counter("receiver.datagrams")
+        self.bytes_received = registry.counter("receiver.bytes")
+        self.samples = registry.counter("receiver.samples")
+        self.wakeups = registry.counter("receiver.wakeups")
+        self.parse_errors = registry.counter("receiver.parse_errors")
+        self.overrun = registry.counter("receiver.overrun")
+        self.drain_time = registry.histogram("receiver.drain")
+        self.parse_time = registry.histogram("receiver.parse")
+
+        self.running = False
+        self.thread = None
+
+        self.sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+
+        if self.recv_buffer_size:
+            self.sock.setsockopt(socket.SOL_SOCKET, socket.SO_RCVBUF, self.recv_buffer_size)
+
+        try:
+            self.sock.bind((self.host, self.port))
+
+        except OSError:
+            # Porta già occupata (ad esempio da un altro viewer): ne usa una libera
+            self.sock.bind((self.host, 0))
+
+        # Porta effettiva, da comunicare al server con il comando UDP
+        self.port = self.sock.getsockname()[1]
+        self.sock.setblocking(False)
+
+        # Contatore cumulativo di overrun del kernel, se disponibile
+        self.overflow_option = None
+        self.kernel_drops = 0
+
+        if SO_RXQ_OVFL is not None and hasattr(self.sock, "recvmsg"):
+            try:
+                self.sock.setsockopt(socket.SOL_SOCKET, SO_RXQ_OVFL, 1)
+                self.overflow_option = SO_RXQ_OVFL
+
+            except OSError:
+                pass
+
+    def start(self):
+        self.running = True
+
+        self.thread = threading.Thread(target=self.run, daemon=True)
+        self.thread.start()
+
+    def stop(self):
+        """
+        Ferma il thread (al più entro timeout secondi) e chiude il socket
+        """
+        self.running = False
+
+        if self.thread is not None:
+            self.thread.join()
+            self.thread = None
+
+        self.sock.close()
+
+    def reset_sequences(self):
+        """
+        Chiede al thread di ripartire dalla numerazione dei frame del prossimo frame di
+        ogni canale: il server numera i frame per connessione, quindi va chiamato a ogni nuova connessione
+        """
+        self.reset_requested = True
+
+    def run(self):
+        selector = selectors.DefaultSelector()
+        selector.register(self.sock, selectors.EVENT_READ)
+
+        try:
+            while self.running:
+                # Con frame in attesa di riordino ci si risveglia in tempo per dichiararne la perdita
+                waiting = any(buffer.pending for buffer in self.reorder_buffers.values())
+
+                if not selector.select(self.reorder_timeout if waiting else self.timeout):
+                    if waiting:
+                        self.dispatch([])
+
+                    continue
+
+                start = time.perf_counter()
+                datagrams = self.drain()
+                self.drain_time.record(time.perf_counter() - start)
+
+                self.wakeups.add()
+                self.dispatch(datagrams)
+
+        finally:
+            selector.close()
+
+    def drain(self):
+        """
+        Legge tutti i datagrammi disponibili senza bloccare
+        """
+        datagrams = []
+
+        if self.overflow_option is None:
+            while len(datagrams) < self.max_datagrams:
+                try:
+                    datagrams.append(self.sock.recv(65535))
+
+                except (BlockingIOError, InterruptedError):
+                    break
+
+            return datagrams
+
+        ancillary_size = socket.CMSG_SPACE(4)
+        drops = None
+
+        while len(datagrams) < self.max_datagrams:
+            try:
+                data, ancillary, _, _ = self.sock.recvmsg(65535, ancillary_size)
+
+            except (BlockingIOError, InterruptedError):
+                break
+
+            datagrams.append(data)
+
+            # Il contatore arriva solo sui datagrammi accodati dopo almeno uno scarto
+            for level, kind, payload in ancillary:
+                if level == socket.SOL_SOCKET and kind == self.overflow_option and len(payload) >= 4:
+                    drops = struct.unpack("=I", payload[:4])[0]
+
+        if drops is not None and drops > self.kernel_drops:
+            self.overrun.add(drops - self.kernel_drops)
+            self.kernel_drops = drops
+
+        return datagrams
+
+    def dispatch(self, datagrams):
+        """
+        Decodifica i datagrammi e consegna un blocco per canale
+        """
+        start = time.perf_counter()
+
+        parts_by_channel = {}
+        size = 0
+
+        # I frame ancora in attesa appartengono alla connessione precedente: si consegnano prima di ripartire
+        if self.reset_requested:
+            self.reset_requested = False
+
+            for channel, buffer in self.reorder_buffers.items():
+                parts = buffer.release(start, flush=True)
+
+                if parts:
+                    parts_by_channel.setdefault(channel, []).extend(parts)
+
+                buffer.reset()
+
+        for data in datagrams:
+            size += len(data)
+
+            try:
+                if is_binary(data):
+                    frame = decode_frame(data)
+                    buffer = self.reorder_buffers.get(frame.channel)
+
+                    if buffer is None:
+                        buffer = self.new_reorder_buffer(frame.channel)
+
+                    parts = buffer.push(frame, start)
+
+                    if parts:
+                        parts_by_channel.setdefault(frame.channel, []).extend(parts)
+
+                else:
+                    name, value = decode_text(data)
+                    channel = self.variables.index(name)
+
+                    x = self.text_counters.get(channel, 0)
+                    self.text_counters[channel] = x + 1
+
+                    parts_by_channel.setdefault(channel, []).append((np.array([x], dtype=np.float64), np.array([value]),
+                                                                     np.array([time.time()])))
+
+            except ValueError:
+                self.parse_errors.add()
+                print(f"Errore nella conversione del valore: {data[:64]}")
+
+        # Frame in attesa da troppo tempo: i mancanti sono persi, si consegnano i successivi
+        for channel, buffer in self.reorder_buffers.items():
+            if buffer.pending:
+                parts = buffer.release(start)
+
+                if parts:
+                    parts_by_channel.setdefault(channel, []).extend(parts)
+
+        blocks = {}
+
+        for channel, parts in parts_by_channel.items():
+            if len(parts) == 1:
+                x_data, y_data, timestamps = parts[0]
+
+            else:
+                x_data = np.concatenate([part[0] for part in parts])
+                y_data = np.concatenate([part[1] for part in parts])
+                timestamps = np.concatenate([part[2] for part in parts])
+
+            blocks[channel] = (x_data, y_data.astype(np.float64, copy=False), timestamps)
+            self.samples.add(len(y_data))
+
+        self.datagrams.add(len(datagrams))
+        self.bytes_received.add(size)
+        self.parse_time.record(time.perf_counter() - start)
+
+        if blocks:
+            self.on_blocks(blocks)
+
+    def new_reorder_buffer(self, channel):
+        name = self.variables[channel] if channel < len(self.variables) else f"channel{channel}"
+
+        buffer = ReorderBuffer(self.registry, name, self.reorder_window, self.reorder_timeout)
+        self.reorder_buffers[channel] = buffer
+
+        return buffer
@@ -0,0 +1,283 @@
+"""
+===============================================================================
+ Project:      Python Graph Plotter
+ File:         exporter.py
+ Author:       Matteo Franchini
+ Created:      17/10/2026
+ License:      MIT License (c) 2025 Matteo Franchini
+ Repository:   https://github.com/MatteoFranchini01/python_graph_plotter
+===============================================================================
+ MIT License
+
+ Copyright (c) 2025 Matteo Franchini
+
+ Permission is hereby granted, free of charge, to any person obtaining a copy
+ of this software and associated documentation files (the "Software"), to deal
+ in the Software without restriction, including without limitation the rights
+ to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+ copies of the Software, and to permit persons to whom the Software is
+ furnished to do so, subject to the following conditions:
+
+ The above copyright notice and this permission notice shall be included in
+ all copies or substantial portions of the Software.
+
+ THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+ IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+ FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+ AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+ LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING
+ FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS
+ IN THE SOFTWARE.
+===============================================================================
+"""
+
+import json
+import os
+import threading
+import zipfile
+
+import numpy as np
+
+# Formati di esportazione, scelti in base all'estensione del file
+FORMATS = {".csv": "csv", ".npz": "npz", ".pgc": "columnar"}
+
+# File colonnare: magic, colonne float64 contigue, footer JSON, lunghezza del footer e di nuovo il magic
+COLUMNAR_MAGIC = b"PGCOL1\x00\x00"
+COLUMNAR_VERSION = 1
+
+CHUNK_SIZE = 1 << 20
+
+
+class ExportCancelled(Exception):
+    pass
+
+
+def snapshot(models):
+    """
+    Fotografa i dati dei modelli come viste senza copia.
+
+    Va chiamata dal thread che aggiorna i modelli: i buffer di ModelData
+    vengono solo estesi oltre la fine o sostituiti da buffer nuovi, quindi le
+    viste restano valide e immutate mentre l'esportazione procede.
+    """
+    return {name: model.get_data() for name, model in models.items() if len(model)}
+
+
+def export_format(path):
+    """
+    Formato corrispondente all'estensione di path
+    """
+    extension = os.path.splitext(path)[1].lower()
+
+    if extension not in FORMATS:
+        raise ValueError(f"Formato di esportazione non supportato: {extension or path}")
+
+    return FORMATS[extension]
+
+
+def chunks(count, chunk_size):
+    for begin in range(0, count, chunk_size):
+        yield begin, min(begin + chunk_size, count)
+
+
+def csv_field(text):
+    """
+    Campo CSV quotato se necessario, con i % raddoppiati per l'uso come formato
+    """
+    if any(char in text for char in ',"\n\r'):
+        text = '"' + text.replace('"', '""') + '"'
+
+    return text.replace("%", "%%")
+
+
+def write_csv(file, data, progress, chunk_size=CHUNK_SIZE):
+    """
+    Scrive un CSV in formato lungo (variable, x, y) un blocco alla volta.
+
+    La formattazione testuale resta legata all'interprete (circa un milione
+    di righe al secondo): il CSV è il formato di compatibilità, per i grandi
+    volumi ci sono npz e colonnare.
+    """
+    file.write(b"variable,x,y\n")
+
+    for name, (x_data, y_data) in data.items():
+        row = f"{csv_field(name)},%.17g,%.17g\n"
+
+        for begin, end in chunks(len(y_data), chunk_size // 4):
+            rows = np.empty((end - begin, 2), dtype=np.float64)
+            rows[:, 0] = x_data[begin:end]
+            rows[:, 1] = y_data[begin:end]
+
+            file.write(((row * (end - begin)) % tuple(rows.ravel().tolist())).encode())
+            progress(end - begin)
+
+
+def write_column(file, column, progress, chunk_size=CHUNK_SIZE):
+    """
+    Scrive una colonna come float64 little-endian grezzi, direttamente dalla vista
+    """
+    for begin, end in chunks(len(column), chunk_size):
+        file.write(np.ascontiguousarray(column[begin:end], dtype="<f8").data)
+        progress((end - begin) / 2)
+
+
+def write_npz(file, data, progress, chunk_size=CHUNK_SIZE):
+    """
+    Scrive un archivio .npz non compresso (leggibile con np.load) in streaming:
+    ogni array riceve l'header .npy e poi i dati a blocchi
+    """
+    with zipfile.ZipFile(file, "w", zipfile.ZIP_STORED, allowZip64=True) as archive:
+        for name, columns in data.items():
+            for column_name, column in zip(("x", "y"), columns):
+                with archive.open(f"{name}/{column_name}.npy", "w", force_zip64=True) as entry:
+                    header = {"descr": "<f8", "fortran_order": False, "shape": (len(column),)}
+                    np.lib.format.write_array_header_1_0(entry, header)
+                    write_column(entry, column, progress, chunk_size)
+
+
+def write_columnar(file, data, progress, chunk_size=CHUNK_SIZE):
+    """
+    Scrive il formato colonnare: le colonne x e y di ogni variabile una dopo
+    l'altra e in coda un footer JSON con posizione e lunghezza di ognuna,
+    così la lettura può mappare le colonne senza copiarle (come in Parquet)
+    """
+    file.write(COLUMNAR_MAGIC)
+    offset = len(COLUMNAR_MAGIC)
+    columns = []
+
+    for name, (x_data, y_data) in data.items():
+        for column_name, column in (("x", x_data), ("y", y_data)):
+            write_column(file, column, progress, chunk_size)
+
+            columns.append({"variable": name, "column": column_name, "offset": offset,
+                            "count": len(column), "dtype": "<f8"})
+            offset += len(column) * 8
+
+    footer = json.dumps({"version": COLUMNAR_VERSION, "columns": columns}).encode()
+
+    file.write(footer)
+    file.write(np.array([len(footer)], dtype="<u8").tobytes())
+    file.write(COLUMNAR_MAGIC)
+
+
+def read_columnar(path):
+    """
+    Mappa un file colonnare e restituisce {variabile: (x, y)} senza copiare i dati
+    """
+    with open(path, "rb") as file:
+        file.seek(-16, os.SEEK_END)
+        trailer = file.read(16)
+
+        if trailer[8:] != COLUMNAR_MAGIC:
+            raise ValueError(f"File colonnare non valido: {path}")
+
+        footer_size = int(np.frombuffer(trailer[:8], dtype="<u8")[0])
+        file.seek(-16 - footer_size, os.SEEK_END)
+        footer = json.loads(file.read(footer_size))
+
+    if footer["version"] != COLUMNAR_VERSION:
+        raise ValueError(f"Versione del file colonnare non supportata: {footer['version']}")
+
+    data = {}
+
+    for column in footer["columns"]:
+        if column["count"]:
+            values = np.memmap(path, dtype=column["dtype"], mode="r", offset=column["offset"], shape=(column["count"],))
+
+        else:
+            values = np.empty(0, dtype=column["dtype"])
+
+        data.setdefault(column["variable"], {})[column["column"]] = values
+
+    return {name: (columns["x"], columns["y"]) for name, columns in data.items()}
+
+
+WRITERS = {"csv": write_csv, "npz": write_npz, "columnar": write_columnar}
+
+
+def export(data, path, fmt=None, progress=None, chunk_size=CHUNK_SIZE):
+    """
+    Scrive data ({variabile: (x, y)}) in path nel formato fmt (dedotto
+    dall'estensione se None). Il file viene scritto accanto con suffisso
+    .part e rinominato solo a esportazione completata.
+
+    progress(samples) viene chiamata dopo ogni blocco con i campioni scritti;
+    se solleva ExportCancelled il file parziale viene eliminato.
+    """
+    writer = WRITERS[fmt or export_format(path)]
+    partial = path + ".part"
+
+    try:
+        with open(partial, "wb") as file:
+            writer(file, data, progress or (lambda samples: None), chunk_size)
+
+        os.replace(partial, path)
+
+    except BaseException:
+        if os.path.exists(partial):
+            os.remove(partial)
+
+        raise
+
+
+class ExportWorker:
+    """
+    Esegue export su un thread separato.
+
+    Le viste dello snapshot vengono solo lette, quindi ricezione e grafico
+    continuano ad aggiornare i modelli durante la scrittura. on_progress
+    riceve la frazione completata (al più una volta per blocco) e
+    on_finished il percorso e l'eventuale errore, entrambe dal thread di
+    esportazione.
+    """
+
+    def __init__(self, data, path, fmt=None, on_progress=None, on_finished=None, chunk_size=CHUNK_SIZE):
+        self.data = data
+        self.path = path
+        self.fmt = fmt or export_format(path)
+        self.on_progress = on_progress
+        self.on_finished = on_finished
+        self.chunk_size = chunk_size
+
+        self.total = sum(len(y_data) for _, y_data in data.values())
+        self.written = 0
+
+        self.stop_event = threading.Event()
+        self.thread = None
+
+    def start(self):
+        self.thread = threading.Thread(target=self.run, daemon=True)
+        self.thread.start()
+
+    def stop(self):
+        """
+        Annulla l'esportazione; il file parziale viene eliminato
+        """
+        self.stop_event.set()
+
+        if self.thread is not None:
+            self.thread.join(timeout=5.0)
+
+    def progress(self, samples):
+        if self.stop_event.is_set():
+            raise ExportCancelled()
+
+        self.written += samples
+
+        if self.on_progress is not None:
+            self.on_progress(self.written / self.total if self.total else 1.0)
+
+    def run(self):
+        error = None
+
+        try:
+            export(self.data, self.path, self.fmt, self.progress, self.chunk_size)
+
+        except ExportCancelled:
+            error = "Esportazione annullata"
+
+        except (OSError, ValueError) as exc:
+            error = str(exc)
+
+        if self.on_finished is not None:
+            self.on_finished(self.path, error)
@@ -0,0 +1,364 @@
+"""
+===============================================================================
+ Project:      Python Graph Plotter
+ File:         recorder.py
+ Author:       Matteo Franchini
+ Created:      17/10/2026
+ License:      MIT License (c) 2025 Matteo Franchini
+ Repository:   https://github.com/MatteoFranchini01/python_graph_plotter
+===============================================================================
+ MIT License
+
+ Copyright (c) 2025 Matteo Franchini
+
+ Permission is hereby granted, free of charge, to any person obtaining a copy
+ of this software and associated documentation files (the "Software"), to deal
+ in the Software without restriction, including without limitation the rights
+ to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+ copies of the Software, and to permit persons to whom the Software is
+ furnished to do so, subject to the following conditions:
+
+ The above copyright notice and this permission notice shall be included in
+ all copies or substantial portions of the Software.
+
+ THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+ IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+ FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+ AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+ LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING
+ FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS
+ IN THE SOFTWARE.
+===============================================================================
+"""
+
+import json
+import os
+
+import numpy as np
+
+from src.model.ModelData import ModelData
+from src.model.lodPyramid import LodPyramid
+from src.model.statistics import RollingStatistics
+
+# Header di un canale registrato: magic, versione, campioni validi, capacità dei file colonna
+HEADER_DTYPE = np.dtype([("magic", "S8"), ("version", "<u4"), ("reserved", "<u4"),
+                         ("count", "<u8"), ("capacity", "<u8")])
+HEADER_MAGIC = b"PGREC"
+HEADER_VERSION = 1
+
+# Colonne di un canale: indice assoluto del campione (asse X), istante di acquisizione, valore.
+# Il numero di sequenza dei frame non viene registrato (vedi ChannelRecording)
+COLUMNS = ("index", "timestamp", "value")
+
+INDEX_FILE = "index.json"
+
+
+class ChannelRecording:
+    """
+    Registrazione append-only di un canale su file mappati in memoria.
+
+    Ogni colonna è un file di float64 little-endian grezzi, preallocato e
+    ingrandito raddoppiando; il file .hdr contiene il numero di campioni
+    validi. Un append copia i dati nelle mappe e solo dopo aggiorna il
+    contatore, quindi dopo un crash del processo i campioni già contati sono
+    integri (sono nella page cache del kernel).
+
+    Al posto del numero di sequenza dei frame viene registrato l'indice
+    assoluto di ogni campione: il registratore riceve i blocchi già
+    riordinati dalla ReorderBuffer (la sequenza non arriva fin qui, e con
+    la memoria condivisa non esiste), mentre l'indice conserva la posizione
+    di ogni campione. Le perdite restano visibili dopo la registrazione come
+    salti dell'indice, preceduti dal campione NaN inserito dal ricevitore;
+    riordini e perdite per canale sono contati dalle metriche del ricevitore.
+
+    In scrittura vengono aggiornate anche la piramide min/max/media e le
+    statistiche di sessione del canale, salvate in .lod.npz e .stats.npz alla
+    chiusura: chi riapre la registrazione le carica invece di rileggere tutti
+    i campioni. Un file con un numero di campioni diverso (ad esempio dopo un
+    crash) viene ignorato.
+    """
+
+    def __init__(self, directory, prefix, writable=False, initial_capacity=1 << 16):
+        self.directory = directory
+        self.prefix = prefix
+        self.writable = writable
+
+        header_path = self.path("hdr")
+
+        if writable and not os.path.exists(header_path):
+            header = np.zeros(1, dtype=HEADER_DTYPE)
+            header["magic"] = HEADER_MAGIC
+            header["version"] = HEADER_VERSION
+            header.tofile(header_path)
+
+        self.header = np.memmap(header_path, dtype=HEADER_DTYPE, mode="r+" if writable else "r", shape=(1,))
+
+        if self.header["magic"][0] != HEADER_MAGIC or self.header["version"][0] != HEADER_VERSION:
+            raise ValueError(f"Header di registrazione non valido: {header_path}")
+
+        self.columns = {}
+        self.lod = None
+        self.stats = None
+
+        if writable:
+            self.map_columns(max(int(self.header["capacity"][0]), initial_capacity))
+
+            # Una registrazione ripresa continua piramide e statistiche salvate, o le ricostruisce
+            self.lod = self.load_lod() or build_lod(*self.arrays()[::2])
+            self.stats = self.load_stats() or build_stats(self.arrays()[2])
+
+        else:
+            self.map_columns(int(self.header["count"][0]))
+
+    def path(self, suffix):
+        return os.path.join(self.directory, f"{self.prefix}.{suffix}")
+
+    @property
+    def count(self):
+        return int(self.header["count"][0])
+
+    def map_columns(self, capacity):
+        """
+        Mappa (ed eventualmente ingrandisce) i file colonna a capacity campioni
+        """
+        for column in COLUMNS:
+            path = self.path(f"{column}.f8")
+
+            if self.writable:
+                with open(path, "ab") as file:
+                    if file.tell() < capacity * 8:
+                        file.truncate(capacity * 8)
+
+            if capacity == 0:
+                self.columns[column] = np.empty(0, dtype="<f8")
+
+            else:
+                self.columns[column] = np.memmap(path, dtype="<f8", mode="r+" if self.writable else "r", shape=(capacity,))
+
+        if self.writable:
+            self.header["capacity"] = capacity
+
+    def append(self, x_data, y_data, timestamps):
+        """
+        Accoda un blocco di campioni; il contatore viene aggiornato per ultimo
+        """
+        count = self.count
+        size = len(y_data)
+
+        if count + size > len(self.columns["value"]):
+            self.map_columns(2 * (count + size))
+
+        self.columns["index"][count:count + size] = x_data
+        self.columns["timestamp"][count:count + size] = timestamps
+        self.columns["value"][count:count + size] = y_data
+
+        self.header["count"] = count + size
+
+        # Le statistiche tengono i blocchi in attesa senza copiarli: ricevono la colonna appena
+        # scritta, mai sovrascritta, e non y_data, che può essere una vista su memoria riutilizzata
+        # dal chiamante (ad esempio il ring condiviso)
+        values = self.columns["value"][count:count + size]
+
+        self.lod.extend(self.columns["index"][count:count + size], values)
+        self.stats.extend(values)
+
+    def load_lod(self):
+        """
+        Piramide salvata con la registrazione, se corrisponde ai campioni registrati, altrimenti None
+        """
+        path = self.path("lod.npz")
+
+        if not os.path.exists(path):
+            return None
+
+        try:
+            lod = LodPyramid.load(path)
+
+        except (OSError, ValueError, KeyError):
+            return None
+
+        return lod if lod.count == self.count else None
+
+    def save_lod(self, lod):
+        self.lod = lod
+        lod.save(self.path("lod.npz"))
+
+    def load_stats(self):
+        """
+        Statistiche salvate con la registrazione, se corrispondono ai campioni registrati, altrimenti None
+        """
+        path = self.path("stats.npz")
+
+        if not os.path.exists(path):
+            return None
+
+        try:
+            stats = RollingStatistics.load(path)
+
+        except (OSError, ValueError, KeyError):
+            return None
+
+        return stats if stats.samples == self.count else None
+
+    def save_stats(self, stats):
+        self.stats = stats
+        stats.save(self.path("stats.npz"))
+
+    def arrays(self):
+        """
+        Restituisce (index, timestamp, value) come viste sui file mappati, senza copia
+        """
+        count = self.count
+
+        return tuple(self.columns[column][:count] for column in COLUMNS)
+
+    def flush(self):
+        """
+        Forza la scrittura su disco (protegge anche da un crash del sistema)
+        """
+        for column in self.columns.values():
+            if isinstance(column, np.memmap):
+                column.flush()
+
+        self.header.flush()
+
+    def close(self):
+        if self.writable:
+            self.flush()
+            self.save_lod(self.lod)
+            self.save_stats(self.stats)
+
+        self.columns = {}
+        self.header = None
+        self.lod = None
+        self.stats = None
+
+
+class SessionRecorder:
+    """
+    Registra i blocchi ricevuti di più canali in una directory di sessione.
+
+    index.json associa il nome di ogni variabile al prefisso dei suoi file.
+    """
+
+    def __init__(self, directory):
+        self.directory = directory
+        self.channels = {}
+
+        os.makedirs(directory, exist_ok=True)
+
+        self.index = read_index(directory) if os.path.exists(os.path.join(directory, INDEX_FILE)) else {"version": 1, "channels": {}}
+
+    def append(self, name, x_data, y_data, timestamps):
+        """
+        Accoda un blocco al canale name, creandolo al primo utilizzo
+        """
+        recording = self.channels.get(name)
+
+        if recording is None:
+            recording = self.open_channel(name)
+
+        recording.append(x_data, y_data, timestamps)
+
+    def open_channel(self, name):
+        entry = self.index["channels"].get(name)
+
+        if entry is None:
+            entry = {"prefix": f"ch{len(self.index['channels']):03d}"}
+            self.index["channels"][name] = entry
+            self.write_index()
+
+        recording = ChannelRecording(self.directory, entry["prefix"], writable=True)
+        self.channels[name] = recording
+
+        return recording
+
+    def write_index(self):
+        """
+        Riscrive index.json in modo atomico
+        """
+        path = os.path.join(self.directory, INDEX_FILE)
+
+        with open(path + ".tmp", "w") as file:
+            json.dump(self.index, file, indent=2)
+
+        os.replace(path + ".tmp", path)
+
+    def flush(self):
+        for recording in self.channels.values():
+            recording.flush()
+
+    def close(self):
+        for recording in self.channels.values():
+            recording.close()
+
+        self.channels = {}
+
+
+def read_index(directory):
+    with open(os.path.join(directory, INDEX_FILE)) as file:
+        return json.load(file)
+
+
+def open_session(directory):
+    """
+    Apre una sessione registrata in sola lettura: {nome variabile: ChannelRecording}
+    """
+    index = read_index(directory)
+
+    return {name: ChannelRecording(directory, entry["prefix"]) for name, entry in index["channels"].items()}
+
+
+def build_lod(x_data, y_data, step=1 << 20):
+    """
+    Costruisce a blocchi la piramide di campioni già registrati
+    """
+    lod = LodPyramid()
+
+    for begin in range(0, len(y_data), step):
+        lod.extend(x_data[begin:begin + step], y_data[begin:begin + step])
+
+    return lod
+
+
+def build_stats(y_data, step=1 << 20):
+    """
+    Calcola a blocchi le statistiche di sessione di campioni già registrati
+    """
+    stats = RollingStatistics()
+
+    for begin in range(0, len(y_data), step):
+        stats.extend(y_data[begin:begin + step])
+
+    stats.flush()
+
+    return stats
+
+
+def load_session(directory):
+    """
+    Mappa una sessione registrata in ModelData senza copiare né interpretare
+    i campioni. Piramide e statistiche salvate con la registrazione vengono
+    riusate; se mancano (registrazioni precedenti o interrotte) vengono
+    ricalcolate e salvate per le aperture successive, se la directory è scrivibile.
+    """
+    models = {}
+
+    for name, recording in open_session(directory).items():
+        x_data, timestamps, y_data = recording.arrays()
+        lod = recording.load_lod()
+        stats = recording.load_stats()
+
+        model = models[name] = ModelData.from_arrays(x_data, y_data, lod=lod, stats=stats)
+
+        try:
+            if lod is None:
+                recording.save_lod(model.lod)
+
+            if model.stats is not stats:
+                recording.save_stats(model.stats)
+
+        except OSError:
+            pass
+
+    return models
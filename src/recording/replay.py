@@ -0,0 +1,299 @@
+"""
+===============================================================================
+ Project:      Python Graph Plotter
+ File:         replay.py  
+ Author:       Matteo Franchini
+ Created:      17/10/2026
+ License:      MIT License (c) 2025 Matteo Franchini
+ Repository:   https://github.com/MatteoFranchini01/python_graph_plotter
+===============================================================================
+ MIT License
+
+ Copyright (c) 2025 Matteo Franchini
+
+ Permission is hereby granted, free of charge, to any person obtaining a copy
+ of this software and associated documentation files (the "Software"), to deal
+ in the Software without restriction, including without limitation the rights
+ to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+ copies of the Software, and to permit persons to whom the Software is
+ furnished to do so, subject to the following conditions:
+
+ The above copyright notice and this permission notice shall be included in
+ all copies or substantial portions of the Software.
+
+ THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+ IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+ FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+ AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+ LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING
+ FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS
+ IN THE SOFTWARE.
+===============================================================================
+"""
+
+import argparse
+import os
+import threading
+import time
+
+import numpy as np
+
+from src.model.ModelData import ModelData
+from src.recording.recorder import open_session
+
+
+class ReplaySource:
+    """
+    Cursore su una sessione registrata che restituisce i campioni a blocchi.
+
+    Ogni blocco copre un intervallo di tempo registrato: interval * speed
+    secondi a velocità speed, fast_span secondi nella modalità più veloce
+    possibile (speed=None). I blocchi hanno la stessa forma di quelli di
+    UdpReceiver, {variabile: (X, valori, istanti)}, e sono viste sui file
+    mappati. Ogni canale avanza con un proprio cursore, quindi nessun campione
+    viene ripetuto o saltato tra un blocco e l'altro.
+    """
+
+    def __init__(self, directory, speed=1.0, interval=0.05, fast_span=1.0):
+        self.directory = directory
+        self.speed = speed          # Fattore di velocità; None = il più veloce possibile
+        self.interval = interval    # Secondi reali tra due blocchi nelle modalità a tempo
+        self.fast_span = fast_span  # Secondi registrati per blocco nella modalità più veloce
+
+        # Colonne (index, timestamp, value) di ogni variabile registrata
+        self.columns = {name: recording.arrays() for name, recording in open_session(directory).items()}
+        self.variables = list(self.columns)
+
+        bounds = [(timestamps[0], timestamps[-1]) for _, timestamps, _ in self.columns.values() if len(timestamps)]
+
+        self.start_time = min(first for first, _ in bounds) if bounds else 0.0
+        self.end_time = max(last for _, last in bounds) if bounds else 0.0
+
+        # Posizione in secondi dall'inizio della registrazione e prossimo campione di ogni canale
+        self.position = 0.0
+        self.cursors = dict.fromkeys(self.columns, 0)
+
+        # Richiesta di spostamento da un altro thread, applicata dal thread di riproduzione
+        self.lock = threading.Lock()
+        self.pending_seek = None
+
+    @property
+    def duration(self):
+        return self.end_time - self.start_time
+
+    @property
+    def finished(self):
+        return all(self.cursors[name] >= len(values) for name, (_, _, values) in self.columns.items())
+
+    @property
+    def span(self):
+        """
+        Secondi registrati coperti da un blocco
+        """
+        return self.fast_span if self.speed is None else self.interval * self.speed
+
+    def seek(self, position):
+        """
+        Richiede di riprendere la riproduzione da position secondi; thread-safe
+        """
+        with self.lock:
+            self.pending_seek = min(max(position, 0.0), self.duration)
+
+    def apply_seek(self):
+        """
+        Applica l'eventuale spostamento richiesto; restituisce True se la posizione è cambiata
+        """
+        with self.lock:
+            position, self.pending_seek = self.pending_seek, None
+
+        if position is None:
+            return False
+
+        self.position = position
+
+        for name, (_, timestamps, _) in self.columns.items():
+            self.cursors[name] = int(np.searchsorted(timestamps, self.start_time + position))
+
+        return True
+
+    def next_blocks(self):
+        """
+        Restituisce i campioni del prossimo intervallo e avanza il cursore
+        """
+        self.position += self.span
+        end = self.start_time + self.position
+
+        blocks = {}
+
+        for name, (x_data, timestamps, y_data) in self.columns.items():
+            begin = self.cursors[name]
+            stop = max(begin, int(np.searchsorted(timestamps, end)))
+
+            # Oltre la durata si svuota il canale anche con istanti non monotoni
+            if self.position > self.duration:
+                stop = len(timestamps)
+
+            if stop > begin:
+                blocks[name] = (x_data[begin:stop], y_data[begin:stop], timestamps[begin:stop])
+
+            self.cursors[name] = stop
+
+        return blocks
+
+
+class ReplayPlayer:
+    """
+    Riproduce un ReplaySource in un thread dedicato, consegnando ogni blocco a on_blocks.
+
+    Nelle modalità a tempo le scadenze sono assolute come nello scheduler del
+    server, quindi la velocità effettiva non deriva. on_seek viene chiamato
+    dal thread di riproduzione prima del primo blocco dopo uno spostamento:
+    chi riceve i blocchi tramite una coda li vede così nell'ordine giusto.
+    """
+
+    def __init__(self, source, on_blocks, on_seek=None, on_finished=None):
+        self.source = source
+        self.on_blocks = on_blocks
+        self.on_seek = on_seek
+        self.on_finished = on_finished
+
+        self.stop_event = threading.Event()
+        self.thread = None
+
+        # Contatori per misurare il throughput
+        self.samples_replayed = 0
+        self.blocks_replayed = 0
+
+    def start(self):
+        self.thread = threading.Thread(target=self.run, daemon=True)
+        self.thread.start()
+
+    def stop(self):
+        self.stop_event.set()
+
+        if self.thread is not None:
+            self.thread.join(timeout=1.0)
+
+    def run(self):
+        source = self.source
+        deadline = time.perf_counter()
+        notified = False
+
+        while not self.stop_event.is_set():
+            if source.apply_seek():
+                deadline = time.perf_counter()
+                notified = False
+
+                if self.on_seek is not None:
+                    self.on_seek(source.position)
+
+            if source.finished:
+                if not notified and self.on_finished is not None:
+                    self.on_finished()
+
+                notified = True
+
+                # A fine registrazione si resta in attesa di uno spostamento o dello stop
+                self.stop_event.wait(source.interval)
+                continue
+
+            blocks = source.next_blocks()
+
+            if blocks:
+                self.on_blocks(blocks)
+
+                self.blocks_replayed += 1
+                self.samples_replayed += sum(len(y_data) for _, y_data, _ in blocks.values())
+
+            if source.speed is None:
+                continue
+
+            deadline += source.interval
+            delay = deadline - time.perf_counter()
+
+            # Dopo una pausa lunga (es. sistema sospeso) ci si riallinea invece di inseguire
+            if delay < -1.0:
+                deadline = time.perf_counter()
+
+            elif delay > 0:
+                self.stop_event.wait(delay)
+
+
+def benchmark(directory, fast_span=1.0, plot=None, update_every=1):
+    """
+    Riproduce una sessione il più velocemente possibile nel thread chiamante,
+    accodando i campioni a nuovi ModelData e, se plot è un LivePlotWidget,
+    ridisegnandolo ogni update_every blocchi. Il risultato dipende solo dalla
+    registrazione, quindi è un benchmark ripetibile di ingestione e rendering.
+    """
+    source = ReplaySource(directory, speed=None, fast_span=fast_span)
+    models = {name: ModelData() for name in source.variables}
+
+    if plot is not None:
+        for name, model in models.items():
+            plot.add_series(name, model)
+
+    samples = 0
+    blocks_count = 0
+    ingest_seconds = 0.0
+    render_seconds = 0.0
+
+    while not source.finished:
+        blocks = source.next_blocks()
+
+        start = time.perf_counter()
+
+        for name, (x_data, y_data, _) in blocks.items():
+            models[name].add_block(x_data, y_data)
+            samples += len(y_data)
+
+        ingest_seconds += time.perf_counter() - start
+        blocks_count += 1
+
+        if plot is not None and blocks_count % update_every == 0:
+            start = time.perf_counter()
+            plot.update_plot()
+            render_seconds += time.perf_counter() - start
+
+    elapsed = ingest_seconds + render_seconds
+
+    return {
+        "samples": samples,
+        "blocks": blocks_count,
+        "ingest_seconds": ingest_seconds,
+        "render_seconds": render_seconds,
+        "samples_per_second": samples / elapsed if elapsed > 0 else 0.0,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark di ingestione e rendering tramite la riproduzione di una sessione")
+    parser.add_argument("directory")
+    parser.add_argument("--span", type=float, default=1.0, help="secondi registrati per blocco")
+    parser.add_argument("--plot", action="store_true", help="misura anche LivePlotWidget.update_plot (Qt offscreen)")
+    parser.add_argument("--update-every", type=int, default=1, help="blocchi tra due ridisegni")
+    args = parser.parse_args()
+
+    plot = None
+
+    if args.plot:
+        os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+        from PySide6.QtWidgets import QApplication, QGraphicsView
+        from src.graph.plotWidget import LivePlotWidget
+
+        app = QApplication([])
+        view = QGraphicsView()
+        view.resize(1200, 600)
+        view.show()
+
+        plot = LivePlotWidget(view)
+
+    result = benchmark(args.directory, args.span, plot, args.update_every)
+
+    for key, value in result.items():
+        print(f"{key}: {value:.3f}" if isinstance(value, float) else f"{key}: {value}")
+
+
+if __name__ == "__main__":
+    main()
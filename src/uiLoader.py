@@ -31,8 +31,7 @@
 ===============================================================================
 """
 
-from PySide6.QtUiTools import QUiLoader
-from PySide6.QtWidgets import QWidget
+from PySide6.QtWidgets import QMainWindow, QWidget
 from PySide6.QtCore import QFile
 
 
@@ -43,6 +42,9 @@ class UiLoader:
         """
         Carica un file .ui e restituisce il widget root
         """
+        # QUiLoader analizza l'XML a ogni avvio: serve solo quando si modifica il .ui
+        from PySide6.QtUiTools import QUiLoader
+
         loader = QUiLoader()
 
         file = QFile(ui_file)
@@ -58,3 +60,18 @@ class UiLoader:
             raise ValueError(f"Errore nel caricamento del file UI: {ui_file}")
 
         return widget
+
+    @staticmethod
+    def load_compiled(form_class, base=QMainWindow) -> QWidget:
+        """
+        Costruisce il widget root con la classe generata da pyside6-uic (es. Ui_MainWindow),
+        senza leggere il file .ui. I nomi degli oggetti sono gli stessi, quindi findChild funziona uguale.
+        """
+        widget = base()
+
+        form = form_class()
+        form.setupUi(widget)
+
+        widget.form = form
+
+        return widget